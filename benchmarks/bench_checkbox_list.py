@@ -0,0 +1,67 @@
+"""
+    CheckBoxList.set_value on a fake checkable combo box of 10k items, against
+    the previous per-item findText() implementation
+
+    Run it with: python -m benchmarks.bench_checkbox_list
+"""
+from __future__ import print_function
+
+import timeit
+
+from modelmapper.accessors import ModelAccessor
+from modelmapper.qt.fields import CheckBoxList
+
+from tests.factory.qt.destination_data import CheckableComboBox
+
+
+class ComboBox(CheckableComboBox):
+
+    def count(self):
+        return self.model().rowCount()
+
+    def itemText(self, index):
+        return self.model().item(index).text()
+
+    def findText(self, text):
+        # Linear search, like QComboBox.findText
+        for row in range(self.count()):
+            if self.itemText(row) == text:
+                return row
+        return -1
+
+    def repaint(self):
+        self.update()
+
+
+def set_value_by_find_text(accessor, value):
+    """CheckBoxList.set_value before the bulk check-state update"""
+    items = (accessor.widget.itemText(i) for i in range(accessor.widget.count()))
+    for i in items:
+        index = accessor.widget.findText(i)
+        flagCheck = accessor.QT_CHECKED if i in value else accessor.QT_UNCHECKED
+        accessor.widget.model().item(index, accessor.widget.modelColumn()).setCheckState(flagCheck)
+    accessor.widget.repaint()
+
+
+def run(items, checked, number=3, legacy=True):
+    texts = ['option {}'.format(i) for i in range(items)]
+    widget = ComboBox(texts)
+    accessor = CheckBoxList('options', parent_accessor=ModelAccessor({'options': widget}))
+    values = (texts[:checked], texts[checked:2 * checked])
+
+    def toggle(set_value):
+        for value in values:
+            set_value(value)
+
+    if legacy:
+        elapsed = timeit.timeit(lambda: toggle(lambda value: set_value_by_find_text(accessor, value)),
+                                number=number) / number / 2
+        print("{:>6} items {:>5} checked, findText : {:10.2f} ms".format(items, checked, elapsed * 1e3))
+    elapsed = timeit.timeit(lambda: toggle(accessor.set_value), number=number) / number / 2
+    print("{:>6} items {:>5} checked, set_value: {:10.2f} ms".format(items, checked, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    run(1000, 100)
+    run(10000, 1000, number=1)
+    run(100000, 1000, legacy=False)
@@ -0,0 +1,54 @@
+"""
+    Interpreted walk vs compiled sync functions in wide and deep mappers
+
+    Run it with: python -m benchmarks.bench_compile
+"""
+from __future__ import print_function
+
+import timeit
+
+from modelmapper.core import ModelMapper
+from modelmapper.declarations import Field, Mapper
+
+
+class Node(object):
+    pass
+
+
+def get_wide_case(width=200):
+    origin = {'f{}'.format(i): i for i in range(width)}
+    destination = Node()
+    mapper = {'f{}_link'.format(i): Field('f{}'.format(i), 'val_f{}'.format(i)) for i in range(width)}
+    return origin, destination, mapper
+
+
+def get_deep_case(depth=12, width=5):
+    origin, destination, mapper = {}, Node(), {}
+    orig_level, dest_level, mapper_level = origin, destination, mapper
+    for level in range(depth):
+        for i in range(width):
+            orig_level['f{}'.format(i)] = level * i
+            mapper_level['f{}_link'.format(i)] = Field('f{}'.format(i), 'val_f{}'.format(i))
+        orig_level['child'] = {}
+        dest_level.child = Node()
+        child_mapper = {}
+        mapper_level['child_link'] = Mapper('child', 'child', child_mapper)
+        orig_level, dest_level, mapper_level = orig_level['child'], dest_level.child, child_mapper
+    return origin, destination, mapper
+
+
+def run(name, case, number=2000):
+    origin, destination, mapper = case
+    model_mapper = ModelMapper(origin, destination, mapper)
+    model_mapper.prepare_mapper()
+
+    interpreted = timeit.timeit(model_mapper.origin_to_destination, number=number)
+    model_mapper.compile()
+    compiled = timeit.timeit(model_mapper.origin_to_destination, number=number)
+    print("{:<6} interpreted: {:8.2f} us/sync | compiled: {:8.2f} us/sync | speedup x{:.1f}".format(
+        name, interpreted / number * 1e6, compiled / number * 1e6, interpreted / compiled))
+
+
+if __name__ == '__main__':
+    run('wide', get_wide_case())
+    run('deep', get_deep_case())
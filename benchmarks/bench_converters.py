@@ -0,0 +1,43 @@
+"""
+    Syncing dates that must be parsed, with the parser memoized by a
+    Converter or called for every value
+
+    Run it with: python -m benchmarks.bench_converters
+"""
+from __future__ import print_function
+
+import timeit
+from datetime import datetime, timedelta
+
+from modelmapper.converters import Converter, ConverterPipeline
+from modelmapper.core import ModelMapper
+from modelmapper.declarations import Field
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S')
+
+
+def run(records, distinct, memoized, number=3):
+    start = datetime(2018, 1, 1)
+    dates = [(start + timedelta(days=i % distinct)).strftime('%Y-%m-%dT%H:%M:%S') for i in range(records)]
+    parser = Converter(parse_date) if memoized else parse_date
+    converters = ConverterPipeline(to_destination=parser)
+    model_mapper = ModelMapper({'date': None}, {}, {'date_link': Field('date', 'date', converters=converters)})
+    model_mapper.prepare_mapper()
+
+    def sync():
+        for date in dates:
+            model_mapper.origin_model['date'] = date
+            model_mapper.origin_to_destination()
+
+    elapsed = timeit.timeit(sync, number=number) / number
+    print("{:>6} records {:>4} distinct dates, {:<9}: {:8.2f} ms | {:5.2f} us/record{}".format(
+        records, distinct, 'Converter' if memoized else 'strptime', elapsed * 1e3, elapsed / records * 1e6,
+        ' | hit rate {:.3f}'.format(parser.hit_rate) if memoized else ''))
+
+
+if __name__ == '__main__':
+    for distinct in (10, 1000):
+        run(10000, distinct, memoized=False)
+        run(10000, distinct, memoized=True)
@@ -0,0 +1,50 @@
+"""
+    Cursor switching of uniform lists (master/detail scrolling), with and
+    without the cache of row bindings
+
+    Run it with: python -m benchmarks.bench_cursor
+"""
+from __future__ import print_function
+
+import timeit
+
+from modelmapper.core import ModelMapper
+from modelmapper.declarations import Field, Mapper, UniformMapper
+
+
+class Node(object):
+    pass
+
+
+def get_case(rows=100, depth=6, **info):
+    origin_row, destination, mapper = {}, Node(), {}
+    orig_level, dest_level, mapper_level = origin_row, destination, mapper
+    for level in range(depth):
+        orig_level['f'] = level
+        mapper_level['f_link'] = Field('f', 'val_f')
+        orig_level['child'] = {}
+        dest_level.child = Node()
+        child_mapper = {}
+        mapper_level['child_link'] = Mapper('child', 'child', child_mapper)
+        orig_level, dest_level, mapper_level = orig_level['child'], dest_level.child, child_mapper
+
+    origin = {'rows': [dict(origin_row) for _ in range(rows)]}
+    model_mapper = ModelMapper(origin, destination, {'rows_link': UniformMapper('rows', '', mapper, **info)})
+    model_mapper.prepare_mapper()
+    return model_mapper['rows_link']
+
+
+def run(name, rows_mapper, number=20000):
+    indexes = [0, 1]
+
+    def switch():
+        indexes.reverse()
+        rows_mapper._update_index(indexes[0])
+
+    elapsed = timeit.timeit(switch, number=number)
+    print("{:<10} {:8.2f} us/switch".format(name, elapsed / number * 1e6))
+
+
+if __name__ == '__main__':
+    run('rebind', get_case())
+    run('row cache', get_case(row_cache_size=8))
@@ -0,0 +1,43 @@
+"""
+    Origin export of big uniform lists with ``to_dict(only_origin=True)``
+
+    Run it with: python -m benchmarks.bench_export
+"""
+from __future__ import print_function
+
+import timeit
+
+from modelmapper.core import ModelMapper
+from modelmapper.declarations import Field, Mapper, UniformMapper
+
+
+class Node(object):
+    pass
+
+
+def get_case(rows):
+    origin = {'rows': [{'a': i, 'b': str(i), 'child': {'c': i * 2}} for i in range(rows)]}
+    destination = Node()
+    destination.row = Node()
+    destination.row.child = Node()
+    mapper = {
+        'rows_link': UniformMapper('rows', 'row', {
+            'a_link': Field('a', 'val_a'),
+            'b_link': Field('b', 'val_b'),
+            'child_link': Mapper('child', 'child', {'c_link': Field('c', 'val_c')}),
+        })
+    }
+    model_mapper = ModelMapper(origin, destination, mapper)
+    model_mapper.prepare_mapper()
+    return model_mapper
+
+
+def run(rows, number=5):
+    model_mapper = get_case(rows)
+    elapsed = timeit.timeit(lambda: model_mapper.to_dict(only_origin=True), number=number) / number
+    print("{:>7} rows: {:8.2f} ms/export | {:6.2f} us/row".format(rows, elapsed * 1e3, elapsed / rows * 1e6))
+
+
+if __name__ == '__main__':
+    for rows in (1000, 10000, 50000):
+        run(rows)
@@ -0,0 +1,49 @@
+"""
+    List to list mappings with ListMapper, growing the destination list
+
+    Run it with: python -m benchmarks.bench_list
+"""
+from __future__ import print_function
+
+import timeit
+
+from modelmapper.core import ModelMapper
+from modelmapper.declarations import Field, ListMapper
+
+
+class Item(object):
+
+    def __init__(self):
+        self.val_a = None
+        self.val_b = None
+        self.val_c = None
+
+
+class Node(object):
+
+    def __init__(self):
+        self.items = []
+
+
+def run(items, number=3):
+    origin = {'items': [{'a': i, 'b': str(i), 'c': [i]} for i in range(items)]}
+
+    def sync():
+        mapper = {
+            'items_link': ListMapper('items', 'items', {
+                'a_link': Field('a', 'val_a'),
+                'b_link': Field('b', 'val_b'),
+                'c_link': Field('c', 'val_c'),
+            }, destination_factory=Item)
+        }
+        model_mapper = ModelMapper(origin, Node(), mapper)
+        model_mapper.prepare_mapper()
+        model_mapper.origin_to_destination()
+
+    elapsed = timeit.timeit(sync, number=number) / number
+    print("{:>7} items: {:8.2f} ms/sync | {:6.2f} us/item".format(items, elapsed * 1e3, elapsed / items * 1e6))
+
+
+if __name__ == '__main__':
+    for items in (1000, 10000, 100000):
+        run(items)
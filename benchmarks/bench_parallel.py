@@ -0,0 +1,62 @@
+"""
+    Scaling of map_many from 1 to N worker processes
+
+    Run it with: python -m benchmarks.bench_parallel [records]
+"""
+from __future__ import print_function
+
+import multiprocessing
+import sys
+
+from modelmapper import compat
+from modelmapper.declarations import Field, Mapper
+from modelmapper.plan import MappingPlan
+
+
+class Record(object):
+
+    def __init__(self):
+        self.address = Address()
+
+
+class Address(object):
+    pass
+
+
+def get_mapper(width=40):
+    mapper = {'f{}_link'.format(i): Field('f{}'.format(i), 'val_f{}'.format(i)) for i in range(width)}
+    mapper['address_link'] = Mapper('address', 'address', {
+        'street_link': Field('street', 'street'),
+        'city_link': Field('city', 'city'),
+    })
+    return mapper
+
+
+def get_origins(records, width=40):
+    for i in range(records):
+        origin = {'f{}'.format(j): i * j for j in range(width)}
+        origin['address'] = {'street': 'Street {}'.format(i), 'city': 'City'}
+        yield origin
+
+
+def run(records):
+    plan = MappingPlan(get_mapper())
+    start = compat.perf_counter()
+    for _ in plan.map_many(get_origins(records), Record):
+        pass
+    serial = compat.perf_counter() - start
+    print("serial    : {:10.0f} records/sec".format(records / serial))
+
+    workers = 1
+    while workers <= multiprocessing.cpu_count():
+        start = compat.perf_counter()
+        for _ in plan.map_many(get_origins(records), Record, workers=workers, chunk_size=2000):
+            pass
+        elapsed = compat.perf_counter() - start
+        print("{:2d} workers: {:10.0f} records/sec | speedup x{:.2f}".format(
+            workers, records / elapsed, serial / elapsed))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
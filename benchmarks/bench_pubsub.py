@@ -0,0 +1,108 @@
+"""
+    Publish throughput of PubSub with many subscribers and publishing threads,
+    publish cost of sender-filtered subscriptions and publisher-side cost of
+    a slow subscriber with and without a dispatcher
+
+    Run it with: python -m benchmarks.bench_pubsub
+"""
+from __future__ import print_function
+
+import threading
+import time
+
+from modelmapper import compat
+from modelmapper.dispatch import ThreadDispatcher
+from modelmapper.pubsub import PubSub
+
+
+class Subscriber(object):
+
+    def on_event(self, topic, data):
+        pass
+
+
+def run(subscribers, threads, publishes=20000):
+    pubsub = PubSub()
+    alive = [Subscriber() for _ in range(subscribers)]
+    for subscriber in alive:
+        pubsub.subscribe(subscriber.on_event, 'widget_value_changed')
+
+    def publisher():
+        for _ in range(publishes):
+            pubsub.publish('widget_value_changed', None)
+
+    workers = [threading.Thread(target=publisher) for _ in range(threads)]
+    start = compat.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = compat.perf_counter() - start
+
+    total = publishes * threads
+    print("{:>4} subscribers {:>2} threads: {:10.0f} publishes/s | {:6.2f} us/publish".format(
+        subscribers, threads, total / elapsed, elapsed / total * 1e6))
+
+
+class FilteringSubscriber(object):
+
+    def __init__(self, sender):
+        self.sender = sender
+        self.received = 0
+
+    def on_event(self, topic, data):
+        if data is self.sender:
+            self.received += 1
+
+
+def run_filtered(senders, indexed, publishes=2000):
+    pubsub = PubSub()
+    alive = [(sender, FilteringSubscriber(sender)) for sender in (Subscriber() for _ in range(senders))]
+    for sender, subscriber in alive:
+        if indexed:
+            pubsub.subscribe(subscriber.on_event, 'widget_value_changed', sender=sender)
+        else:
+            pubsub.subscribe(subscriber.on_event, 'widget_value_changed')
+
+    start = compat.perf_counter()
+    for i in range(publishes):
+        pubsub.publish('widget_value_changed', alive[i % senders][0])
+    elapsed = compat.perf_counter() - start
+
+    print("{:>4} senders, {:<9}: {:8.2f} us/publish".format(
+        senders, 'by sender' if indexed else 'filtering', elapsed / publishes * 1e6))
+
+
+class SlowSubscriber(object):
+
+    def on_event(self, topic, data):
+        time.sleep(0.001)
+
+
+def run_slow(dispatcher, publishes=200):
+    pubsub = PubSub(dispatcher=dispatcher)
+    subscriber = SlowSubscriber()
+    pubsub.subscribe(subscriber.on_event, 'widget_value_changed')
+
+    start = compat.perf_counter()
+    for i in range(publishes):
+        pubsub.publish('widget_value_changed', i)
+    elapsed = compat.perf_counter() - start
+    if dispatcher is not None:
+        dispatcher.close()
+
+    print("slow subscriber, {:<16}: {:8.2f} us/publish | {}".format(
+        dispatcher.__class__.__name__ if dispatcher is not None else 'inline', elapsed / publishes * 1e6,
+        dispatcher.stats if dispatcher is not None else ''))
+
+
+if __name__ == '__main__':
+    for subscribers in (1, 10, 100):
+        for threads in (1, 4):
+            run(subscribers, threads)
+    for senders in (10, 100, 1000):
+        run_filtered(senders, indexed=False)
+        run_filtered(senders, indexed=True)
+    run_slow(None)
+    run_slow(ThreadDispatcher(overflow='drop_oldest', maxsize=50))
+    run_slow(ThreadDispatcher(overflow='block', maxsize=1000))
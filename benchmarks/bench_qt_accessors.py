@@ -0,0 +1,79 @@
+"""
+    Headless get/set of QWidgetAccessor on stub widgets that implement
+    metaObject(), against resolving the widget and its user property on
+    every access
+
+    Run it with: python -m benchmarks.bench_qt_accessors
+"""
+from __future__ import print_function
+
+import timeit
+
+from modelmapper.accessors import ModelAccessor
+from modelmapper.qt.fields import QWidgetAccessor
+
+
+class MetaProperty(object):
+
+    def read(self, widget):
+        return widget.value
+
+    def write(self, widget, value):
+        widget.value = value
+        return True
+
+
+class MetaObject(object):
+    """Like QMetaObject.userProperty(), it builds a new QMetaProperty each call"""
+
+    def userProperty(self):
+        return MetaProperty()
+
+
+class Widget(object):
+
+    def __init__(self):
+        self.value = 0
+
+    def metaObject(self):
+        return MetaObject()
+
+
+class UI(object):
+
+    def __init__(self, fields):
+        for i in range(fields):
+            setattr(self, 'field_{}'.format(i), Widget())
+
+
+class UncachedAccessor(QWidgetAccessor):
+    """QWidgetAccessor resolving the widget and its user property on every access"""
+    __slots__ = ()
+
+    @property
+    def widget(self):
+        return self.field
+
+    def get_value(self):
+        return self.widget.metaObject().userProperty().read(self.widget)
+
+    def set_value(self, value):
+        self.widget.metaObject().userProperty().write(self.widget, value)
+
+
+def run(accessor_cls, fields=50, number=200):
+    parent_accessor = ModelAccessor(UI(fields))
+    accessors = [accessor_cls('field_{}'.format(i), parent_accessor=parent_accessor) for i in range(fields)]
+
+    def sync():
+        for accessor in accessors:
+            accessor.set_value(accessor.get_value() + 1)
+
+    elapsed = timeit.timeit(sync, number=number) / number
+    print("{:<16} {} fields: {:8.2f} us/sync | {:6.3f} us/field".format(
+        accessor_cls.__name__, fields, elapsed * 1e6, elapsed / fields * 1e6))
+
+
+if __name__ == '__main__':
+    run(UncachedAccessor)
+    run(QWidgetAccessor)
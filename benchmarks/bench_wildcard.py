@@ -0,0 +1,33 @@
+"""
+    Bulk reads and writes of embedded lists through ``[*]`` accesses
+
+    Run it with: python -m benchmarks.bench_wildcard
+"""
+from __future__ import print_function
+
+import timeit
+
+from modelmapper.accessors import ModelAccessor
+
+
+def run(items=100000, number=5):
+    accessor = ModelAccessor({'items': [{'price': {'amount': i}} for i in range(items)]})
+
+    elapsed = timeit.timeit(lambda: accessor['items[*].price.amount'], number=number) / number
+    print("get   {:>7} items: {:8.2f} ms | {:6.3f} us/item".format(items, elapsed * 1e3, elapsed / items * 1e6))
+
+    def set_item():
+        accessor['items[*].price.amount'] = 0
+
+    elapsed = timeit.timeit(set_item, number=number) / number
+    print("set   {:>7} items: {:8.2f} ms | {:6.3f} us/item".format(items, elapsed * 1e3, elapsed / items * 1e6))
+
+    if hasattr(accessor, 'scatter'):
+        values = list(range(items))
+        elapsed = timeit.timeit(lambda: accessor.scatter('items[*].price.amount', values), number=number) / number
+        print("scatter {:>5} items: {:8.2f} ms | {:6.3f} us/item".format(items, elapsed * 1e3,
+                                                                      elapsed / items * 1e6))
+
+
+if __name__ == '__main__':
+    run()
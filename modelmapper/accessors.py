@@ -1,9 +1,118 @@
+import copy
 import re
 from abc import ABCMeta, abstractmethod
 
 from modelmapper import exceptions as exc
+from modelmapper.cache import LRUCache
 import modelmapper.compat as compat
 
+
+class _Missing(object):
+    """Sentinel returned by lookups of items that don't exist"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+    def __reduce__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+# Errors meaning that some attribute, key or index of an access doesn't exist
+MISSING_ERRORS = (AttributeError, KeyError, IndexError)
+
+
+def get_step(root_obj, attr, index=None):
+    """Get one already parsed step of an :class:`AccessPath` from ``root_obj``
+    without translating the raised exceptions
+    """
+    if isinstance(root_obj, dict):
+        return root_obj[attr]
+    elif isinstance(root_obj, (list, tuple)):
+        return root_obj[int(attr) if index is None else index]
+    else:
+        return getattr(root_obj, attr)
+
+
+def set_step(root_obj, attr, value, index=None):
+    """Set one already parsed step of an :class:`AccessPath` in ``root_obj``
+    without translating the raised exceptions
+    """
+    if isinstance(root_obj, dict):
+        root_obj[attr] = value
+    elif isinstance(root_obj, list):
+        root_obj[int(attr) if index is None else index] = value
+    else:
+        setattr(root_obj, attr, value)
+
+
+def missing_error(error, root, attr):
+    """:class:`ModelAccessorError` for one of the ``MISSING_ERRORS`` raised
+    getting or setting ``attr`` in ``root``
+    """
+    if isinstance(error, AttributeError):
+        return exc.ModelAccessorAttributeError(
+            "{root} has not the attribute {attr}".format(root=root, attr=attr))
+    elif isinstance(error, IndexError):
+        return exc.ModelAccessorIndexError(
+            "Not exist the index {index} in {root} object".format(index=attr, root=root))
+    return exc.ModelAccessorKeyError(
+        "{root} has not the key {attr}".format(root=root, attr=attr))
+
+
+def get_steps(target, steps, strict=False):
+    """Walk already parsed ``steps`` of an :class:`AccessPath` from ``target``
+
+    :param strict: raise the proper :class:`ModelAccessorError` instead of
+                   returning ``MISSING`` when some attribute, key or index is missing
+    :raise ModelAccessorError: for any other error
+    """
+    for attr, index in steps:
+        try:
+            target = get_step(target, attr, index)
+        except MISSING_ERRORS as e:
+            if strict:
+                raise missing_error(e, target, attr)
+            return MISSING
+        except Exception as e:
+            raise exc.ModelAccessorError(str(e))
+    return target
+
+
+def get_value(model, access, strict=False):
+    """Get a compiled ``access`` from a ``model`` walking it only once. A
+    :class:`FieldAccessor` is read through a copy bound to ``model``.
+
+    :param strict: raise the proper :class:`ModelAccessorError` instead of
+                   returning ``MISSING`` when some attribute, key or index is missing
+    :raise ModelAccessorError: for any other error
+    """
+    if isinstance(access, FieldAccessor):
+        accessor = copy.copy(access)
+        accessor.parent_accessor = ModelAccessor(model)
+        try:
+            return accessor.get_value()
+        except exc.ModelAccessorAttributeError:
+            if strict:
+                raise
+            return MISSING
+    if access.wildcard:
+        try:
+            return SpecialListAccessor.get_item(ModelAccessor(model), access)
+        except (exc.ModelAccessorAttributeError, exc.ModelAccessorKeyError, exc.ModelAccessorIndexError):
+            if strict:
+                raise
+            return MISSING
+    return get_steps(model, access.steps, strict)
+
+
 def handle_exceptions(f):
 
     def handle(*args, **kwargs):
@@ -11,20 +120,144 @@ def handle_exceptions(f):
         attr = args[2]
         try:
             return f(*args, **kwargs)
-        except AttributeError:
-            raise exc.ModelAccessorAttributeError(
-                "{root} has not the attribute {attr}".format(root=root, attr=attr))
-        except IndexError:
-            raise exc.ModelAccessorIndexError(
-                "Not exist the index {index} in {root} object".format(index=attr, root=root))
-        except KeyError:
-            raise exc.ModelAccessorKeyError(
-                "{root} has not the key {attr}".format(root=root, attr=attr))
+        except MISSING_ERRORS as e:
+            raise missing_error(e, root, attr)
         except Exception as e:
             raise exc.ModelAccessorError(str(e))
     return handle
 
 
+class AccessPath(object):
+    """Immutable and already parsed version of an access string like ``'d.c[0].a'``.
+
+    Each step is a ``(name, index)`` tuple: ``name`` is used as dict key or
+    attribute name and ``index`` is the integer index (``None`` if ``name``
+    is not an integer) used for lists and tuples.
+    """
+    __slots__ = ('_access', '_steps', '_wildcard', '_segments')
+
+    def __init__(self, access):
+        """
+        :param access: access string or list of already split items
+        """
+        if isinstance(access, list):
+            items = access
+            access = '.'.join(compat.unicode(item) for item in items)
+        else:
+            items = ModelAccessor.split(access)
+        self._access = access
+        self._steps = tuple((item, AccessPath._to_index(item)) for item in items)
+        self._wildcard = ModelAccessor.SPECIAL_LIST_INDICATOR in access
+        self._segments = AccessPath._split_segments(self._steps) if self._wildcard else (self._steps,)
+
+    @staticmethod
+    def _split_segments(steps):
+        segments = [[]]
+        for step in steps:
+            if step[0] == '*':
+                segments.append([])
+            else:
+                segments[-1].append(step)
+        return tuple(tuple(segment) for segment in segments)
+
+    @staticmethod
+    def _to_index(item):
+        try:
+            return int(item)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def access(self):
+        return self._access
+
+    @property
+    def steps(self):
+        return self._steps
+
+    @property
+    def wildcard(self):
+        return self._wildcard
+
+    @property
+    def segments(self):
+        """Steps split by the ``[*]`` wildcards: ``'o[*].l[*].q'`` has the
+        segments ``(('o', None),)``, ``(('l', None),)`` and ``(('q', None),)``.
+        A trailing wildcard adds an empty segment.
+        """
+        return self._segments
+
+    @property
+    def parent_steps(self):
+        return self._steps[:-1]
+
+    @property
+    def last_step(self):
+        return self._steps[-1]
+
+    def __eq__(self, other):
+        if isinstance(other, AccessPath):
+            return self._access == other._access
+        return self._access == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._access)
+
+    def __bool__(self):
+        return bool(self._access)
+
+    __nonzero__ = __bool__
+
+    def __contains__(self, item):
+        return item in self._access
+
+    def __str__(self):
+        return self._access
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self._access)
+
+    def __reduce__(self):
+        # Unpickled paths are taken from (or stored in) the path cache
+        return compile_path, (self._access,)
+
+
+PATH_CACHE_SIZE = 4096
+_path_cache = LRUCache(maxsize=PATH_CACHE_SIZE)
+
+
+def compile_path(access):
+    """Get the :class:`AccessPath` of an access string, parsing it only the
+    first time it's seen (compiled paths are kept in a bounded LRU cache)
+
+    :param access: access string, :class:`AccessPath` or list of split items
+    :return: :class:`AccessPath`
+    """
+    if isinstance(access, AccessPath):
+        return access
+    elif isinstance(access, list):
+        return AccessPath(access)
+    path = _path_cache.get(access)
+    if path is None:
+        path = AccessPath(access)
+        _path_cache.set(access, path)
+    return path
+
+
+def compile_access(access):
+    """Like :func:`compile_path`, but :class:`FieldAccessor` objects are
+    returned as they are
+    """
+    return access if isinstance(access, FieldAccessor) else compile_path(access)
+
+
+def clear_path_cache():
+    _path_cache.clear()
+
+
 class ModelAccessor(object):
     __slots__ = ('_model',)
 
@@ -53,21 +286,23 @@ class ModelAccessor(object):
             if item.parent_accessor is None:
                 item.parent_accessor = self
             return item.get_value()
-        elif self.SPECIAL_LIST_INDICATOR in item:
-            return SpecialListAccessor.get_item(self, item)
-        else:
-            return self._get_item_value(item)
+        path = compile_path(item)
+        if path.wildcard:
+            return SpecialListAccessor.get_item(self, path)
+        return self._get_target_item(path.steps)
 
     def __setitem__(self, item, value):
         if isinstance(item, FieldAccessor):
             if item.parent_accessor is None:
                 item.parent_accessor = self
             item.set_value(value)
-        elif self.SPECIAL_LIST_INDICATOR in item:
-            SpecialListAccessor.set_item(self, item, value)
+            return
+        path = compile_path(item)
+        if path.wildcard:
+            SpecialListAccessor.set_item(self, path, value)
         else:
-            root_obj, attr = self._get_root_obj_and_attr(item)
-            self._set_item(root_obj, attr, value)
+            root_obj, (attr, index) = self._get_root_obj_and_attr(path)
+            self._set_item(root_obj, attr, value, index)
 
     def __contains__(self, item):
         try:
@@ -86,6 +321,36 @@ class ModelAccessor(object):
         pattern = re.compile(pattern) if pattern else ModelAccessor.SPLIT_ACCESSOR_REGEX
         return compat.filter(None, pattern.split(name, **kwargs))  # delete empty strings
 
+    def lookup(self, item, missing=MISSING):
+        """Get ``item`` like ``self[item]``, but returning ``missing`` instead of
+        raising when some attribute, key or index of the access doesn't exist.
+
+        No exception is created for missing items, so it's the cheap way to
+        read sparse models. Any other error raises a :class:`ModelAccessorError`.
+        """
+        if isinstance(item, FieldAccessor):
+            try:
+                return self.__getitem__(item)
+            except exc.ModelAccessorAttributeError:
+                return missing
+        value = get_value(self._model, compile_path(item))
+        return missing if value is MISSING else value
+
+    def gather(self, item):
+        """Get the values of a wildcard access like ``'items[*].price'`` (the
+        same as ``self[item]``). Nested wildcards give nested lists.
+        """
+        return SpecialListAccessor.get_item(self, item)
+
+    def scatter(self, item, values):
+        """Set the values of a wildcard access element-wise: the n-th element
+        matched by the wildcard gets the n-th value (the shortest of both
+        wins, like :func:`zip`). Nested wildcards take nested iterables.
+
+        ``self[item] = value`` sets the same ``value`` in every element instead.
+        """
+        SpecialListAccessor.scatter_item(self, item, values)
+
     def get(self, name, default=None):
         try:
             return self.__getitem__(name)
@@ -93,38 +358,27 @@ class ModelAccessor(object):
             return default
 
     @handle_exceptions
-    def _get_item(self, root_obj, attr):
-        if isinstance(root_obj, dict):
-            return root_obj[attr]
-        elif isinstance(root_obj, (list, tuple)):
-            return root_obj[int(attr)]
-        else:
-            return getattr(root_obj, attr)
+    def _get_item(self, root_obj, attr, index=None):
+        return get_step(root_obj, attr, index)
 
     @handle_exceptions
-    def _set_item(self, root_obj, attr, value):
-        if isinstance(root_obj, dict):
-            root_obj[attr] = value
-        elif isinstance(root_obj, list):
-            root_obj[int(attr)] = value
-        else:
-            setattr(root_obj, attr, value)
+    def _set_item(self, root_obj, attr, value, index=None):
+        set_step(root_obj, attr, value, index)
 
-    def _get_target_item(self, items):
+    def _get_target_item(self, steps):
         target_item = self._model
         getter = self._get_item
-        for item in items:
-            target_item = getter(target_item, item)
+        for attr, index in steps:
+            target_item = getter(target_item, attr, index)
         return target_item
 
     def _get_item_value(self, item):
-        split_item = item if isinstance(item, list) else list(ModelAccessor.split(item))
-        return self._get_target_item(split_item)
+        return self._get_target_item(compile_path(item).steps)
 
     def _get_root_obj_and_attr(self, item):
-        split_item = item if isinstance(item, list) else list(ModelAccessor.split(item))
-        root_obj = self._get_target_item(split_item[:-1]) if len(split_item) > 1 else self._model
-        return root_obj, split_item[-1]
+        path = compile_path(item)
+        root_obj = self._get_target_item(path.parent_steps)
+        return root_obj, path.last_step
 
 
 class SpecialListAccessor(object):
@@ -140,25 +394,96 @@ class SpecialListAccessor(object):
 
     @staticmethod
     def get_item(model_accessor, item):
-        list_access, list_new_items = SpecialListAccessor.split_list_items(item)
-        if list_new_items is None:
-            return model_accessor[list_access]
-        else:
+        return SpecialListAccessor._gather(model_accessor.model, SpecialListAccessor._get_segments(item))
+
+    @staticmethod
+    def set_item(model_accessor, item, value):
+        SpecialListAccessor._assign(model_accessor, SpecialListAccessor._get_segments(item), value, each=False)
+
+    @staticmethod
+    def scatter_item(model_accessor, item, values):
+        segments = compile_path(item).segments
+        SpecialListAccessor._assign(model_accessor, segments, values, each=True)
+
+    @staticmethod
+    def _get_segments(item):
+        segments = compile_path(item).segments
+        # A trailing wildcard means the whole list
+        return segments[:-1] if len(segments) > 1 and not segments[-1] else segments
+
+    @staticmethod
+    def _assign(model_accessor, segments, value, each):
+        if each:
+            # The values could be consumed by the first walk
+            value = _materialize(value, len(segments) - 1)
+        SpecialListAccessor._scatter(model_accessor.model, segments, value, each)
+
+    @staticmethod
+    def _gather(target, segments):
+        """Get the values at the end of ``segments``. A missing attribute, key
+        or index raises the :class:`ModelAccessorError` of the step that failed
+        """
+        attr = None
+        try:
+            for attr, index in segments[0]:
+                target = get_step(target, attr, index)
+            if len(segments) == 1:
+                return target
+
+            tail = segments[1:]
+            if len(tail) > 1:
+                return [SpecialListAccessor._gather(item, tail) for item in target]
+            steps = tail[0]
             ret = []
-            for item in model_accessor[list_access]:
-                item_accessor = ModelAccessor(item)
-                ret.append(item_accessor[list_new_items])
+            for item in target:
+                target = item
+                for attr, index in steps:
+                    target = get_step(target, attr, index)
+                ret.append(target)
             return ret
+        except MISSING_ERRORS as e:
+            raise missing_error(e, target, attr)
 
     @staticmethod
-    def set_item(model_accessor, item, value):
-        list_access, list_new_items = SpecialListAccessor.split_list_items(item)
-        if list_new_items is None:
-            model_accessor[list_access] = value
+    def _scatter(target, segments, value, each):
+        """Set ``value`` at the end of ``segments``, one item of it per
+        element of the wildcard lists if ``each`` is true
+        """
+        head = segments[0]
+        attr = None
+        try:
+            if len(segments) == 1:
+                for attr, index in head[:-1]:
+                    target = get_step(target, attr, index)
+                attr, index = head[-1]
+                set_step(target, attr, value, index)
+                return
+
+            for attr, index in head:
+                target = get_step(target, attr, index)
+            tail = segments[1:]
+            if tail == ((),):
+                # Trailing wildcard, the items of the list are set
+                for index, item_value in compat.izip(compat.range(len(target)), value):
+                    attr = compat.unicode(index)
+                    set_step(target, attr, item_value, index)
+                return
+        except MISSING_ERRORS as e:
+            raise missing_error(e, target, attr)
+        if each:
+            for item, item_value in compat.izip(target, value):
+                SpecialListAccessor._scatter(item, tail, item_value, each)
         else:
-            for item in model_accessor[list_access]:
-                item_accessor = ModelAccessor(item)
-                item_accessor[list_new_items] = value
+            for item in target:
+                SpecialListAccessor._scatter(item, tail, value, each)
+
+
+def _materialize(values, depth):
+    """Convert the ``depth`` levels of nested iterables of ``values`` to lists"""
+    values = list(values)
+    if depth > 1:
+        return [_materialize(item, depth - 1) for item in values]
+    return values
 
 
 class FieldAccessor(object):
@@ -166,11 +491,30 @@ class FieldAccessor(object):
 
     __metaclass__ = ABCMeta
 
+    # Compare-before-write override of the class (see modelmapper.policies.WritePolicy)
+    SKIP_UNCHANGED = None
+    # Conversions of the values synced (see modelmapper.converters.ConverterPipeline)
+    CONVERTERS = None
+
     def __init__(self, access, parent_accessor=None, **info):
         self._parent_accessor = parent_accessor
         self.access = access
         self.info = info
 
+    def __getstate__(self):
+        # The parent accessor is bound to a model, so it's neither pickled nor copied
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if slot not in ('_parent_accessor', '__weakref__', '__dict__') and hasattr(self, slot):
+                    state[slot] = getattr(self, slot)
+        return state
+
+    def __setstate__(self, state):
+        self._parent_accessor = None
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     @property
     def field(self):
         try:
@@ -196,3 +540,11 @@ class FieldAccessor(object):
     @abstractmethod
     def get_value(self):
         pass
+
+    def block_signals(self, blocked):
+        """Block, or unblock, the change notifications of the field while a
+        whole record is written (see :meth:`ModelMapper.bulk_apply`)
+
+        :return: whether they were blocked before
+        """
+        return False
@@ -0,0 +1,66 @@
+"""
+    Small caching helpers shared by the accessors and the mappers
+"""
+import threading
+import collections
+
+
+class LRUCache(object):
+    """Thread-safe bounded mapping which discards the least recently used
+    entries once ``maxsize`` is reached
+    """
+    __slots__ = ('_maxsize', '_data', '_lock', 'hits', 'misses')
+
+    def __init__(self, maxsize=1024):
+        """
+        :param maxsize: maximum number of entries kept, ``None`` means unbounded
+        """
+        self._maxsize = maxsize
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data[key] = value  # move it to the most recently used position
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            data = self._data
+            data.pop(key, None)
+            data[key] = value
+            if self._maxsize is not None and len(data) > self._maxsize:
+                data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
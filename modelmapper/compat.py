@@ -3,23 +3,33 @@
 """
 
 
+import time
+
 PY2 = str is bytes
 
 
 if PY2:  # pragma: no cover
-    from itertools import ifilter
+    from itertools import ifilter, izip
 
     filter = ifilter
+    izip = izip
+    range = xrange
     basestring = basestring
     unicode = unicode
 
     def iteritems(d, **kw):
         return d.iteritems(**kw)
 
+    perf_counter = time.time
+
 else:  # pragma: no cover
     filter = filter
+    izip = zip
+    range = range
     basestring = str
     unicode = str
 
     def iteritems(d, **kw):
         return iter(d.items(**kw))
+
+    perf_counter = time.perf_counter
@@ -0,0 +1,274 @@
+"""
+    Code generation of specialized sync functions for a prepared
+    :class:`modelmapper.core.ModelMapper` tree
+"""
+import keyword
+import re
+
+from modelmapper.accessors import FieldAccessor, MISSING, MISSING_ERRORS, compile_path, get_step, set_step
+from modelmapper.trie import PrefixResolver
+
+_IDENTIFIER_REGEX = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_UNKNOWN = object()  # the shape of the model is not known at compile time
+
+# Errors raised by the specialized accesses when the models don't fit the
+# compiled shapes, or the items don't exist. Only the failing access is re-run
+# through the interpreted walk, which reads the item, skips it if it's missing
+# or raises the proper ModelAccessorError
+SHAPE_ERRORS = MISSING_ERRORS + (TypeError,)
+
+
+def _is_identifier(name):
+    return bool(_IDENTIFIER_REGEX.match(name)) and not keyword.iskeyword(name)
+
+
+class _CodeWriter(object):
+
+    def __init__(self):
+        self._lines = []
+        self._indent = 0
+
+    def line(self, text):
+        self._lines.append('    ' * self._indent + text)
+
+    def indent(self):
+        self._indent += 1
+
+    def dedent(self):
+        self._indent -= 1
+
+    @property
+    def source(self):
+        return '\n'.join(self._lines) + '\n'
+
+
+class MapperCompiler(object):
+    """Generate one Python function per sync direction for a whole prepared
+    mapper tree.
+
+    The generated functions read and write the models with direct subscript
+    and attribute accesses, specialized for the shape (dict, list or object)
+    of the models bound when :meth:`compile` is called. Models whose shape
+    is unknown at that moment are accessed through the generic step helpers.
+    """
+
+    def __init__(self, model_mapper):
+        """
+        :param model_mapper: prepared :class:`ModelMapper`
+        """
+        self._model_mapper = model_mapper
+        self._namespace = {}
+        self._objects = {}
+
+    def compile(self):
+        """
+        :return: tuple(origin_to_destination function, destination_to_origin function)
+        """
+        self._namespace = {
+            '_get_step': get_step,
+            '_set_step': set_step,
+            '_MISSING': MISSING,
+            '_SHAPE_ERRORS': SHAPE_ERRORS,
+            '_PrefixResolver': PrefixResolver,
+        }
+        self._objects = {}
+        source = []
+        for func_name, to_destination in (('origin_to_destination', True),
+                                          ('destination_to_origin', False)):
+            writer = _CodeWriter()
+            writer.line('def {}():'.format(func_name))
+            writer.indent()
+            self._write_mapper(writer, self._model_mapper, to_destination, is_root=True)
+            writer.line('return None')
+            source.append(writer.source)
+
+        source = '\n'.join(source)
+        code = compile(source, '<modelmapper compiled {!r}>'.format(self._model_mapper), 'exec')
+        exec(code, self._namespace)
+        return self._namespace['origin_to_destination'], self._namespace['destination_to_origin']
+
+    def _name(self, prefix, obj):
+        key = id(obj)
+        name = self._objects.get(key)
+        if name is None:
+            name = '{}{}'.format(prefix, len(self._objects))
+            self._objects[key] = name
+            self._namespace[name] = obj
+        return name
+
+    def _write_mapper(self, writer, model_mapper, to_destination, is_root=False):
+        from modelmapper.core import ModelMapper, UniformListModelMapper
+        from modelmapper.converters import get_converters
+        from modelmapper.policies import get_skip_unchanged
+
+        mapper_name = self._name('m', model_mapper)
+        if not is_root and type(model_mapper) not in (ModelMapper, UniformListModelMapper):
+            # Unknown mapper types keep their own sync implementation
+            func_name = 'origin_to_destination' if to_destination else 'destination_to_origin'
+            writer.line('{}.{}()'.format(mapper_name, func_name))
+            return
+
+        guarded = to_destination and isinstance(model_mapper, UniformListModelMapper)
+        if guarded:
+            writer.line('if {}._orig_data:'.format(mapper_name))
+            writer.indent()
+
+        origin_accessor = '{}._origin_accessor'.format(mapper_name)
+        destination_accessor = '{}._destination_accessor'.format(mapper_name)
+        origin = 'o' + mapper_name[1:]
+        destination = 'd' + mapper_name[1:]
+        writer.line('{} = {}._model'.format(origin, origin_accessor))
+        writer.line('{} = {}._model'.format(destination, destination_accessor))
+
+        for _, child in model_mapper.children:
+            self._write_mapper(writer, child, to_destination)
+
+        models = {
+            'origin': (origin, origin_accessor, model_mapper.origin_accessor.model),
+            'destination': (destination, destination_accessor, model_mapper.destination_accessor.model),
+        }
+        resolver = None
+        for _, field in model_mapper.fields:
+            converters = get_converters(field)
+            convert = None
+            if converters is not None:
+                convert = '{}.{}'.format(self._name('c', converters),
+                                         'to_destination' if to_destination else 'to_origin')
+            skip_unchanged = get_skip_unchanged(field)
+            if to_destination and (model_mapper.write_policy is not None or skip_unchanged):
+                # Compare-before-write is done by the mapper itself, sharing
+                # one resolver of the destination prefixes per sync
+                if resolver is None:
+                    resolver = 'r' + mapper_name[1:]
+                    writer.line('{} = _PrefixResolver({})'.format(resolver, destination_accessor))
+                self._write_field(writer, field.origin_access, models['origin'], None, None,
+                                  write='{}._write_destination({}, v, {}, {!r})'.format(
+                                      mapper_name, self._name('f', field), resolver, skip_unchanged),
+                                  convert=convert)
+            elif to_destination:
+                self._write_field(writer, field.origin_access, models['origin'],
+                                  field.destination_access, models['destination'], convert=convert)
+            else:
+                self._write_field(writer, field.destination_access, models['destination'],
+                                  field.origin_access, models['origin'], convert=convert)
+
+        if guarded:
+            writer.dedent()
+
+    def _write_field(self, writer, get_access, get_model, set_access, set_model, write=None, convert=None):
+        """Write the copy of one field. Missing items are skipped without
+        raising exceptions whenever the compiled shapes allow it, and the
+        accesses whose models changed of shape are done by the interpreted walk
+
+        :param write: statement writing ``v``, instead of setting ``set_access``
+        :param convert: expression of the function converting ``v`` before writing it
+        """
+        model_name, accessor_name, model_obj = get_model
+        if isinstance(get_access, FieldAccessor) or compile_path(get_access).wildcard:
+            # Keep the ModelAccessor semantics for them
+            if isinstance(get_access, FieldAccessor):
+                self._write_field_accessor_parent(writer, get_access, accessor_name)
+                access = self._name('f', get_access)
+            else:
+                access = repr(compile_path(get_access).access)
+            writer.line('v = {}.lookup({}, _MISSING)'.format(accessor_name, access))
+        else:
+            path = compile_path(get_access)
+            writer.line('try:')
+            writer.indent()
+            if self._is_dict_path(model_obj, path.steps):
+                expression = model_name
+                for position, (attr, _) in enumerate(path.steps):
+                    if position:
+                        writer.line('if v is not _MISSING:')
+                        writer.indent()
+                    writer.line('v = {}.get({!r}, _MISSING)'.format(expression, attr))
+                    if position:
+                        writer.dedent()
+                    expression = 'v'
+            else:
+                expression, _ = self._get_expression(model_name, model_obj, path.steps)
+                writer.line('v = {}'.format(expression))
+            writer.dedent()
+            writer.line('except _SHAPE_ERRORS:')
+            writer.indent()
+            writer.line('v = {}.lookup({!r}, _MISSING)'.format(accessor_name, path.access))
+            writer.dedent()
+
+        writer.line('if v is not _MISSING:')
+        writer.indent()
+        if convert is not None:
+            writer.line('v = {}(v)'.format(convert))
+        if write is None:
+            self._write_set(writer, set_access, set_model)
+        else:
+            writer.line(write)
+        writer.dedent()
+
+    @staticmethod
+    def _is_dict_path(obj, steps):
+        """Whether every container of ``steps`` is a dict at compile time"""
+        for attr, _ in steps:
+            if not isinstance(obj, dict):
+                return False
+            obj = obj.get(attr, _UNKNOWN)
+        return True
+
+    def _write_field_accessor_parent(self, writer, field_accessor, accessor_name):
+        name = self._name('f', field_accessor)
+        writer.line('if {}._parent_accessor is None:'.format(name))
+        writer.indent()
+        writer.line('{}.parent_accessor = {}'.format(name, accessor_name))
+        writer.dedent()
+
+    def _write_set(self, writer, access, model):
+        model_name, accessor_name, model_obj = model
+        if isinstance(access, FieldAccessor):
+            self._write_field_accessor_parent(writer, access, accessor_name)
+            writer.line('{}.set_value(v)'.format(self._name('f', access)))
+            return
+
+        path = compile_path(access)
+        if path.wildcard:
+            writer.line('{}[{!r}] = v'.format(accessor_name, path.access))
+            return
+        expression, parent = self._get_expression(model_name, model_obj, path.parent_steps)
+        attr, index = path.last_step
+        writer.line('try:')
+        writer.indent()
+        if isinstance(parent, dict):
+            writer.line('{}[{!r}] = v'.format(expression, attr))
+        elif isinstance(parent, list) and index is not None:
+            writer.line('{}[{!r}] = v'.format(expression, index))
+        elif parent is not _UNKNOWN and not isinstance(parent, (list, tuple)) and _is_identifier(attr):
+            writer.line('{}.{} = v'.format(expression, attr))
+        else:
+            writer.line('_set_step({}, {!r}, v, {!r})'.format(expression, attr, index))
+        writer.dedent()
+        # Nothing has been written if the parent can't be got or doesn't fit
+        writer.line('except _SHAPE_ERRORS:')
+        writer.indent()
+        writer.line('{}[{!r}] = v'.format(accessor_name, path.access))
+        writer.dedent()
+
+    @staticmethod
+    def _get_expression(expression, obj, steps):
+        """Build the expression to get ``steps`` from ``expression``, specialized
+        for the types found walking ``obj`` at compile time
+
+        :return: tuple(expression, object found at compile time or _UNKNOWN)
+        """
+        for attr, index in steps:
+            if isinstance(obj, dict):
+                expression = '{}[{!r}]'.format(expression, attr)
+                obj = obj.get(attr, _UNKNOWN)
+            elif isinstance(obj, (list, tuple)) and index is not None:
+                expression = '{}[{!r}]'.format(expression, index)
+                obj = obj[index] if -len(obj) <= index < len(obj) else _UNKNOWN
+            elif obj is not _UNKNOWN and not isinstance(obj, (list, tuple)) and _is_identifier(attr):
+                expression = '{}.{}'.format(expression, attr)
+                obj = getattr(obj, attr, _UNKNOWN)
+            else:
+                expression = '_get_step({}, {!r}, {!r})'.format(expression, attr, index)
+                obj = _UNKNOWN
+        return expression, obj
@@ -0,0 +1,168 @@
+"""
+    Value conversions applied to the fields while they are synced, memoized
+    so every expensive parse or format runs once per distinct value
+"""
+from modelmapper import exceptions as exc
+from modelmapper.accessors import FieldAccessor
+from modelmapper.cache import LRUCache
+
+DEFAULT_MAXSIZE = 256
+
+_MISSING = object()
+
+
+def _callables(functions):
+    """Tuple of the conversion ``functions``: a callable or an iterable of them"""
+    if callable(functions):
+        return (functions,)
+    try:
+        functions = tuple(functions)
+    except TypeError:
+        raise TypeError("Converters must be a callable or an iterable of callables, not {!r}".format(functions))
+    for function in functions:
+        if not callable(function):
+            raise TypeError("Converter {!r} is not callable".format(function))
+    return functions
+
+
+def _convert(functions, value):
+    for function in functions:
+        try:
+            value = function(value)
+        except Exception as e:
+            # Not to be taken for a missing item of the models
+            error = exc.ConverterError("{} failed converting {!r}: {}".format(
+                getattr(function, '__name__', function), value, e))
+            error.__cause__ = e
+            raise error
+    return value
+
+
+class Converter(object):
+    """Memoized one-argument conversion function, e.g. a date parser.
+
+    The results are kept in a bounded LRU cache keyed by the type and the
+    value of the argument (unhashable arguments are always converted), so
+    the function must be pure and its results immutable or never mutated.
+    """
+    __slots__ = ('function', '_cache')
+
+    def __init__(self, function, maxsize=DEFAULT_MAXSIZE):
+        """
+        :param function: callable(value) returning the converted value
+        :param maxsize: maximum number of conversions cached, ``None`` means unbounded
+        """
+        self.function = function
+        self._cache = LRUCache(maxsize)
+
+    def __getstate__(self):
+        return {'function': self.function, 'maxsize': self._cache.maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state['function'], maxsize=state['maxsize'])
+
+    def __call__(self, value):
+        key = (value.__class__, value)
+        cache = self._cache
+        try:
+            result = cache.get(key, _MISSING)
+        except TypeError:
+            # Unhashable value
+            return self.function(value)
+        if result is _MISSING:
+            result = self.function(value)
+            cache.set(key, result)
+        return result
+
+    @property
+    def hits(self):
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        return self._cache.misses
+
+    @property
+    def hit_rate(self):
+        return self._cache.hit_rate
+
+    def clear(self):
+        """Forget the cached conversions and reset the counters"""
+        self._cache.clear()
+
+    def __repr__(self):
+        return "{}({}, hits={}, misses={}, hit_rate={:.2f})".format(
+            self.__class__.__name__, getattr(self.function, '__name__', self.function), self.hits, self.misses,
+            self.hit_rate)
+
+
+class ConverterPipeline(object):
+    """Conversions of a field in both directions of the sync.
+
+    The origin values are passed through the ``to_destination`` functions in
+    order before writing them in the destination model, and the destination
+    values through the ``to_origin`` ones before writing them in the origin
+    model. Use :class:`Converter` functions to memoize the expensive ones.
+    The exceptions raised by the functions are raised as :class:`ConverterError`.
+
+    It's set with a ``converters`` item in the ``info`` of a :class:`Field`
+    declaration or of its destination :class:`FieldAccessor`, or with the
+    ``CONVERTERS`` attribute of the :class:`FieldAccessor` class.
+    """
+    __slots__ = ('_to_destination', '_to_origin')
+
+    def __init__(self, to_destination=(), to_origin=()):
+        """
+        :param to_destination: callable or iterable of callables
+        :param to_origin: callable or iterable of callables
+        :raise TypeError: if any of them is not callable
+        """
+        self._to_destination = _callables(to_destination)
+        self._to_origin = _callables(to_origin)
+
+    def __getstate__(self):
+        return {'_to_destination': self._to_destination, '_to_origin': self._to_origin}
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
+    def to_destination(self, value):
+        return _convert(self._to_destination, value)
+
+    def to_origin(self, value):
+        return _convert(self._to_origin, value)
+
+    def convert(self, value, to_destination):
+        return self.to_destination(value) if to_destination else self.to_origin(value)
+
+    @property
+    def converters(self):
+        """:class:`Converter` functions of both directions"""
+        return tuple(function for function in self._to_destination + self._to_origin
+                     if isinstance(function, Converter))
+
+    @property
+    def hit_rates(self):
+        """:class:`dict` with the cache hit rate of each :class:`Converter`"""
+        return dict((converter, converter.hit_rate) for converter in self.converters)
+
+
+def get_converters(field):
+    """:class:`ConverterPipeline` of a :class:`Field` declaration, or ``None``
+    if its values are copied as they are. A callable, e.g. a :class:`Converter`,
+    or an iterable of callables only converts the values synced to the destination.
+
+    :raise ConverterError: if the converters are none of them
+    """
+    converters = field.info.get('converters')
+    dest_access = field.destination_access
+    if converters is None and isinstance(dest_access, FieldAccessor):
+        converters = dest_access.info.get('converters', dest_access.CONVERTERS)
+    if converters is None or isinstance(converters, ConverterPipeline):
+        return converters
+    try:
+        return ConverterPipeline(to_destination=converters)
+    except TypeError as e:
+        raise exc.ConverterError("Wrong converters of the field {!r}: {}".format(
+            getattr(dest_access, 'access', dest_access), e))
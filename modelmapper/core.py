@@ -1,17 +1,96 @@
+import array
+import contextlib
+import functools
 import itertools
 
-from modelmapper import exceptions as exc, compat
-from modelmapper.accessors import ModelAccessor, FieldAccessor
+from modelmapper import exceptions as exc
+from modelmapper import pubsub
+from modelmapper.accessors import ModelAccessor, FieldAccessor, MISSING, compile_access, compile_path, get_value
+from modelmapper.cache import LRUCache
+from modelmapper.compiler import MapperCompiler
+from modelmapper.converters import get_converters
+from modelmapper.plan import MappingPlan, DEFAULT_CHUNK_SIZE
+from modelmapper.policies import differ, fingerprint as get_fingerprint, get_skip_unchanged
+from modelmapper.stats import SyncStats
+from modelmapper.streaming import write_json
+from modelmapper.trie import AccessTrie, PrefixResolver
 from modelmapper.declarations import Mapper, UniformMapper, ListMapper, CombinedField
 
 
+def _origin_steps(access):
+    return compile_path(access.access if isinstance(access, FieldAccessor) else access).steps
+
+
+def _compose_getters(access, get):
+    return lambda model: get(get_value(model, access, strict=True))
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise exc.ModelMapperError("NumPy is needed to export structured arrays")
+    return numpy
+
+
+def _infer_dtype(values):
+    """NumPy dtype of a column with all the ``values``: booleans, integers,
+    floats (integers included) or Python objects for anything else
+    """
+    dtype = 'O'
+    for value in values:
+        if isinstance(value, bool):
+            value_dtype = '?'
+        elif isinstance(value, int):
+            value_dtype = 'i8'
+        elif isinstance(value, float):
+            value_dtype = 'f8'
+        else:
+            return 'O'
+        if dtype == 'O' or dtype == value_dtype:
+            dtype = value_dtype
+        elif '?' in (dtype, value_dtype):
+            return 'O'
+        else:
+            dtype = 'f8'
+    return dtype
+
+
+def _access_key(access):
+    """Key of ``access`` in the access indexes of the mappers"""
+    if isinstance(access, FieldAccessor):
+        access = access.access
+    return compile_path(access).steps if access else ()
+
+
+def _step_matches(step, other_step):
+    """Whether two steps are the same one, or one is ``[*]`` and the other an index"""
+    if step == other_step:
+        return True
+    if step[0] == '*':
+        return other_step[1] is not None
+    return other_step[0] == '*' and step[1] is not None
+
+
+def _is_prefix(steps, other_steps):
+    """Whether ``steps`` is a prefix of ``other_steps`` (``[*]`` matches any index)"""
+    if len(steps) > len(other_steps):
+        return False
+    for step, other_step in zip(steps, other_steps):
+        if not _step_matches(step, other_step):
+            return False
+    return True
+
+
 class ModelMapper(object):
     """Main class to make the mapping and linking between an origin model and a
     destination model
     """
     __slots__ = ('_origin_model', '_destination_model', '_mapper', '_mapper_accessor',
                  '_origin_accessor', '_destination_accessor', '_children', '_fields',
-                 '_combined_fields', '_info')
+                 '_combined_fields', '_info', '_compiled', '_plan', '_fields_by_origin_prefix',
+                 '_fields_by_destination_prefix', '_fingerprints', '_dirty_fields', '_write_policy',
+                 '_origin_index', '_destination_index', '_origin_bindings', '_bulk_depth', '_parent')
 
     def __init__(self, origin_model, destination_model, mapper, **info):
         """
@@ -32,8 +111,26 @@ class ModelMapper(object):
         self._children = set()  # set([(field_name, <obj ModelMapper>),])
         self._fields = set()  # set([(field_name, <obj ModelMapper>),])
         self._combined_fields = set()  # set([(field_name, <obj ModelMapper>),])
+        # Fields ordered by the access tries, so shared prefixes are resolved once per sync
+        self._fields_by_origin_prefix = ()
+        self._fields_by_destination_prefix = ()
+        # {access steps: [(field_name, <obj Field or ModelMapper>),]}, None until the mapper is prepared
+        self._origin_index = None
+        self._destination_index = None
+        # tuple((<obj ModelMapper>, compiled origin access or None),) to rebind the children
+        self._origin_bindings = ()
 
         self._info = ModelAccessor(info)
+        self._compiled = None  # tuple(origin_to_destination, destination_to_origin) functions
+        self._plan = None
+
+        # Incremental sync: {Field: fingerprint of the last origin value synced} and
+        # set of fields explicitly marked as changed
+        self._fingerprints = {}
+        self._dirty_fields = set()
+        self._write_policy = None
+        self._bulk_depth = 0  # Nesting level of bulk_apply()
+        self._parent = None  # ModelMapper this one is a child of
 
     def create_child_by_declaration_type(self, declaration):
         """Create a new :class:`ModelMapper` object, based on a
@@ -61,9 +158,15 @@ class ModelMapper(object):
         info, orig_model, dest_model = _get_complete_info_and_parent_models()
 
         if isinstance(declaration, UniformMapper):
-            return UniformListModelMapper(orig_model, dest_model, mapper, **info)
+            model_mapper = UniformListModelMapper(orig_model, dest_model, mapper, **info)
+        elif isinstance(declaration, ListMapper):
+            model_mapper = ListModelMapper(orig_model, dest_model, mapper, **info)
         elif isinstance(declaration, Mapper):
-            return ModelMapper(orig_model, dest_model, mapper, **info)
+            model_mapper = ModelMapper(orig_model, dest_model, mapper, **info)
+        else:
+            return None
+        model_mapper._write_policy = self._write_policy
+        return model_mapper
 
     @property
     def origin_model(self):
@@ -77,6 +180,20 @@ class ModelMapper(object):
         for _, model_mapper in self._children:
             model_mapper.origin_model = self._origin_accessor[model_mapper.origin_access]
 
+    def _rebind_origin(self, model):
+        """Bind the origin ``model`` to the subtree through the precompiled
+        relative accesses of the children, reusing their accessors
+        """
+        self._origin_model = model
+        self._origin_accessor._model = model
+        for child, access in self._origin_bindings:
+            child._rebind_origin(model if access is None else get_value(model, access, strict=True))
+
+    def _collect_origin_binding(self, binding):
+        binding.append((self, self._origin_model, MISSING, MISSING))
+        for child, _ in self._origin_bindings:
+            child._collect_origin_binding(binding)
+
     @property
     def destination_model(self):
         return self._destination_model
@@ -93,6 +210,21 @@ class ModelMapper(object):
     def info(self):
         return self._info
 
+    @property
+    def write_policy(self):
+        return self._write_policy
+
+    @write_policy.setter
+    def write_policy(self, policy):
+        """Set the :class:`modelmapper.policies.WritePolicy` of the destination
+        writes in the whole tree (``None`` to write always)
+        """
+        self._write_policy = policy
+        for _, child in self._children:
+            child.write_policy = policy
+        if self._compiled is not None:
+            self._compiled = MapperCompiler(self).compile()
+
     @property
     def origin_access(self):
         return self._info.get('origin_access')
@@ -109,6 +241,14 @@ class ModelMapper(object):
     def mapper(self, val):
         self._mapper = val
         self._mapper_accessor = ModelAccessor(val)
+        self._plan = None
+
+    @property
+    def plan(self):
+        """:class:`MappingPlan` of this mapper, built the first time it's needed"""
+        if self._plan is None:
+            self._plan = MappingPlan.from_declaration(self)
+        return self._plan
 
     @property
     def origin_accessor(self):
@@ -142,25 +282,232 @@ class ModelMapper(object):
         and :class:`ModelMapper`
         :return: None
         """
-        _add_children = self._children.add
-        _add_field = self._fields.add
-        _add_combined_field = self._combined_fields.add
-        create_child_by_declaration = self.create_child_by_declaration_type
+        self._origin_index = {}
+        self._destination_index = {}
         updated_fields = dict()
 
         for field_name, declaration_type in self._mapper_accessor:
-            if isinstance(declaration_type, (Mapper, UniformMapper, ListMapper)):
-                model_mapper = create_child_by_declaration(declaration_type)
-                updated_fields[field_name] = model_mapper
-                model_mapper.prepare_mapper()
-                _add_children((field_name, model_mapper))
-            elif isinstance(declaration_type, CombinedField):
-                _add_combined_field((field_name, declaration_type))
-            else:
-                _add_field((field_name, declaration_type))
+            value = self._add_declaration(field_name, declaration_type)
+            if value is not declaration_type:
+                updated_fields[field_name] = value
 
         # Update mapper model to change Mapper declarations to ModelMapper classes
         self._mapper_accessor.model.update(updated_fields)
+        self._update_entries()
+
+    def _add_declaration(self, field_name, declaration_type):
+        """Save a declaration of the mapper and index it by its accesses
+
+        :return: the declaration or the :class:`ModelMapper` created for it
+        """
+        if isinstance(declaration_type, (Mapper, UniformMapper, ListMapper)):
+            model_mapper = self.create_child_by_declaration_type(declaration_type)
+            model_mapper._parent = self
+            model_mapper.prepare_mapper()
+            self._children.add((field_name, model_mapper))
+            self._index_declaration(field_name, model_mapper)
+            return model_mapper
+        elif isinstance(declaration_type, CombinedField):
+            self._combined_fields.add((field_name, declaration_type))
+        else:
+            if isinstance(declaration_type, ModelMapper):
+                declaration_type._parent = self
+                self._children.add((field_name, declaration_type))
+            else:
+                self._fields.add((field_name, declaration_type))
+            self._index_declaration(field_name, declaration_type)
+        return declaration_type
+
+    def _remove_declaration(self, field_name, declaration_type):
+        item = (field_name, declaration_type)
+        for declarations in (self._children, self._fields, self._combined_fields):
+            declarations.discard(item)
+        if isinstance(declaration_type, CombinedField):
+            return
+        for index, access in ((self._origin_index, declaration_type.origin_access),
+                              (self._destination_index, declaration_type.destination_access)):
+            items = index.get(_access_key(access))
+            if items and item in items:
+                items.remove(item)
+        self._fingerprints.pop(declaration_type, None)
+        self._dirty_fields.discard(declaration_type)
+
+    def _index_declaration(self, field_name, declaration_type):
+        item = (field_name, declaration_type)
+        self._origin_index.setdefault(_access_key(declaration_type.origin_access), []).append(item)
+        self._destination_index.setdefault(_access_key(declaration_type.destination_access), []).append(item)
+
+    def _update_entries(self):
+        self._origin_bindings = tuple((child, compile_path(child.origin_access) if child.origin_access else None)
+                                      for _, child in self._children)
+        # tuple(field, origin access, destination access, compare-before-write override,
+        # converters or None) with the accesses already compiled
+        entries = [(field, compile_access(field.origin_access), compile_access(field.destination_access),
+                    get_skip_unchanged(field), get_converters(field))
+                   for _, field in self._fields]
+        self._fields_by_origin_prefix = tuple(AccessTrie((entry[1], entry) for entry in entries))
+        self._fields_by_destination_prefix = tuple(AccessTrie((entry[2], entry) for entry in entries))
+
+    def _sync_fields(self, to_destination, stats=None):
+        """Copy all the :class:`Field` values in one direction. Each field is
+        read and written before the next one is read, in the order of the
+        access trie of the read side, so every container shared by several
+        fields is resolved only once (and also on the written side, as far as
+        both models share the structure).
+
+        :param stats: :class:`SyncStats` object to copy only the changed origin
+                      values (see :meth:`sync_changed`)
+        """
+        if to_destination:
+            getter, setter = PrefixResolver(self._origin_accessor), PrefixResolver(self._destination_accessor)
+            entries = self._fields_by_origin_prefix
+            get_index, set_index = 1, 2
+        else:
+            getter, setter = PrefixResolver(self._destination_accessor), PrefixResolver(self._origin_accessor)
+            entries = self._fields_by_destination_prefix
+            get_index, set_index = 2, 1
+
+        get, set_ = getter.get, setter.set
+        checked = to_destination and (self._write_policy is not None or any(entry[3] for entry in entries))
+        fingerprints = self._fingerprints
+        dirty_fields = self._dirty_fields
+        for entry in entries:
+            field = entry[0]
+            value = get(entry[get_index])
+            if value is MISSING:
+                continue
+            if stats is not None:
+                fingerprint = get_fingerprint(value)
+                if field not in dirty_fields and not differ(fingerprints.get(field, MISSING), fingerprint):
+                    stats.skipped += 1
+                    continue
+                fingerprints[field] = fingerprint
+                stats.synced += 1
+            if entry[4] is not None:
+                value = entry[4].convert(value, to_destination)
+            if checked:
+                self._write_destination(field, value, setter=setter, skip_unchanged=entry[3])
+            else:
+                set_(entry[set_index], value)
+        if stats is not None:
+            dirty_fields.clear()
+
+    def _write_destination(self, field, value, setter=None, skip_unchanged=MISSING):
+        """Write the destination value of ``field`` following the write policy
+
+        :param setter: :class:`PrefixResolver` of the destination model
+        :param skip_unchanged: compare-before-write override of the field, if
+                               it's already known
+        """
+        setter = PrefixResolver(self._destination_accessor) if setter is None else setter
+        dest_access = field.destination_access
+        policy = self._write_policy
+        if skip_unchanged is MISSING:
+            skip_unchanged = get_skip_unchanged(field)
+        if skip_unchanged is None:
+            skip_unchanged = policy is not None and policy.skip_unchanged
+
+        if skip_unchanged:
+            current = setter.get(dest_access)
+            if current is not MISSING and not differ(current, value):
+                if policy is not None:
+                    policy.stats.skipped += 1
+                return
+        setter.set(dest_access, value)
+        if policy is not None:
+            policy.stats.performed += 1
+
+    def sync_changed(self, stats=None):
+        """Incremental :meth:`origin_to_destination`: copy only the fields whose
+        origin value changed since the last :meth:`sync_changed`, or which were
+        marked with :meth:`mark_dirty`, in the whole tree.
+
+        Changes are detected comparing the origin values with a fingerprint of
+        the last value synced (the value itself, or a shallow copy for lists,
+        dicts and sets). Changes inside nested mutable values must be notified
+        with :meth:`mark_dirty`.
+
+        :param stats: optional :class:`modelmapper.stats.SyncStats` to accumulate
+                      the counters of several syncs
+        :return: :class:`modelmapper.stats.SyncStats` with the number of fields
+                 synced and skipped
+        """
+        stats = SyncStats() if stats is None else stats
+        for _, child in self._children:
+            child.sync_changed(stats=stats)
+        self._sync_fields(to_destination=True, stats=stats)
+        return stats
+
+    def mark_dirty(self, access=None):
+        """Mark as changed the fields whose origin value is at, or under,
+        ``access``, so the next :meth:`sync_changed` copies them.
+
+        :param access: origin access relative to the origin model of this
+                       mapper (e.g. ``'dd'`` marks ``'dd.b'`` and ``'dd.e.f'``).
+                       ``None`` marks the whole mapper
+        :return: None
+        """
+        if access is None:
+            self._dirty_fields.update(field for _, field in self._fields)
+            for _, child in self._children:
+                child.mark_dirty()
+            return
+        self._mark_dirty_steps(compile_path(access).steps)
+
+    def _mark_dirty_steps(self, steps):
+        if not steps:
+            self.mark_dirty()
+            return
+
+        for _, field in self._fields:
+            field_steps = _origin_steps(field.origin_access)
+            if _is_prefix(steps, field_steps) or _is_prefix(field_steps, steps):
+                self._dirty_fields.add(field)
+
+        for _, child in self._children:
+            child_steps = _origin_steps(child.origin_access) if child.origin_access else ()
+            if _is_prefix(steps, child_steps):
+                child.mark_dirty()
+            elif _is_prefix(child_steps, steps):
+                child._mark_dirty_steps(steps[len(child_steps):])
+
+    def _forget_fingerprints(self):
+        """Full syncs leave the destination in an unknown state for
+        :meth:`sync_changed`, so every field is copied by the next one
+        """
+        if self._fingerprints:
+            self._fingerprints.clear()
+        for _, child in self._children:
+            child._forget_fingerprints()
+
+    def compile(self):
+        """Generate a specialized sync function per direction for the whole
+        prepared tree, used from now on by :meth:`origin_to_destination` and
+        :meth:`destination_to_origin` when they're called without ``field_name``.
+
+        The generated code is specialized for the shape (dict, list or object)
+        of the models bound at this moment. Models bound later with a different
+        structure are synced by the interpreted walk, access by access, so call
+        it again after binding them to get the specialized code back.
+        :return: None
+        """
+        for _, child in self._children:
+            child.compile()
+        self._compiled = MapperCompiler(self).compile()
+
+    @property
+    def compiled(self):
+        return self._compiled is not None
+
+    def _run_compiled(self, to_destination):
+        """Run the compiled sync function, if any
+
+        :return: ``True`` if the compiled function did the whole sync
+        """
+        if self._compiled is None:
+            return False
+        self._compiled[0 if to_destination else 1]()
+        return True
 
     def destination_to_origin(self, field_name=None):
         """Update all the values, or some specific value from a field, from
@@ -178,12 +525,13 @@ class ModelMapper(object):
 
             orig_access = field.origin_access
             dest_access = field.destination_access
-            try:
-                dest_field_value = dest_accessor[dest_access]
-            except exc.ModelAccessorAttributeError:
-                pass
-            else:
+            dest_field_value = dest_accessor.lookup(dest_access)
+            if dest_field_value is not MISSING:
+                converters = get_converters(field)
+                if converters is not None:
+                    dest_field_value = converters.to_origin(dest_field_value)
                 orig_accessor[orig_access] = dest_field_value
+                self._fingerprints.pop(field, None)
 
         orig_accessor = self._origin_accessor
         dest_accessor = self._destination_accessor
@@ -192,12 +540,16 @@ class ModelMapper(object):
             _des_to_orig(self._mapper_accessor[field_name], orig_accessor, dest_accessor)
             return
 
+        # The origin values change, the last ones synced to the destination
+        # can't be trusted by sync_changed anymore
+        self._forget_fingerprints()
+        if self._run_compiled(to_destination=False):
+            return
+
         for _, child in self._children:
             child.destination_to_origin()
 
-        for _, field in self._fields:
-            _des_to_orig(field, orig_accessor, dest_accessor)
-
+        self._sync_fields(to_destination=False)
 
     def origin_to_destination(self, field_name=None):
         """Update all the values, or some specific value from a field, from
@@ -213,14 +565,13 @@ class ModelMapper(object):
                 field.origin_to_destination()
                 return
 
-            orig_access = field.origin_access
-            dest_access = field.destination_access
-            try:
-                orig_field_value = orig_accessor[orig_access]
-            except exc.ModelAccessorAttributeError:
-                pass
-            else:
-                dest_accessor[dest_access] = orig_field_value
+            orig_field_value = orig_accessor.lookup(field.origin_access)
+            if orig_field_value is not MISSING:
+                converters = get_converters(field)
+                if converters is not None:
+                    orig_field_value = converters.to_destination(orig_field_value)
+                self._write_destination(field, orig_field_value)
+                self._fingerprints.pop(field, None)
 
         orig_accessor = self._origin_accessor
         dest_accessor = self._destination_accessor
@@ -229,11 +580,50 @@ class ModelMapper(object):
             _orig_to_dest(self._mapper_accessor[field_name], orig_accessor, dest_accessor)
             return
 
+        self._forget_fingerprints()
+        if self._run_compiled(to_destination=True):
+            return
+
         for _, child in self._children:
             child.origin_to_destination()
 
+        self._sync_fields(to_destination=True)
+
+    @contextlib.contextmanager
+    def bulk_apply(self):
+        """Context to write a whole record into the destination without a storm
+        of change notifications: the signals of the destination fields are
+        blocked (see :meth:`FieldAccessor.block_signals`) while it lasts and,
+        at the end, only one ``'record_loaded'`` event is published with this
+        mapper as data
+
+            with model_mapper.bulk_apply():
+                model_mapper.origin_to_destination()
+        """
+        blocked = [(accessor, accessor.block_signals(True)) for accessor in self._destination_field_accessors()]
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            for accessor, was_blocked in reversed(blocked):
+                accessor.block_signals(was_blocked)
+        if not self._bulk_depth:
+            pubsub.publish('record_loaded', self)
+
+    def _destination_field_accessors(self):
+        """Yield the :class:`FieldAccessor` destinations of this mapper and its
+        children, bound to their destination models
+        """
         for _, field in self._fields:
-            _orig_to_dest(field, orig_accessor, dest_accessor)
+            access = field.destination_access
+            if isinstance(access, FieldAccessor):
+                if access.parent_accessor is None:
+                    access.parent_accessor = self._destination_accessor
+                yield access
+        for _, child in self._children:
+            for access in child._destination_field_accessors():
+                yield access
 
     def to_dict(self, only_origin=False, only_destination=False):
         dest_accessor = self._destination_accessor
@@ -254,28 +644,158 @@ class ModelMapper(object):
                 ret[field_name] = (orig_accessor[orig_access], dest_accessor[dest_access])
         return ret
 
-    def _filter_fields_by_access(self, access, field_source):
+    def iter_items(self, only_origin=False, only_destination=False):
+        """Lazy version of :meth:`to_dict`: yield its leaf values as
+        tuple(path, value), where ``path`` is the tuple of keys (field names)
+        and list indexes of ``value`` in the :meth:`to_dict` data. Empty
+        mappers and lists are yielded as ``{}`` and ``[]`` values.
 
-        def compare_access(decl):
-            orig_or_dest = getattr(decl[1], field_source)  # (field_name, Field)
-            orig_or_dest_access = orig_or_dest.access if isinstance(orig_or_dest, FieldAccessor) else orig_or_dest
-            return access == orig_or_dest_access
+        Only the current path is kept in memory, so it's the way to export
+        big trees (see :meth:`dump_json`).
+        """
+        if only_origin:
+            return self._origin_walker()(self._origin_model, ())
+        return self._iter_bound_items((), only_destination)
 
-        return compat.filter(compare_access, self._fields)
+    def dump_json(self, fp, only_origin=False, only_destination=False, encoder=None):
+        """Write the :meth:`to_dict` data as JSON to the file object ``fp``,
+        incrementally while the tree is walked
+
+        :param encoder: :class:`json.JSONEncoder` object for the values
+        :return: None
+        """
+        write_json(self.iter_items(only_origin=only_origin, only_destination=only_destination), fp,
+                   encoder=encoder)
+
+    def _iter_bound_items(self, path, only_destination):
+        dest_accessor = self._destination_accessor
+        orig_accessor = self._origin_accessor
+        empty = True
+
+        for field_name, field in self._mapper_accessor:
+            empty = False
+            field_path = path + (field_name,)
+            if isinstance(field, ModelMapper):
+                for item in field._iter_bound_items(field_path, only_destination):
+                    yield item
+            elif only_destination:
+                yield field_path, dest_accessor[field.destination_access]
+            else:
+                yield field_path, (orig_accessor[field.origin_access], dest_accessor[field.destination_access])
+        if empty:
+            yield path, {}
+
+    def _origin_walker(self):
+        """Like :meth:`_origin_exporter`, but the function yields the data as
+        :meth:`iter_items` does
+
+        :return: generator function(origin model, path)
+        """
+        items = []
+        for field_name, field in self._mapper_accessor:
+            if isinstance(field, ModelMapper):
+                access = compile_path(field.origin_access) if field.origin_access else None
+                items.append((field_name, access, field._origin_walker()))
+            else:
+                items.append((field_name, compile_access(field.origin_access), None))
+
+        def walk(model, path):
+            if not items:
+                yield path, {}
+            for field_name, access, child_walk in items:
+                if child_walk is None:
+                    yield path + (field_name,), get_value(model, access, strict=True)
+                    continue
+                child_model = model if access is None else get_value(model, access, strict=True)
+                for item in child_walk(child_model, path + (field_name,)):
+                    yield item
+
+        return walk
+
+    def _origin_columns(self, prefix=''):
+        """Columns of the origin models of this mapper: the fields, and the
+        fields of the children prefixed with their field name (e.g.
+        ``'c_0_link.a_link'``). Lists of the children are single columns.
+
+        :return: list of tuple(column name, function(origin model) returning its value)
+        """
+        columns = []
+        for field_name, field in self._mapper_accessor:
+            name = prefix + field_name
+            if not isinstance(field, ModelMapper):
+                getter = functools.partial(get_value, access=compile_access(field.origin_access), strict=True)
+                columns.append((name, getter))
+                continue
+            access = compile_path(field.origin_access) if field.origin_access else None
+            if isinstance(field, (UniformListModelMapper, ListModelMapper)):
+                child_columns = [(name, field._origin_exporter())]
+            else:
+                child_columns = field._origin_columns(name + '.')
+            for child_name, get in child_columns:
+                columns.append((child_name, get if access is None else _compose_getters(access, get)))
+        return columns
+
+    def _origin_exporter(self):
+        """Build the function returning the ``to_dict(only_origin=True)`` data
+        of any origin model of this mapper, without binding it to the mapper
+
+        :return: function(origin model)
+        """
+        items = []
+        for field_name, field in self._mapper_accessor:
+            if isinstance(field, ModelMapper):
+                access = compile_path(field.origin_access) if field.origin_access else None
+                items.append((field_name, access, field._origin_exporter()))
+            else:
+                items.append((field_name, compile_access(field.origin_access), None))
+
+        def export(model):
+            ret = {}
+            for field_name, access, child_export in items:
+                if child_export is None:
+                    ret[field_name] = get_value(model, access, strict=True)
+                else:
+                    ret[field_name] = child_export(model if access is None else get_value(model, access, strict=True))
+            return ret
+
+        return export
+
+    def map_many(self, origins, destination_factory, stats=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Map a stream of origin models to new destination models, reusing
+        the :class:`MappingPlan` of this mapper for every record. Bound models
+        are not modified.
+
+        :param origins: iterable of origin models
+        :param destination_factory: callable without arguments returning a new
+                                    destination model
+        :param stats: optional :class:`modelmapper.stats.MappingStats` to get
+                      the throughput in records/sec
+        :param workers: opt-in number of worker processes to map chunks of
+                        ``origins`` in parallel (see :meth:`MappingPlan.map_many`)
+        :param chunk_size: number of records sent to a worker process at once
+        :return: generator of populated destination models, in order
+        """
+        return self.plan.map_many(origins, destination_factory, stats=stats, workers=workers,
+                                  chunk_size=chunk_size)
+
+    def _filter_by_access(self, access, index, children):
+        """Declarations of ``index`` with ``access``: :class:`ModelMapper`
+        children if ``children`` is true, :class:`Field` objects otherwise
+        """
+        items = index.get(_access_key(access), ()) if index is not None else ()
+        return iter([item for item in items if isinstance(item[1], ModelMapper) == children])
 
     def filter_fields_by_orig_access(self, access):
-        return self._filter_fields_by_access(access, 'origin_access')
+        return self._filter_by_access(access, self._origin_index, children=False)
 
     def filter_fields_by_dest_access(self, access):
-        return self._filter_fields_by_access(access, 'destination_access')
+        return self._filter_by_access(access, self._destination_index, children=False)
 
     def filter_children_by_orig_access(self, access):
-        return compat.filter(lambda decl: access == decl[1].origin_access,  # (field_name, ModelMapper)
-                             self._children)
+        return self._filter_by_access(access, self._origin_index, children=True)
 
     def filter_children_by_dest_access(self, access):
-        return compat.filter(lambda decl: access == decl[1].destination_access,
-                             self._children)
+        return self._filter_by_access(access, self._destination_index, children=True)
 
     def filter_origin_access(self, access):
         return itertools.chain(self.filter_children_by_orig_access(access),
@@ -285,11 +805,73 @@ class ModelMapper(object):
         return itertools.chain(self.filter_children_by_dest_access(access),
                                self.filter_fields_by_dest_access(access))
 
+    def find_origin_access(self, access):
+        """Find the declaration of the whole tree with the complete origin
+        ``access``, e.g. ``'d[1].ccc.a'`` (indexes of uniform lists are optional)
+
+        :return: tuple(owner :class:`ModelMapper`, field name, declaration) or
+                 ``None`` if there isn't any
+        """
+        return self._find_access(_access_key(access), origin=True)
+
+    def find_destination_access(self, access):
+        """Find the declaration of the whole tree with the complete destination
+        ``access``, e.g. ``'val_d.val_ccc.val_a'``
+
+        :return: tuple(owner :class:`ModelMapper`, field name, declaration) or
+                 ``None`` if there isn't any
+        """
+        return self._find_access(_access_key(access), origin=False)
+
+    def _find_access(self, steps, origin, start=0):
+        """Find the declaration with the access ``steps[start:]`` in this mapper
+        or in its descendants. The access of each child is compared step by step
+        from ``start``, and the children with an empty access are searched too
+        """
+        index = self._origin_index if origin else self._destination_index
+        if index is None:
+            return None
+        items = index.get(steps[start:] if start else steps)
+        if items:
+            return (self,) + items[0]
+
+        for _, child in self._children:
+            child_steps = _access_key(child.origin_access if origin else child.destination_access)
+            end = start + len(child_steps)
+            if end >= len(steps) and child_steps:
+                continue
+            if any(step != steps[position] for position, step in enumerate(child_steps, start)):
+                continue
+            if origin and child_steps and isinstance(child, UniformListModelMapper) and steps[end][1] is not None:
+                end += 1  # index of the uniform list
+            found = child._find_access(steps, origin, end)
+            if found is not None:
+                return found
+        return None
+
     def __getitem__(self, item):
         return self._mapper_accessor[item]
 
     def __setitem__(self, key, value):
-        self._mapper_accessor[key] = value
+        mapper = self._mapper_accessor.model
+        if self._origin_index is None or len(compile_path(key).steps) > 1:
+            self._mapper_accessor[key] = value
+        else:
+            # Keep the declarations and their indexes up to date
+            if key in mapper:
+                self._remove_declaration(key, mapper[key])
+            mapper[key] = self._add_declaration(key, value)
+            self._update_entries()
+            if self._compiled is not None:
+                self._compiled = MapperCompiler(self).compile()
+        self._plan = None
+        # The plans and compiled functions of the ancestors include this mapper
+        parent = self._parent
+        while parent is not None:
+            parent._plan = None
+            if parent._compiled is not None:
+                parent._compiled = MapperCompiler(parent).compile()
+            parent = parent._parent
 
     def __iter__(self):
         return iter(self._mapper_accessor)
@@ -301,7 +883,16 @@ class ModelMapper(object):
 
 
 class UniformListModelMapper(ModelMapper):
-    __slots__ = ('_orig_data', '_index')
+    """Mapper of a uniform list: the destination model is linked to the item
+    of the origin list pointed by :attr:`index`.
+
+    Moving the index rebinds the subtree through precompiled relative
+    accesses. With the ``row_cache_size`` info, the bindings of the last
+    visited rows are kept too, so going back and forth between rows doesn't
+    walk any access (call :meth:`clear_row_cache` if the items are changed
+    in place).
+    """
+    __slots__ = ('_orig_data', '_index', '_row_cache')
 
     def __init__(self, origin_model, destination_model, mapper, **info):
         assert isinstance(origin_model, list), "Origin model must be a list with uniform data"
@@ -310,6 +901,9 @@ class UniformListModelMapper(ModelMapper):
         self._index = 0
         origin_model = origin_model[0] if len(origin_model) > 0 else dict()
         super(UniformListModelMapper, self).__init__(origin_model, destination_model, mapper, **info)
+        row_cache_size = self._info.get('row_cache_size')
+        # {index: tuple(row, binding of the subtree)}
+        self._row_cache = LRUCache(maxsize=row_cache_size) if row_cache_size else None
 
     @property
     def orig_data(self):
@@ -321,6 +915,7 @@ class UniformListModelMapper(ModelMapper):
 
     @ModelMapper.origin_model.setter
     def origin_model(self, val):
+        self.clear_row_cache()
         self._orig_data = val
         try:
             self._origin_model = val[self._index]
@@ -337,11 +932,47 @@ class UniformListModelMapper(ModelMapper):
             return
         super(UniformListModelMapper, self).origin_to_destination(field_name=field_name)
 
+    def sync_changed(self, stats=None):
+        if not self._orig_data:
+            return SyncStats() if stats is None else stats
+        return super(UniformListModelMapper, self).sync_changed(stats=stats)
+
+    def _mark_dirty_steps(self, steps):
+        # Steps are relative to the origin list, only the current item is mapped
+        if steps and steps[0][0] == '*':
+            steps = steps[1:]
+        elif steps and steps[0][1] is not None:
+            if steps[0][1] != self._index:
+                return
+            steps = steps[1:]
+        super(UniformListModelMapper, self)._mark_dirty_steps(steps)
+
+    def _rebind_origin(self, model):
+        self.clear_row_cache()
+        self._orig_data = model
+        try:
+            row = model[self._index]
+        except IndexError:
+            # It could be model = []
+            return
+        super(UniformListModelMapper, self)._rebind_origin(row)
+
+    def _collect_origin_binding(self, binding):
+        binding.append((self, self._origin_model, self._orig_data, self._index))
+        for child, _ in self._origin_bindings:
+            child._collect_origin_binding(binding)
+
+    def clear_row_cache(self):
+        if self._row_cache is not None:
+            self._row_cache.clear()
+
     def insert_data(self, data_model=None, index=-1):
         data_model = dict() if data_model is None else data_model
+        self.clear_row_cache()
         self.orig_data.insert(index, data_model)
 
     def delete_data(self, index=-1):
+        self.clear_row_cache()
         try:
             self.orig_data.pop(index)
         except IndexError:
@@ -366,11 +997,28 @@ class UniformListModelMapper(ModelMapper):
     def _update_index(self, index):
         if self._index == index:
             return
+        row = self._orig_data[index]
         self._index = index
-        self._origin_model = self._orig_data[index]
-        self._origin_accessor = ModelAccessor(self._origin_model)
-        # Calling to parent's origin_model setter
-        ModelMapper.origin_model.fset(self, self._origin_model)
+
+        row_cache = self._row_cache
+        if row_cache is None:
+            ModelMapper._rebind_origin(self, row)
+            return
+        cached = row_cache.get(index)
+        # The binding is stale if the index of a nested list moved since it was cached
+        if cached is not None and cached[0] is row and all(
+                nested_index is MISSING or model_mapper._index == nested_index
+                for model_mapper, _, _, nested_index in cached[1][1:]):
+            for model_mapper, origin_model, orig_data, _ in cached[1]:
+                model_mapper._origin_model = origin_model
+                model_mapper._origin_accessor._model = origin_model
+                if orig_data is not MISSING:
+                    model_mapper._orig_data = orig_data
+            return
+        ModelMapper._rebind_origin(self, row)
+        binding = []
+        ModelMapper._collect_origin_binding(self, binding)
+        row_cache.set(index, (row, tuple(binding)))
 
     def to_dict(self, only_origin=False, only_destination=False):
         if only_origin:
@@ -380,81 +1028,186 @@ class UniformListModelMapper(ModelMapper):
         else:
             return (self._to_dict_only_origin(), super(UniformListModelMapper, self).to_dict(only_destination=True))
 
+    def _origin_exporter(self):
+        export_item = super(UniformListModelMapper, self)._origin_exporter()
+
+        def export(model):
+            return [export_item(item) for item in model]
+
+        return export
+
+    def _iter_bound_items(self, path, only_destination):
+        iter_destination = super(UniformListModelMapper, self)._iter_bound_items
+        if only_destination:
+            return iter_destination(path, True)
+        return itertools.chain(self._origin_walker()(self._orig_data, path + (0,)),
+                               iter_destination(path + (1,), True))
+
+    def _origin_walker(self):
+        walk_item = super(UniformListModelMapper, self)._origin_walker()
+
+        def walk(model, path):
+            if not model:
+                yield path, []
+            for index, item in enumerate(model):
+                for row_item in walk_item(item, path + (index,)):
+                    yield row_item
+
+        return walk
+
+    def to_columns(self, kind='list', typecodes=None, dtype=None):
+        """Export the origin data column by column, filled in one pass over
+        :attr:`orig_data`. The column names are the ones of
+        :meth:`_origin_columns`.
+
+        :param kind: ``'list'`` for a dict of lists, ``'array'`` for a dict of
+                     :class:`array.array` (columns without typecode are lists)
+                     or ``'numpy'`` for a NumPy structured array
+        :param typecodes: ``{column name: typecode}`` of the ``'array'`` columns
+        :param dtype: NumPy dtype of the ``'numpy'`` array, or ``{column name: dtype}``
+                      of some of its columns. By default, the dtype of each column is
+                      inferred from all its values (numbers or Python objects)
+        :return: :class:`dict` object or :class:`numpy.ndarray`
+        """
+        columns = self._origin_columns()
+        names = [name for name, _ in columns]
+        getters = [get for _, get in columns]
+        rows = self._orig_data
+
+        if kind == 'array':
+            typecodes = typecodes or {}
+            values = [array.array(typecodes[name]) if name in typecodes else [] for name in names]
+        elif kind in ('list', 'numpy'):
+            values = [[] for _ in names]
+        else:
+            raise exc.ModelMapperError("Unknown columns kind {!r}".format(kind))
+
+        appends = [(column.append, get) for column, get in zip(values, getters)]
+        for row in rows:
+            for append, get in appends:
+                append(get(row))
+        if kind != 'numpy':
+            return dict(zip(names, values))
+
+        numpy = _import_numpy()
+        if dtype is None or isinstance(dtype, dict):
+            dtypes = dtype or {}
+            dtype = [(name, dtypes[name] if name in dtypes else _infer_dtype(column))
+                     for name, column in zip(names, values)]
+        ret = numpy.empty(len(rows), dtype=dtype)
+        for index, row in enumerate(zip(*values)):
+            ret[index] = row
+        return ret
+
     def _to_dict_only_origin(self):
-        update_index = self._update_index
-        model = self._orig_data
-        ret = [dict() for _ in range(len(model))]
-        current_index = self._index
+        # Row by row, reading each item directly: the current index and the
+        # children bindings are not changed
+        return self._origin_exporter()(self._orig_data)
 
-        for field_name, field in self._mapper_accessor:
-            for index, _ in enumerate(model):
-                update_index(index)
-                if isinstance(field, ModelMapper):
-                    ret[index][field_name] = field.to_dict(only_origin=True)
-                else:
-                    ret[index][field_name] = self._origin_accessor[field.origin_access]
-        update_index(current_index)
-        return ret
 
+class ListModelMapper(ModelMapper):
+    """Mapper between an origin list and a destination list, item by item.
+    ``mapper`` is relative to the items.
+
+    The destination list grows or shrinks to the length of the origin one
+    (and vice versa), creating the new items with the ``destination_factory``
+    (``origin_factory``, :class:`dict` by default) info::
+
+        ListMapper('d_list', 'val_list', item_mapper, destination_factory=Item)
+
+    The items are copied through the :class:`MappingPlan` of the mapper,
+    with the accesses compiled once for all of them.
+
+    Both lists must exist: a new one wouldn't be bound to any parent model.
+    """
+    __slots__ = ()
+
+    def __init__(self, origin_model, destination_model, mapper, **info):
+        if origin_model is None or destination_model is None:
+            raise exc.ModelMapperError("ListMapper {!r} needs the origin and the destination lists".format(
+                info.get('origin_access')))
+        super(ListModelMapper, self).__init__(origin_model, destination_model, mapper, **info)
+
+    def prepare_mapper(self):
+        # The items are not bound to any child mapper, the plan maps them
+        self._origin_index = {}
+        self._destination_index = {}
+
+    def compile(self):
+        pass
+
+    def _get_plan(self, field_name=None):
+        if field_name is None:
+            return self.plan
+        return MappingPlan({field_name: self._mapper_accessor[field_name]},
+                           list_factories=self.plan.list_factories)
+
+    def origin_to_destination(self, field_name=None):
+        self._get_plan(field_name).origin_to_destination(self._origin_model, self._destination_model,
+                                                         self._write_policy)
+        self._fingerprints.clear()
+
+    def destination_to_origin(self, field_name=None):
+        self._get_plan(field_name).destination_to_origin(self._origin_model, self._destination_model)
+        self._fingerprints.clear()
+
+    def sync_changed(self, stats=None):
+        """Only the new items and the ones changed, or marked with
+        :meth:`mark_dirty`, since the last sync are copied. Each field of
+        each item is counted as synced or skipped
+        """
+        stats = SyncStats() if stats is None else stats
+        plan = self.plan
+        fields_count = len(plan.fields) + len(plan.children)
+        fingerprints = self._fingerprints.setdefault(self, [])
+        dirty = self._dirty_fields
+        if self in dirty:
+            del fingerprints[:]
+        else:
+            for index in dirty:
+                if index < len(fingerprints):
+                    fingerprints[index] = MISSING
+        dirty.clear()
+        copied = plan.sync_changed_items(self._origin_model, self._destination_model, fingerprints, self._write_policy)
+        stats.synced += copied * fields_count
+        stats.skipped += (len(fingerprints) - copied) * fields_count
+        return stats
+
+    def mark_dirty(self, access=None):
+        """Mark the item of ``access`` (e.g. ``'[1].a'``) as changed, or the
+        whole list if ``access`` is ``None`` or not an item
+        """
+        if access is None:
+            self._dirty_fields.add(self)
+            return
+        self._mark_dirty_steps(compile_path(access).steps)
+
+    def _mark_dirty_steps(self, steps):
+        # Dirty items are kept by index, the whole list as the mapper itself
+        if steps and steps[0][0] != '*' and steps[0][1] is not None:
+            self._dirty_fields.add(steps[0][1])
+        else:
+            self._dirty_fields.add(self)
+
+    def to_dict(self, only_origin=False, only_destination=False):
+        to_dict = self.plan.to_dict
+        if only_origin:
+            return to_dict(self._origin_model)
+        elif only_destination:
+            return to_dict(self._destination_model, origin=False)
+        else:
+            return to_dict(self._origin_model), to_dict(self._destination_model, origin=False)
+
+    def _origin_exporter(self):
+        return functools.partial(self.plan.to_dict, strict=True)
+
+    def _iter_bound_items(self, path, only_destination):
+        iter_items = self.plan.iter_items
+        if only_destination:
+            return iter_items(self._destination_model, origin=False, path=path)
+        return itertools.chain(iter_items(self._origin_model, path=path + (0,)),
+                               iter_items(self._destination_model, origin=False, path=path + (1,)))
 
-# TODO: ModelMapper to make relations between origin/destination lists models
-#
-# class ListModelMapper(ModelMapper):
-#
-#     LINK = '[{}].{}'
-#
-#     def __init__(self, origin_model, destination_model, mapper, info=info):
-#         origin_model = origin_model if origin_model is None else list()
-#         super(ListModelMapper, self).__init__(origin_model, destination_model, mapper, info=info)
-#
-#     def _values_updater(self, func_name, accessor_to_set, accessor_to_get, setter_index, getter_index):
-#         link = ListModelMapper.LINK.format
-#
-#         for _, field in self._mapper_accessor:
-#             for index, _ in enumerate(accessor_to_get.model):
-#                 if isinstance(field, ModelMapper):
-#                     orig_to_dest_or_vice_versa = getattr(field, func_name)
-#                     orig_to_dest_or_vice_versa()
-#                 else:
-#                     item_to_set = link(index, field[setter_index])
-#                     item_to_get = link(index, field[getter_index])
-#                     try:
-#                         accessor_to_set[item_to_set] = accessor_to_get[item_to_get]
-#                     except exc.ModelAccessorAttributeError:
-#                         pass
-#
-#     def to_dict(self, only_origin=False, only_destination=False):
-#         if only_origin:
-#             return self._to_dict_only_origin()
-#         elif only_destination:
-#             return self._to_dict_only_destination()
-#         else:
-#             return (self._to_dict_only_origin(), self._to_dict_only_destination())
-#
-#     def _to_dict_only_destination(self):
-#         dest_accessor = self._destination_accessor
-#         model = self._destination_model
-#         ret = [dict() for _ in range(len(model))]
-#         link = ListModelMapper.LINK.format
-#
-#         for field_name, field in self._mapper_accessor:
-#             for index, _ in enumerate(model):
-#                 if isinstance(field, ModelMapper):
-#                     ret[index][field_name] = field.to_dict(only_destination=True)
-#                 else:
-#                     ret[index][field_name] = dest_accessor[link(index, field.destination_access)]
-#         return ret
-#
-#     def _to_dict_only_origin(self):
-#         orig_accessor = self._origin_accessor
-#         model = self._origin_model
-#         ret = [dict() for _ in range(len(model))]
-#         link = ListModelMapper.LINK.format
-#
-#         for field_name, field in self._mapper_accessor:
-#             for index, _ in enumerate(model):
-#                 if isinstance(field, ModelMapper):
-#                     ret[index][field_name] = field.to_dict(only_origin=True)
-#                 else:
-#                     ret[index][field_name] = orig_accessor[link(index, field.origin_access)]
-#         return ret
+    def _origin_walker(self):
+        iter_items = self.plan.iter_items
+        return lambda model, path: iter_items(model, path=path)
@@ -5,6 +5,9 @@ class _UtilsMixin(object):
     __slots__ = ('info',)
 
     def __getattr__(self, item):
+        if item == 'info' or item.startswith('__'):
+            # Not initialized yet (e.g. unpickling) or special method lookups
+            raise AttributeError(item)
         try:
             return self.info[item]
         except KeyError:
@@ -12,6 +15,14 @@ class _UtilsMixin(object):
                                    "{class_name} declaration".format(item=item,
                                                                      class_name=self.__class__.__name__))
 
+    def __getstate__(self):
+        return dict((slot, getattr(self, slot)) for cls in type(self).__mro__
+                    for slot in getattr(cls, '__slots__', ()) if hasattr(self, slot))
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
 
 class Field(_UtilsMixin):
     __slots__ = ('origin_access', 'destination_access')
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+    Entrega asincrona de los eventos de :class:`modelmapper.pubsub.PubSub`
+"""
+
+import logging
+import threading
+import collections
+
+from modelmapper import compat
+
+logger = logging.getLogger(__name__)
+
+BLOCK = 'block'
+DROP_OLDEST = 'drop_oldest'
+COALESCE = 'coalesce'
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, COALESCE)
+
+
+class DispatchStats(object):
+    """Metricas de un dispatcher.
+
+    "enqueued", "delivered", "dropped", "coalesced", "errors": contadores de
+        eventos encolados, entregados, descartados, fusionados y de entregas
+        que lanzaron una excepcion.
+    "depth", "max_depth": profundidad actual y maxima de las colas.
+    "total_latency", "max_latency": segundos desde que se encola un evento
+        hasta que se entrega.
+    """
+    __slots__ = ('enqueued', 'delivered', 'dropped', 'coalesced', 'errors', 'depth', 'max_depth',
+                 'total_latency', 'max_latency')
+
+    def __init__(self):
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.depth = 0
+        self.max_depth = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    @property
+    def mean_latency(self):
+        return self.total_latency / self.delivered if self.delivered else 0.0
+
+    def __repr__(self):
+        return "{}(enqueued={}, delivered={}, dropped={}, coalesced={}, depth={}, mean_latency={:.6f}s)".format(
+            self.__class__.__name__, self.enqueued, self.delivered, self.dropped, self.coalesced, self.depth,
+            self.mean_latency)
+
+
+class _EventQueue(object):
+    """Cola FIFO acotada de eventos, con politica de desbordamiento."""
+
+    def __init__(self, maxsize, overflow, stats, condition):
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._stats = stats
+        self._condition = condition
+        self._events = collections.deque()  # [deliver, topic, data, sender, instante de encolado]
+        self._keys = {}  # {(topic, id(sender)): evento encolado}, para fusionar
+
+    def __len__(self):
+        return len(self._events)
+
+    def put(self, deliver, topic, data, sender, can_block=True):
+        """Encola un evento. Se llama con "condition" tomada.
+
+        :return: numero de eventos anadidos a la cola (0 si se fusiono o
+                 se descarto otro) o None si la cola esta llena y hay que esperar.
+        """
+        stats = self._stats
+        key = (topic, id(sender))
+        added = 1
+        if self._maxsize and len(self._events) >= self._maxsize:
+            if self._overflow == COALESCE and key in self._keys:
+                self._keys[key][2] = data
+                stats.coalesced += 1
+                return 0
+            elif self._overflow == BLOCK and can_block:
+                return None
+            self._pop()
+            stats.dropped += 1
+            stats.depth -= 1
+            added = 0
+
+        event = [deliver, topic, data, sender, compat.perf_counter()]
+        self._events.append(event)
+        self._keys[key] = event
+        stats.enqueued += 1
+        stats.depth += 1
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        return added
+
+    def get(self):
+        """Desencola el evento mas antiguo. Se llama con "condition" tomada."""
+        event = self._pop()
+        self._stats.depth -= 1
+        return event
+
+    def _pop(self):
+        event = self._events.popleft()
+        key = (event[1], id(event[3]))
+        if self._keys.get(key) is event:
+            del self._keys[key]
+        return event
+
+
+class _Dispatcher(object):
+    """Base de los dispatchers: colas acotadas y entrega de eventos."""
+
+    def __init__(self, maxsize=1000, overflow=BLOCK, queues=1):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("Overflow policy must be one of {}".format(OVERFLOW_POLICIES))
+        self.stats = DispatchStats()
+        self._condition = threading.Condition(threading.Lock())
+        self._queues = [_EventQueue(maxsize, overflow, self.stats, self._condition) for _ in range(queues)]
+        self._unfinished = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def put(self, deliver, topic, data, sender):
+        """Encola la entrega "deliver(topic, data, sender)".
+
+        Los eventos de un mismo "topic" van siempre a la misma cola, por lo
+        que se entregan en el orden en el que se publicaron.
+        """
+        queue = self._queues[hash(topic) % len(self._queues)]
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot publish {!r} in a closed dispatcher".format(topic))
+            added = queue.put(deliver, topic, data, sender, can_block=self._can_block())
+            while added is None:
+                self._condition.wait()
+                added = queue.put(deliver, topic, data, sender, can_block=self._can_block())
+            self._unfinished += added
+            self._condition.notify_all()
+        self._wake_up()
+
+    def join(self, timeout=None):
+        """Espera a que se entreguen todos los eventos encolados.
+
+        :return: False si se agota "timeout".
+        """
+        end = None if timeout is None else compat.perf_counter() + timeout
+        with self._condition:
+            while self._unfinished:
+                remaining = None if end is None else end - compat.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, wait=True):
+        """Deja de aceptar eventos. Los ya encolados se siguen entregando.
+
+        "wait": bool. Esperar a que se entreguen (salvo que se llame desde
+            el hilo que los entrega, que no puede esperarse a si mismo).
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait and self._can_block():
+            self.join()
+
+    def _can_block(self):
+        return True
+
+    def _wake_up(self):
+        pass
+
+    def _deliver(self, event):
+        deliver, topic, data, sender, enqueued = event
+        stats = self.stats
+        latency = compat.perf_counter() - enqueued
+        try:
+            deliver(topic, data, sender)
+        except Exception:
+            stats.errors += 1
+            logger.exception("Error delivering %r", topic)
+        finally:
+            with self._condition:
+                stats.delivered += 1
+                stats.total_latency += latency
+                stats.max_latency = max(stats.max_latency, latency)
+                self._unfinished -= 1
+                self._condition.notify_all()
+
+
+class ThreadDispatcher(_Dispatcher):
+    """Entrega los eventos en hilos de trabajo.
+
+    "maxsize": int. Tamano maximo de cada cola (0 sin limite).
+    "overflow": string. Que hacer al publicar con la cola llena:
+        "block": esperar a que haya sitio.
+        "drop_oldest": descartar el evento mas antiguo.
+        "coalesce": fusionar con el evento encolado del mismo "topic" y
+            emisor o, si no hay ninguno, descartar el mas antiguo.
+    "workers": int. Hilos de trabajo, cada uno con su cola. Los "topic" se
+        reparten entre ellos.
+    """
+
+    def __init__(self, maxsize=1000, overflow=BLOCK, workers=1):
+        super(ThreadDispatcher, self).__init__(maxsize=maxsize, overflow=overflow, queues=workers)
+        self._threads = []
+        for queue in self._queues:
+            thread = threading.Thread(target=self._work, args=(queue,), name='modelmapper-dispatcher')
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _can_block(self):
+        # Un suscriptor que publica desde un hilo de trabajo no puede esperarse a si mismo
+        return threading.current_thread() not in self._threads
+
+    def close(self, wait=True):
+        """Deja de aceptar eventos y, cuando se vacian las colas, terminan
+        los hilos de trabajo.
+
+        "wait": bool. Esperar a que terminen los hilos.
+        """
+        super(ThreadDispatcher, self).close(wait=False)
+        if wait and self._can_block():
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self, queue):
+        condition = self._condition
+        while True:
+            with condition:
+                while not len(queue):
+                    if self._closed:
+                        return
+                    condition.wait()
+                event = queue.get()
+                condition.notify_all()
+            self._deliver(event)
+
+
+class AsyncioDispatcher(_Dispatcher):
+    """Entrega los eventos en un bucle de asyncio, que puede estar corriendo
+    en otro hilo.
+
+    "loop": bucle de asyncio.
+    "maxsize", "overflow": como en :class:`ThreadDispatcher`. Desde el hilo
+        del propio bucle no se espera nunca: "block" descarta el evento
+        mas antiguo.
+    """
+
+    def __init__(self, loop, maxsize=1000, overflow=BLOCK):
+        super(AsyncioDispatcher, self).__init__(maxsize=maxsize, overflow=overflow, queues=1)
+        self._loop = loop
+        self._loop_thread = None
+        self._drain_scheduled = False
+
+    def _can_block(self):
+        return threading.current_thread() is not self._loop_thread
+
+    def _wake_up(self):
+        with self._condition:
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self._loop.call_soon_threadsafe(self._drain)
+
+    def _drain(self):
+        self._loop_thread = threading.current_thread()
+        queue = self._queues[0]
+        while True:
+            with self._condition:
+                if not len(queue):
+                    self._drain_scheduled = False
+                    return
+                event = queue.get()
+                self._condition.notify_all()
+            self._deliver(event)
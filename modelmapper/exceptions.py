@@ -11,6 +11,10 @@ class ModelMapperIndexError(ModelMapperError):
     pass
 
 
+class ConverterError(ModelMapperError):
+    pass
+
+
 class FieldError(Exception):
     pass
 
@@ -0,0 +1,413 @@
+"""
+    Model independent mapping plans, built once from a mapper dictionary and
+    applied to as many origin/destination models as needed
+"""
+import collections
+import copy
+import functools
+import itertools
+
+from modelmapper import exceptions as exc, compat
+from modelmapper.accessors import (ModelAccessor, FieldAccessor, MISSING, compile_access,
+                                   compile_path, get_step, get_value, set_step)
+from modelmapper.converters import get_converters
+from modelmapper.declarations import Mapper, UniformMapper, ListMapper, CombinedField
+from modelmapper.policies import differ, fingerprint, get_skip_unchanged
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _fingerprint_values(value):
+    """Fingerprint of the :meth:`MappingPlan.to_dict` data of a model, with
+    every value fingerprinted as the bound mappers do
+    """
+    if isinstance(value, dict):
+        return dict((key, _fingerprint_values(item)) for key, item in compat.iteritems(value))
+    elif isinstance(value, list):
+        return [_fingerprint_values(item) for item in value]
+    return fingerprint(value)
+
+
+def _set_value(model, access, value):
+    if isinstance(access, FieldAccessor):
+        accessor = copy.copy(access)
+        accessor.parent_accessor = ModelAccessor(model)
+        accessor.set_value(value)
+        return
+    elif access.wildcard:
+        ModelAccessor(model)[access] = value
+        return
+    root_obj = model
+    try:
+        for attr, index in access.parent_steps:
+            root_obj = get_step(root_obj, attr, index)
+        attr, index = access.last_step
+        set_step(root_obj, attr, value, index)
+    except Exception:
+        # Let ModelAccessor raise the proper ModelAccessorError
+        ModelAccessor(model)[access] = value
+
+
+def _write_value(model, access, value, policy, skip_unchanged):
+    """Set ``value`` following the compare-before-write ``policy`` and the
+    ``skip_unchanged`` override of the field, like
+    :meth:`modelmapper.core.ModelMapper._write_destination` does
+    """
+    if skip_unchanged is None:
+        skip_unchanged = policy is not None and policy.skip_unchanged
+    if skip_unchanged:
+        current = get_value(model, access)
+        if current is not MISSING and not differ(current, value):
+            if policy is not None:
+                policy.stats.skipped += 1
+            return
+    _set_value(model, access, value)
+    if policy is not None:
+        policy.stats.performed += 1
+
+
+def _get_child_model(model, access):
+    if not access:
+        return model
+    try:
+        value = get_value(model, access)
+    except exc.ModelAccessorError:
+        return None
+    return None if value is MISSING else value
+
+
+class MappingPlan(object):
+    """Immutable mapping between two kinds of models, built once from a mapper
+    dictionary and shareable between threads.
+
+    Unlike :class:`modelmapper.core.ModelMapper`, a plan is not bound to any
+    model, so one plan maps as many records as needed::
+
+        plan = MappingPlan(mapper)
+        for origin in origins:
+            destination = Destination()
+            plan.apply(origin, destination)
+
+    The sync semantics are the ones of :class:`modelmapper.core.ModelMapper`:
+    missing items are skipped, uniform lists are mapped through their first
+    item and lists are mapped item by item.
+    """
+    __slots__ = ('_fields', '_children', '_uniform', '_origin_access', '_destination_access', '_list_factories')
+
+    def __init__(self, mapper, origin_access=None, destination_access=None, uniform=False, list_factories=None):
+        """
+        :param mapper: :class:`dict` object with mapping info. Its values could
+                       be declarations or already prepared :class:`ModelMapper` objects
+        :param origin_access: origin access of this plan in its parent plan
+        :param destination_access: destination access of this plan in its parent plan
+        :param uniform: whether the origin model is a uniform list
+        :param list_factories: tuple(destination item factory, origin item factory)
+                               if both models are lists mapped item by item. The
+                               target list is resized to the length of the
+                               source one, creating the new items with them
+        """
+        fields = []
+        children = []
+        for field_name, declaration in compat.iteritems(mapper):
+            if isinstance(declaration, CombinedField):
+                continue
+            elif MappingPlan._is_child(declaration):
+                children.append((field_name, MappingPlan.from_declaration(declaration)))
+            else:
+                fields.append((field_name,
+                               compile_access(declaration.origin_access),
+                               compile_access(declaration.destination_access),
+                               get_converters(declaration),
+                               get_skip_unchanged(declaration)))
+
+        self._fields = tuple(fields)
+        self._children = tuple(children)
+        self._uniform = uniform
+        self._origin_access = compile_path(origin_access) if origin_access else None
+        self._destination_access = compile_path(destination_access) if destination_access else None
+        self._list_factories = list_factories
+
+    @staticmethod
+    def _is_child(declaration):
+        from modelmapper.core import ModelMapper
+        return isinstance(declaration, (Mapper, UniformMapper, ListMapper, ModelMapper))
+
+    @classmethod
+    def from_declaration(cls, declaration):
+        """Create the plan of a :class:`Mapper` declaration or of an already
+        prepared :class:`ModelMapper`
+
+        :return: :class:`MappingPlan`
+        """
+        from modelmapper.core import UniformListModelMapper, ListModelMapper
+        uniform = isinstance(declaration, (UniformMapper, UniformListModelMapper))
+        list_factories = None
+        if isinstance(declaration, (ListMapper, ListModelMapper)):
+            list_factories = (declaration.info.get('destination_factory'),
+                              declaration.info.get('origin_factory', dict))
+        return cls(declaration.mapper, origin_access=declaration.origin_access,
+                   destination_access=declaration.destination_access, uniform=uniform,
+                   list_factories=list_factories)
+
+    @property
+    def fields(self):
+        return self._fields
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def uniform(self):
+        return self._uniform
+
+    @property
+    def origin_access(self):
+        return self._origin_access
+
+    @property
+    def destination_access(self):
+        return self._destination_access
+
+    @property
+    def list_factories(self):
+        return self._list_factories
+
+    def origin_to_destination(self, origin, destination, policy=None):
+        """Update all the values from ``origin`` model to ``destination`` one
+
+        :param policy: :class:`modelmapper.policies.WritePolicy` of the
+                       destination writes, ``None`` to write always
+        :return: ``destination``
+        """
+        if self._uniform:
+            if not origin:
+                return destination
+            origin = origin[0]
+        elif self._list_factories is not None:
+            self._sync_items(origin, destination, self._list_factories[0],
+                             functools.partial(self._to_destination, policy=policy))
+            return destination
+        self._to_destination(origin, destination, policy)
+        return destination
+
+    apply = origin_to_destination
+
+    def destination_to_origin(self, origin, destination):
+        """Update all the values from ``destination`` model to ``origin`` one
+
+        :return: ``origin``
+        """
+        model = origin
+        if self._uniform:
+            if not origin:
+                return model
+            origin = origin[0]
+        elif self._list_factories is not None:
+            self._sync_items(destination, origin, self._list_factories[1],
+                             lambda destination_item, origin_item: self._to_origin(origin_item, destination_item))
+            return model
+        self._to_origin(origin, destination)
+        return model
+
+    def _to_destination(self, origin, destination, policy=None):
+        for _, child in self._children:
+            child.origin_to_destination(_get_child_model(origin, child._origin_access),
+                                        _get_child_model(destination, child._destination_access), policy)
+
+        for _, orig_access, dest_access, converters, skip_unchanged in self._fields:
+            value = get_value(origin, orig_access)
+            if value is not MISSING:
+                if converters is not None:
+                    value = converters.to_destination(value)
+                if policy is None and not skip_unchanged:
+                    _set_value(destination, dest_access, value)
+                else:
+                    _write_value(destination, dest_access, value, policy, skip_unchanged)
+
+    def _to_origin(self, origin, destination):
+        for _, child in self._children:
+            child.destination_to_origin(_get_child_model(origin, child._origin_access),
+                                        _get_child_model(destination, child._destination_access))
+
+        for _, orig_access, dest_access, converters, _ in self._fields:
+            value = get_value(destination, dest_access)
+            if value is not MISSING:
+                if converters is not None:
+                    value = converters.to_origin(value)
+                _set_value(origin, orig_access, value)
+
+    def sync_changed_items(self, origin, destination, fingerprints, policy=None):
+        """Incremental :meth:`origin_to_destination` of lists mapped item by
+        item: only the new items and the ones whose values changed are copied
+
+        :param fingerprints: list with the fingerprints of the :meth:`to_dict`
+                             values of the origin items in the last sync
+                             (``MISSING`` to copy an item), updated in place
+        :param policy: as in :meth:`origin_to_destination`
+        :return: number of items copied
+        """
+        values = [_fingerprint_values(self._item_to_dict(item, True, False)) for item in (origin or ())]
+        indexes = [index for index, value in enumerate(values)
+                   if index >= len(fingerprints) or differ(fingerprints[index], value)]
+        fingerprints[:] = values
+        if destination is None:
+            return 0
+        self._sync_items(origin, destination, self._list_factories[0],
+                         functools.partial(self._to_destination, policy=policy), indexes=indexes)
+        return len(indexes)
+
+    @staticmethod
+    def _sync_items(source, target, factory, copy_item, indexes=None):
+        """Resize the ``target`` list to the length of the ``source`` one and
+        copy each item (only the ones at ``indexes`` if given) with
+        ``copy_item(source item, target item)``
+        """
+        if source is None or target is None:
+            return
+        missing = len(source) - len(target)
+        if missing < 0:
+            del target[missing:]
+        elif missing > 0:
+            if factory is None:
+                raise exc.ModelMapperError("A factory is needed to add {} items to {!r}".format(missing, target))
+            target.extend(factory() for _ in range(missing))
+        if indexes is not None:
+            for index in indexes:
+                copy_item(source[index], target[index])
+            return
+        for source_item, target_item in compat.izip(source, target):
+            copy_item(source_item, target_item)
+
+    def to_dict(self, model, origin=True, strict=False):
+        """Values of the origin (or destination) ``model`` by field name, like
+        :meth:`modelmapper.core.ModelMapper.to_dict` does with the bound models.
+        Missing values are left out, unless ``strict`` is true: then they raise
+        the proper :class:`ModelAccessorError`.
+
+        :return: :class:`dict` object, or :class:`list` for lists mapped item by item
+        """
+        if self._list_factories is not None or (self._uniform and origin):
+            return [self._item_to_dict(item, origin, strict) for item in (model or ())]
+        return self._item_to_dict(model, origin, strict)
+
+    def iter_items(self, model, origin=True, path=()):
+        """Lazy version of :meth:`to_dict`, yielding tuple(path, value) like
+        :meth:`modelmapper.core.ModelMapper.iter_items` does
+        """
+        if self._list_factories is not None or (self._uniform and origin):
+            if not model:
+                yield path, []
+            for index, item in enumerate(model or ()):
+                for item_value in self._iter_item(item, origin, path + (index,)):
+                    yield item_value
+            return
+        for item_value in self._iter_item(model, origin, path):
+            yield item_value
+
+    def _iter_item(self, model, origin, path):
+        empty = True
+        for field_name, child in self._children:
+            empty = False
+            child_model = _get_child_model(model, child._origin_access if origin else child._destination_access)
+            for item in child.iter_items(child_model, origin=origin, path=path + (field_name,)):
+                yield item
+        access_index = 1 if origin else 2
+        for field in self._fields:
+            value = get_value(model, field[access_index])
+            if value is not MISSING:
+                empty = False
+                yield path + (field[0],), value
+        if empty:
+            yield path, {}
+
+    def _item_to_dict(self, model, origin, strict):
+        ret = {}
+        for field_name, child in self._children:
+            access = child._origin_access if origin else child._destination_access
+            if strict and access:
+                child_model = get_value(model, access, strict=True)
+            else:
+                child_model = _get_child_model(model, access)
+            ret[field_name] = child.to_dict(child_model, origin=origin, strict=strict)
+        access_index = 1 if origin else 2
+        for field in self._fields:
+            if strict:
+                ret[field[0]] = get_value(model, field[access_index], strict=True)
+                continue
+            value = get_value(model, field[access_index])
+            if value is not MISSING:
+                ret[field[0]] = value
+        return ret
+
+    def map_many(self, origins, destination_factory, stats=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Map every origin model to a new destination model, lazily
+
+        :param origins: iterable of origin models
+        :param destination_factory: callable without arguments returning a new
+                                    destination model
+        :param stats: optional :class:`modelmapper.stats.MappingStats` updated after each record
+        :param workers: number of worker processes. If it's given, ``origins``
+                        is split in chunks mapped in a process pool, so the
+                        plan, ``destination_factory``, the origins and the
+                        destinations must be picklable
+        :param chunk_size: number of records sent to a worker process at once
+        :return: generator of populated destination models, in the same order
+                 as ``origins``
+        """
+        if workers is not None:
+            return self._map_many_parallel(origins, destination_factory, stats, workers, chunk_size)
+        return self._map_many(origins, destination_factory, stats)
+
+    def _map_many(self, origins, destination_factory, stats):
+        apply = self.origin_to_destination
+        if stats is None:
+            for origin in origins:
+                yield apply(origin, destination_factory())
+            return
+
+        stats.start()
+        for origin in origins:
+            destination = apply(origin, destination_factory())
+            stats.record()
+            yield destination
+
+    def _map_many_parallel(self, origins, destination_factory, stats, workers, chunk_size):
+        from concurrent.futures import ProcessPoolExecutor
+
+        # The plan is pickled once per worker process, not once per chunk
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self, destination_factory)) as executor:
+            if stats is not None:
+                stats.start()
+            pending = collections.deque()
+            origins = iter(origins)
+            while True:
+                # Bounded number of chunks in flight, so memory doesn't depend on the input size
+                while len(pending) < workers * 2:
+                    chunk = list(itertools.islice(origins, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_map_chunk, chunk))
+                if not pending:
+                    return
+                for destination in pending.popleft().result():
+                    if stats is not None:
+                        stats.record()
+                    yield destination
+
+
+_worker_plan = None
+_worker_destination_factory = None
+
+
+def _init_worker(plan, destination_factory):
+    global _worker_plan, _worker_destination_factory
+    _worker_plan = plan
+    _worker_destination_factory = destination_factory
+
+
+def _map_chunk(chunk):
+    apply = _worker_plan.origin_to_destination
+    factory = _worker_destination_factory
+    return [apply(origin, factory()) for origin in chunk]
@@ -0,0 +1,61 @@
+"""
+    Policies applied when the mappers write values in the models
+"""
+import copy
+
+from modelmapper.accessors import FieldAccessor
+from modelmapper.stats import WriteStats
+
+
+def fingerprint(value):
+    """Value to compare later with :func:`differ`: the value itself, or a
+    shallow copy for lists, dicts and sets, which may be changed in place
+    """
+    if isinstance(value, (list, dict, set)):
+        return copy.copy(value)
+    return value
+
+
+def differ(value, other):
+    """Whether two values are different: identity check first, then equality"""
+    if value is other:
+        return False
+    try:
+        return bool(value != other)
+    except Exception:
+        # Not comparable values
+        return True
+
+
+class WritePolicy(object):
+    """Compare-before-write policy of the destination writes of a
+    :class:`modelmapper.core.ModelMapper` tree.
+
+    When ``skip_unchanged`` is enabled, the current destination value is read
+    before writing and the write is skipped if it's the same one, avoiding
+    redundant widget updates (signals, repaints...). Each field can override it
+    with a ``skip_unchanged`` item in the ``info`` of its :class:`Field`
+    declaration or of its destination :class:`FieldAccessor`, or with the
+    ``SKIP_UNCHANGED`` attribute of the :class:`FieldAccessor` class.
+    """
+    __slots__ = ('skip_unchanged', 'stats')
+
+    def __init__(self, skip_unchanged=True, stats=None):
+        """
+        :param skip_unchanged: default compare-before-write behaviour
+        :param stats: :class:`modelmapper.stats.WriteStats` with the number of
+                      writes skipped and performed
+        """
+        self.skip_unchanged = skip_unchanged
+        self.stats = WriteStats() if stats is None else stats
+
+
+def get_skip_unchanged(field):
+    """Compare-before-write override of a :class:`Field` declaration: ``True``,
+    ``False`` or ``None`` if the write policy of the mapper must be followed
+    """
+    skip = field.info.get('skip_unchanged')
+    dest_access = field.destination_access
+    if skip is None and isinstance(dest_access, FieldAccessor):
+        skip = dest_access.info.get('skip_unchanged', dest_access.SKIP_UNCHANGED)
+    return skip
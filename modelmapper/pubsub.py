@@ -1,60 +1,58 @@
 # -*- coding: utf-8 -*-
 
+import logging
 import weakref
+import functools
 import threading
 import contextlib
 import collections
 
 
-class ReadWriteLock:
-    """A lock object that allows many simultaneous read locks, but only one write lock."""
+logger = logging.getLogger(__name__)
 
-    # Basado en:
-    #   https://github.com/launchdarkly/python-client/blob/master/ldclient/rwlock.py
+_ANY = object()  # Suscripcion sin filtro de emisor
 
-    def __init__(self):
-        self._read_ready = threading.Condition(threading.Lock())
-        self._readers = 0
-
-    def rlock(self):
-        """ Acquire a read lock. Blocks only if a thread has
-        acquired the write lock. """
-        with self._read_ready:
-            self._readers += 1
-
-    def runlock(self):
-        """ Release a read lock. """
-        with self._read_ready:
-            self._readers -= 1
-            if not self._readers:
-                self._read_ready.notifyAll()
-
-    def lock(self):
-        """ Acquire a write lock. Blocks until there are no
-        acquired read or write locks. """
-        self._read_ready.acquire()
-        while self._readers > 0:
-            self._read_ready.wait()
-
-    def unlock(self):
-        """ Release a write lock. """
-        self._read_ready.release()
 
-    @contextlib.contextmanager
-    def read_lock(self):
-        self.rlock()
-        try:
-            yield None
-        finally:
-            self.runlock()
+def _sender_value(sender):
+    """Clave de las suscripciones a emisores sin referencias debiles (str,
+    int, tuple, ...): se comparan por igualdad, no por identidad."""
+    return sender
 
-    @contextlib.contextmanager
-    def write_lock(self):
-        self.lock()
-        try:
-            yield None
-        finally:
-            self.unlock()
+
+def _sender_holder(sender, callback):
+    """Referencia debil al emisor o, si no la admite (list, dict, ...), la
+    propia instancia: mantiene su "id" valido mientras dure la suscripcion."""
+    try:
+        return weakref.ref(sender, callback)
+    except TypeError:
+        return sender
+
+
+def timer_scheduler(delay, function):
+    """Programa "function" pasados "delay" segundos en un hilo aparte. Los
+    suscriptores reciben entonces los eventos en ese hilo."""
+    timer = threading.Timer(delay, function)
+    timer.daemon = True
+    timer.start()
+
+
+class PublishStats(object):
+    """Contadores de las publicaciones de un :class:`PubSub`.
+
+    "published": eventos publicados.
+    "delivered": eventos entregados a los suscriptores.
+    "coalesced": eventos fusionados con otro pendiente del mismo "topic" y emisor.
+    """
+    __slots__ = ('published', 'delivered', 'coalesced')
+
+    def __init__(self):
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+
+    def __repr__(self):
+        return "{}(published={}, delivered={}, coalesced={})".format(
+            self.__class__.__name__, self.published, self.delivered, self.coalesced)
 
 
 class PubSub(object):
@@ -67,12 +65,101 @@ class PubSub(object):
     se queden sin referencias.
     Esto permite no tener cuclos de referencias entre objetos y liberar de la
     labor de "accounting" al codigo cliente e implementar peligrosos "__del__".
+
+    Cada "topic" tiene una instantanea inmutable de sus suscriptores (copy on
+    write), que solo se reconstruye al suscribir, desuscribir o morir una
+    instancia. La publicacion no toma ningun lock ni resuelve atributos, asi
+    que se puede suscribir y desuscribir mientras se recibe un mensaje.
+
+    Las suscripciones se pueden filtrar por emisor ("sender"). Se indexan
+    por ("topic", emisor), asi que publicar solo cuesta lo que cuesten los
+    suscriptores interesados, no todos los del "topic":
+
+        pubsub.subscribe(self.on_name_changed, 'widget_value_changed', sender=name_field)
+        pubsub.subscribe(self.on_name_changed, 'widget_value_changed', sender='name',
+                         key=lambda field: field.name)
+
+    Los eventos se pueden fusionar ("coalescing"): los eventos de un mismo
+    "topic" y emisor ("data") publicados dentro de la ventana
+    "coalesce_window", o dentro de un bloque :meth:`batch`, se entregan una
+    sola vez con el ultimo "data".
     """
-    def __init__(self):
-        self._locker = ReadWriteLock()
-        self._channels = collections.defaultdict(weakref.WeakKeyDictionary)
+    def __init__(self, coalesce_window=None, scheduler=None, dispatcher=None):
+        """
+        "coalesce_window": float. Segundos que se retiene cada evento para
+            fusionarlo con los siguientes. Por defecto None: entrega inmediata.
+
+        "scheduler": callable(delay, function). Programa la entrega diferida.
+            Obligatorio con "coalesce_window". Con Qt, para entregar en el
+            hilo de la interfaz:
+            lambda delay, function: QTimer.singleShot(int(delay * 1000), function)
+            :func:`timer_scheduler` los entrega en otro hilo.
+
+        "dispatcher": :class:`modelmapper.dispatch.ThreadDispatcher` o
+            :class:`modelmapper.dispatch.AsyncioDispatcher`. Si se da, los
+            suscriptores reciben los eventos a traves de su cola, fuera del
+            hilo que publica. Por defecto None: en el hilo que publica.
+        """
+        self._locker = threading.Lock()  # Solo para escrituras
+        # {topic: {ruta: {id(instancia): (weakref de la instancia, funcion, emisor)}}}
+        # ruta: None sin filtro, (key, valor de "key" del emisor) con filtro
+        self._subscribers = {}
+        # {topic: (tuple((weakref, funcion),), tuple((key, {valor: tuple((weakref, funcion),)}),))}
+        self._snapshots = {}
+        self._dead = collections.deque()  # (topic, ruta, id, weakref) de instancias o emisores muertos
+
+        self._check_window(coalesce_window, scheduler)
+        self._coalesce_window = coalesce_window
+        self._scheduler = scheduler
+        self._pending = collections.OrderedDict()  # {(topic, id(sender)): (topic, data, sender)}
+        self._pending_lock = threading.Lock()
+        self._batch_depth = 0
+        self._dispatcher = dispatcher
+        self.stats = PublishStats()
+
+    @property
+    def coalesce_window(self):
+        return self._coalesce_window
 
-    def subscribe(self, method, topic):
+    @coalesce_window.setter
+    def coalesce_window(self, value):
+        self._check_window(value, self._scheduler)
+        self._coalesce_window = value
+
+    @staticmethod
+    def _check_window(coalesce_window, scheduler):
+        # Sin temporizador el ultimo evento de una rafaga no se entregaria nunca
+        if coalesce_window and scheduler is None:
+            raise ValueError("A scheduler is needed to deliver the events after the coalesce window")
+
+    @property
+    def dispatcher(self):
+        return self._dispatcher
+
+    @dispatcher.setter
+    def dispatcher(self, value):
+        self._dispatcher = value
+
+    @property
+    def scheduler(self):
+        return self._scheduler
+
+    def configure(self, coalesce_window=_ANY, scheduler=_ANY, dispatcher=_ANY):
+        """Cambia las opciones de :meth:`__init__` que se den. Los eventos
+        pendientes se entregan antes con :meth:`flush`.
+
+        pubsub.configure(coalesce_window=0.05, scheduler=qt_scheduler, dispatcher=ThreadDispatcher())
+        """
+        coalesce_window = self._coalesce_window if coalesce_window is _ANY else coalesce_window
+        scheduler = self._scheduler if scheduler is _ANY else scheduler
+        self._check_window(coalesce_window, scheduler)
+        self.flush()
+        self._coalesce_window = coalesce_window
+        self._scheduler = scheduler
+        if dispatcher is not _ANY:
+            self._dispatcher = dispatcher
+
+    def subscribe(self, method, topic, sender=_ANY, key=None):
         """Suscripcion a un 'topic'.
 
         "method": metodo de una instancia.
@@ -80,22 +167,102 @@ class PubSub(object):
             i.e.: No puede ser "lambda", "staticmethod", ni "classmethod".
 
         "topic": string. "topic" a suscribirse.
+
+        "sender": object. Opcional. Solo se reciben los eventos de este
+            emisor. Sin "key", se compara por identidad y la suscripcion
+            desaparece cuando muere el emisor. Los emisores que no admiten
+            referencias debiles y son "hashables" (str, int, tuple, ...) se
+            comparan por igualdad.
+
+        "key": callable(emisor). Opcional. Con "sender", se reciben los
+            eventos cuyo emisor cumpla key(emisor) == sender. Tiene que
+            aceptar cualquier emisor del "topic" y devolver un valor "hashable".
+            Si falla, se registra el error y el evento no llega a esta
+            suscripcion, pero si a las demas.
         """
-        with self._locker.write_lock():
-            self._channels[topic][method.__self__] = method.__name__
+        obj = method.__self__
+        obj_id = id(obj)
+        with self._locker:
+            route = self._route(sender, key)
+            callback = functools.partial(self._on_dead, topic, route, obj_id)
+            holder = _sender_holder(sender, callback) if route is not None and route[0] is id else None
+            self._subscribers.setdefault(topic, {}).setdefault(route, {})[obj_id] = (
+                weakref.ref(obj, callback), method.__func__, holder)
+            self._update_snapshot(topic)
+            self._purge()
 
-    def unsubscribe(self, method, topic):
+    def unsubscribe(self, method, topic, sender=_ANY, key=None):
         """Suscripcion a un 'topic'.
 
         "method": metodo de una instancia previamente suscrita.
 
         "topic": string. "topic".
+
+        "sender", "key": los mismos que en la suscripcion.
         """
-        with self._locker.write_lock():
-            if topic in self._channels:
-                del self._channels[topic][method.__self__]
+        with self._locker:
+            routes = self._subscribers.get(topic)
+            if routes is not None:
+                route = self._route(sender, key)
+                del routes[route][id(method.__self__)]
+                self._update_snapshot(topic)
+            self._purge()
+
+    @staticmethod
+    def _route(sender, key):
+        if sender is _ANY:
+            return None
+        if key is not None:
+            return (key, sender)
+        try:
+            weakref.ref(sender)
+        except TypeError:
+            try:
+                hash(sender)
+            except TypeError:
+                return (id, id(sender))
+            return (_sender_value, sender)
+        return (id, id(sender))
+
+    def _update_snapshot(self, topic):
+        routes = self._subscribers.get(topic)
+        for route in [route for route, subscribers in routes.items() if not subscribers] if routes else ():
+            del routes[route]
+        if not routes:
+            self._subscribers.pop(topic, None)
+            self._snapshots.pop(topic, None)
+            return
+
+        broadcast = tuple(entry[:2] for entry in routes.get(None, {}).values())
+        indexes = collections.OrderedDict()
+        for route, subscribers in routes.items():
+            if route is not None:
+                key, value = route
+                indexes.setdefault(key, {})[value] = tuple(entry[:2] for entry in subscribers.values())
+        self._snapshots[topic] = (broadcast, tuple(indexes.items()))
 
-    def publish(self, topic, data=None):
+    def _on_dead(self, topic, route, obj_id, ref):
+        # Callback de weakref: puede llegar en cualquier momento, incluso con
+        # el lock tomado por este mismo hilo. En ese caso se purga al soltarlo.
+        self._dead.append((topic, route, obj_id, ref))
+        if self._locker.acquire(False):
+            try:
+                self._purge()
+            finally:
+                self._locker.release()
+
+    def _purge(self):
+        dead = self._dead
+        while dead:
+            topic, route, obj_id, ref = dead.popleft()
+            subscribers = self._subscribers.get(topic, {}).get(route)
+            entry = subscribers.get(obj_id) if subscribers is not None else None
+            # Se comprueba la referencia: el "id" puede ser ya de otra instancia
+            if entry is not None and (entry[0] is ref or entry[2] is ref):
+                del subscribers[obj_id]
+                self._update_snapshot(topic)
+
+    def publish(self, topic, data=None, sender=_ANY):
         """Publicacion de un "topic".
 
         "topic": string. Nombre del "topic".
@@ -103,19 +270,102 @@ class PubSub(object):
         "data": object. Por defecto None.
             Argumentos a pasar a cada metodo de cada instancia subscrita a "topic".
 
+        "sender": object. Emisor del evento, para las suscripciones filtradas
+            y la fusion de eventos. Por defecto el propio "data".
+
         El orden de invocacion de los suscriptores es arbitrario y no se debe
         depender del mismo.
 
-        Durante la recepcion del mensaje no se puede realizar invocar a
-        "subscribe" ni "unsubscribe". Si se hace, se producira un deadlock.
+        Los cambios de suscripcion durante la recepcion del mensaje se
+        aplican a partir de la siguiente publicacion.
+        """
+        if sender is _ANY:
+            sender = data
+        if not self._coalesce_window and not self._batch_depth:
+            self.stats.published += 1
+            self._deliver(topic, data, sender)
+            return
+
+        key = (topic, id(sender))  # "sender" se retiene, su id no se puede reutilizar mientras
+        with self._pending_lock:
+            self.stats.published += 1
+            if key in self._pending:
+                self._pending[key] = (topic, data, sender)
+                self.stats.coalesced += 1
+                return
+            self._pending[key] = (topic, data, sender)
+            scheduled = not self._batch_depth
+        if scheduled:
+            self._scheduler(self._coalesce_window, functools.partial(self._flush_key, key))
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Bloque en el que se fusionan todas las publicaciones. Al salir del
+        bloque mas externo se entregan los eventos pendientes, en el orden
+        de su primera publicacion.
+
+        with pubsub.batch():
+            ...
         """
-        with self._locker.read_lock():
-            slot = self._channels[topic]
-            for obj in slot:
-                getattr(obj, slot[obj])(topic, data)
+        with self._pending_lock:
+            self._batch_depth += 1
+        try:
+            yield None
+        finally:
+            with self._pending_lock:
+                self._batch_depth -= 1
+                outermost = not self._batch_depth
+            if outermost:
+                self.flush()
+
+    def flush(self):
+        """Entrega ya todos los eventos pendientes de fusion."""
+        with self._pending_lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for event in pending:
+            self._deliver(*event)
+
+    def _flush_key(self, key):
+        with self._pending_lock:
+            if self._batch_depth:
+                # Se entregara al salir del bloque "batch"
+                return
+            event = self._pending.pop(key, None)
+        if event is not None:
+            self._deliver(*event)
+
+    def _deliver(self, topic, data, sender):
+        if self._dispatcher is not None:
+            self._dispatcher.put(self._dispatch, topic, data, sender)
+        else:
+            self._dispatch(topic, data, sender)
+
+    def _dispatch(self, topic, data, sender):
+        self.stats.delivered += 1
+        snapshot = self._snapshots.get(topic)
+        if snapshot is None:
+            return
+        broadcast, indexes = snapshot
+        for ref, function in broadcast:
+            obj = ref()
+            if obj is not None:
+                function(obj, topic, data)
+        for key, index in indexes:
+            try:
+                subscribers = index.get(key(sender), ())
+            except Exception:
+                # Emisor sin clave: no es de ninguna de estas suscripciones
+                if key is not _sender_value:
+                    logger.exception("Error getting the key of %r publishing %r", sender, topic)
+                continue
+            for ref, function in subscribers:
+                obj = ref()
+                if obj is not None:
+                    function(obj, topic, data)
 
     # def dumper(self):
-    #     foo = self._channels
+    #     foo = self._subscribers
     #     for item in foo:
     #         print(item, foo[item], len(foo[item]))
 
@@ -125,3 +375,6 @@ __manager = PubSub()
 subscribe = __manager.subscribe
 unsubscribe = __manager.unsubscribe
 publish = __manager.publish
+batch = __manager.batch
+flush = __manager.flush
+configure = __manager.configure
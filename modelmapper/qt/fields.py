@@ -1,25 +1,91 @@
 from __future__ import unicode_literals
 
+import functools
 import numbers
 from datetime import datetime
 
 from modelmapper import compat
 from modelmapper.accessors import FieldAccessor
+from modelmapper.converters import Converter
 from modelmapper import pubsub
 
+# {date format: memoized parser of the dates in that format}
+_date_parsers = {}
+
+
+def _strptime(date_format, value):
+    return datetime.strptime(value, date_format)
+
+
+def date_parser(date_format):
+    """:class:`modelmapper.converters.Converter` parsing the dates in
+    ``date_format``, shared by all the accessors using that format
+    """
+    try:
+        return _date_parsers[date_format]
+    except KeyError:
+        parser = _date_parsers[date_format] = Converter(functools.partial(_strptime, date_format))
+        return parser
+
 
 class QWidgetAccessor(FieldAccessor):
-    __slots__ = ()
+    """Accessor of a Qt widget.
+
+    The widget is resolved once per bind: it's cached until the model of the
+    parent accessor changes (see :meth:`clear_widget_cache`). The user
+    property of the widgets (``metaObject().userProperty()``) is cached by
+    widget class.
+    """
+    __slots__ = ('_widget', '_widget_model')
+
+    # {widget class: QMetaProperty of its user property}
+    _user_properties = {}
+
+    def __init__(self, access, parent_accessor=None, **info):
+        self._widget = None
+        self._widget_model = None  # Model of the parent accessor "_widget" was resolved from
+        super(QWidgetAccessor, self).__init__(access, parent_accessor=parent_accessor, **info)
+
+    def __getstate__(self):
+        state = super(QWidgetAccessor, self).__getstate__()
+        state.update(_widget=None, _widget_model=None)
+        return state
 
     @property
     def widget(self):
-        return self.field
+        parent_accessor = self._parent_accessor
+        if parent_accessor is None:
+            return self.field  # raise the proper FieldAccessorError
+        model = parent_accessor.model
+        if self._widget is None or self._widget_model is not model:
+            self._widget = self.field
+            self._widget_model = model
+        return self._widget
+
+    def clear_widget_cache(self):
+        """Forget the cached widget, e.g., when it's replaced in the same model"""
+        self._widget = None
+        self._widget_model = None
+
+    @classmethod
+    def _user_property(cls, widget):
+        widget_cls = type(widget)
+        try:
+            return cls._user_properties[widget_cls]
+        except KeyError:
+            prop = cls._user_properties[widget_cls] = widget.metaObject().userProperty()
+            return prop
 
     def get_value(self):
-        return self.widget.metaObject().userProperty().read(self.widget)
+        widget = self.widget
+        return self._user_property(widget).read(widget)
 
     def set_value(self, value):
-        self.widget.metaObject().userProperty().write(self.widget, value)
+        widget = self.widget
+        self._user_property(widget).write(widget, value)
+
+    def block_signals(self, blocked):
+        return self.widget.blockSignals(blocked)
 
     def connect_signals(self):
         if self.value_changed:
@@ -61,13 +127,99 @@ class QLineEditAccessor(QWidgetAccessor):
 
 
 class MemoryListAccessor(QWidgetAccessor):
-    __slots__ = ()
+    """Accessor of a view over an in-memory list model (``get_objects()`` and
+    ``set_source()``).
+
+    In diff mode (``diff_rows=True`` info or ``DIFF_ROWS`` class attribute)
+    :meth:`set_value` only inserts, removes and updates the rows that differ,
+    so the view isn't reset, when the model has the row operations
+    ``insert_object(row, obj)``, ``remove_object(row)`` and ``set_object(row, obj)``.
+
+    The values are cached while the model doesn't notify any change
+    (``dataChanged``, ``rowsInserted``, ...). Without those signals they're
+    read from the model every time.
+    """
+    __slots__ = ('_rows', '_rows_model', '_rows_signals')
+
+    DIFF_ROWS = False
+    MODEL_CHANGED_SIGNALS = ('dataChanged', 'rowsInserted', 'rowsRemoved', 'rowsMoved', 'modelReset',
+                             'layoutChanged')
+    ROW_OPERATIONS = ('insert_object', 'remove_object', 'set_object')
+
+    def __init__(self, access, parent_accessor=None, **info):
+        self._rows = None  # Cached values of the rows of "_rows_model"
+        self._rows_model = None  # Model whose changes invalidate the cache
+        self._rows_signals = ()  # Signals of "_rows_model" connected to "_invalidate_rows"
+        super(MemoryListAccessor, self).__init__(access, parent_accessor=parent_accessor, **info)
+
+    def __getstate__(self):
+        # The cache is only invalidated for the model connected by this instance
+        state = super(MemoryListAccessor, self).__getstate__()
+        state.update(_rows=None, _rows_model=None, _rows_signals=())
+        return state
 
     def get_value(self):
-        return [row[1] for row in self.widget.model().get_objects()]
+        return list(self._get_rows(self.widget.model()))
 
     def set_value(self, value):
-        self.widget.model().set_source(value)
+        model = self.widget.model()
+        rows = list(value) if value else []
+        if self.info.get('diff_rows', self.DIFF_ROWS) and all(hasattr(model, op) for op in self.ROW_OPERATIONS):
+            self._apply_diff(model, self._get_rows(model), rows)
+        else:
+            model.set_source(value)
+        # The model may have changed the rows (sorting, filtering...), the next read repopulates the cache
+        self._rows = None
+
+    def _get_rows(self, model):
+        if self._rows_model is not model:
+            self._rows = None
+            self._connect_model(model)
+            self._rows_model = model if self._rows_signals else None
+        if self._rows is None:
+            rows = [row[1] for row in model.get_objects()]
+            if self._rows_model is None:
+                return rows
+            self._rows = rows
+        return self._rows
+
+    def _connect_model(self, model):
+        """Invalidate the cache on the changes of ``model`` instead of the
+        ones of the previous model
+        """
+        for signal in self._rows_signals:
+            signal.disconnect(self._invalidate_rows)
+        self._rows_signals = tuple(getattr(model, name) for name in self.MODEL_CHANGED_SIGNALS
+                                   if hasattr(model, name))
+        for signal in self._rows_signals:
+            signal.connect(self._invalidate_rows)
+
+    def _invalidate_rows(self, *args):
+        self._rows = None
+
+    @staticmethod
+    def _apply_diff(model, old, new):
+        """Turn the rows ``old`` of ``model`` into ``new`` with the minimum row
+        operations for the usual edits: the common head and tail are kept, the
+        rows of the middle are updated in place and the rest are inserted or removed
+        """
+        old_size, new_size = len(old), len(new)
+        start = 0
+        while start < old_size and start < new_size and old[start] == new[start]:
+            start += 1
+        old_end, new_end = old_size, new_size
+        while old_end > start and new_end > start and old[old_end - 1] == new[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+
+        common = min(old_end, new_end)
+        for row in range(start, common):
+            if old[row] != new[row]:
+                model.set_object(row, new[row])
+        for row in range(old_end - 1, common - 1, -1):
+            model.remove_object(row)
+        for row in range(common, new_end):
+            model.insert_object(row, new[row])
 
 
 class String(QLineEditAccessor):
@@ -105,13 +257,13 @@ class LineDate(QLineEditAccessor):
 
     def set_value(self, value):
         if value and isinstance(value, compat.basestring):
-            super(LineDate, self).set_value(datetime.strptime(value, self.from_format))
+            super(LineDate, self).set_value(date_parser(self.from_format)(value))
         else:
             super(LineDate, self).set_value(value)
 
     def get_value(self):
         value = super(LineDate, self).get_value()
-        return datetime.strptime(value, '%d-%m-%Y') if value and value != 'dd-mm-aaaa' else None
+        return date_parser('%d-%m-%Y')(value) if value and value != 'dd-mm-aaaa' else None
 
 
 class CheckBoxList(QWidgetAccessor):
@@ -125,12 +277,21 @@ class CheckBoxList(QWidgetAccessor):
         return [item.text() for _, item in self.widget.checkedItems()]
 
     def set_value(self, value):
-        items = (self.widget.itemText(i) for i in range(self.widget.count()))
-        for i in items:
-            index = self.widget.findText(i)
-            flagCheck = self.QT_CHECKED if i in value else self.QT_UNCHECKED
-            self.widget.model().item(index, self.widget.modelColumn()).setCheckState(flagCheck)
-        self.widget.repaint()
+        widget = self.widget
+        model = widget.model()
+        column = widget.modelColumn()
+        checked = set(value or ())
+        # Only the items whose state changes are touched, and the widget is painted once at the end
+        widget.setUpdatesEnabled(False)
+        try:
+            for row in range(model.rowCount()):
+                item = model.item(row, column)
+                state = self.QT_CHECKED if item.text() in checked else self.QT_UNCHECKED
+                if item.checkState() != state:
+                    item.setCheckState(state)
+        finally:
+            widget.setUpdatesEnabled(True)
+        widget.update()
 
 
 class SpinBox(QWidgetAccessor):
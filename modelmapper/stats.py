@@ -0,0 +1,53 @@
+"""
+    Counters reported by the batch and incremental syncs
+"""
+from modelmapper import compat
+
+
+class MappingStats(object):
+    """Throughput counters of a batch mapping"""
+    __slots__ = ('records', 'elapsed', '_started')
+
+    def __init__(self):
+        self.records = 0
+        self.elapsed = 0.0  # seconds
+        self._started = None
+
+    def start(self):
+        self._started = compat.perf_counter()
+
+    def record(self):
+        self.records += 1
+        self.elapsed = compat.perf_counter() - self._started
+
+    @property
+    def records_per_second(self):
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self):
+        return "{}(records={}, elapsed={:.3f}s, records_per_second={:.1f})".format(
+            self.__class__.__name__, self.records, self.elapsed, self.records_per_second)
+
+
+class SyncStats(object):
+    """Counters of an incremental sync"""
+    __slots__ = ('synced', 'skipped')
+
+    def __init__(self):
+        self.synced = 0
+        self.skipped = 0
+
+    def __repr__(self):
+        return "{}(synced={}, skipped={})".format(self.__class__.__name__, self.synced, self.skipped)
+
+
+class WriteStats(object):
+    """Counters of the destination writes done following a write policy"""
+    __slots__ = ('performed', 'skipped')
+
+    def __init__(self):
+        self.performed = 0
+        self.skipped = 0
+
+    def __repr__(self):
+        return "{}(performed={}, skipped={})".format(self.__class__.__name__, self.performed, self.skipped)
@@ -0,0 +1,67 @@
+"""
+    Incremental serialization of the ``(path, value)`` items yielded by
+    :meth:`modelmapper.core.ModelMapper.iter_items`
+"""
+import json
+
+from modelmapper import compat
+
+
+def write_json(items, fp, encoder=None):
+    """Write the JSON document described by ``items`` to the file object ``fp``.
+
+    ``items`` are tuple(path, value) in document order: each key of ``path``
+    is a dict key (strings) or a list index (integers), and the containers are
+    opened and closed as the paths change, so only the current path is kept
+    in memory.
+
+    :param encoder: :class:`json.JSONEncoder` object for the values
+    :return: None
+    """
+    encode = (encoder or json.JSONEncoder()).encode
+    write = fp.write
+    containers = []  # [closing character, whether it has some value already]
+    keys = []  # keys of the open containers, len(keys) == len(containers) - 1
+
+    def write_key(key):
+        container = containers[-1]
+        if container[1]:
+            write(', ')
+        container[1] = True
+        if container[0] == '}':
+            write(encode(compat.unicode(key)) + ': ')
+
+    def open_container(key):
+        if isinstance(key, compat.basestring):
+            write('{')
+            containers.append(['}', False])
+        else:
+            write('[')
+            containers.append([']', False])
+
+    for path, value in items:
+        if not path:
+            # The whole document is a single value
+            write(encode(value))
+            return
+        if not containers:
+            open_container(path[0])
+
+        common = 0
+        while common < len(keys) and common < len(path) - 1 and keys[common] == path[common]:
+            common += 1
+        while len(keys) > common:
+            write(containers.pop()[0])
+            keys.pop()
+
+        for depth in range(common, len(path) - 1):
+            write_key(path[depth])
+            open_container(path[depth + 1])
+            keys.append(path[depth])
+        write_key(path[-1])
+        write(encode(value))
+
+    if not containers:
+        write('{}')
+    while containers:
+        write(containers.pop()[0])
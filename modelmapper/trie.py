@@ -0,0 +1,141 @@
+"""
+    Prefix sharing of access paths, so sibling fields don't walk their common
+    parents again
+"""
+import collections
+
+from modelmapper import exceptions as exc
+from modelmapper.accessors import AccessPath, FieldAccessor, MISSING, compile_path, get_steps, set_step
+
+
+class _TrieNode(object):
+    __slots__ = ('children', 'items')
+
+    def __init__(self):
+        self.children = collections.OrderedDict()  # step -> _TrieNode
+        self.items = []
+
+
+class AccessTrie(object):
+    """Trie of access paths. Iterating it yields the stored items grouped by
+    their common prefixes (depth-first, parents before their children), which
+    is the order where a :class:`PrefixResolver` resolves each shared
+    container only once.
+
+    :class:`FieldAccessor` and wildcard accesses can't be split in steps, they
+    are yielded after the rest.
+    """
+    __slots__ = ('_root', '_opaque')
+
+    def __init__(self, items=()):
+        """
+        :param items: iterable of tuple(access, item)
+        """
+        self._root = _TrieNode()
+        self._opaque = []
+        for access, item in items:
+            self.add(access, item)
+
+    def add(self, access, item):
+        if isinstance(access, FieldAccessor) or compile_path(access).wildcard:
+            self._opaque.append(item)
+            return
+        node = self._root
+        for step in compile_path(access).steps:
+            child = node.children.get(step)
+            if child is None:
+                child = node.children[step] = _TrieNode()
+            node = child
+        node.items.append(item)
+
+    def __iter__(self):
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for item in node.items:
+                yield item
+            stack.extend(reversed(node.children.values()))
+        for item in self._opaque:
+            yield item
+
+
+class PrefixResolver(object):
+    """Resolve access paths against the model of a :class:`ModelAccessor`,
+    remembering the containers resolved for the last path so the next one
+    only walks the steps that are not shared.
+
+    Use one resolver per sync pass: it assumes the model is only changed
+    through :meth:`set`.
+    """
+    __slots__ = ('_accessor', '_steps', '_values')
+
+    def __init__(self, model_accessor):
+        self._accessor = model_accessor
+        self._steps = []
+        self._values = [model_accessor.model]  # _values[i] is the value after _steps[:i]
+
+    def _resolve(self, steps):
+        resolved_steps = self._steps
+        values = self._values
+        depth = 0
+        limit = min(len(resolved_steps), len(steps))
+        while depth < limit and resolved_steps[depth] == steps[depth]:
+            depth += 1
+        del resolved_steps[depth:]
+        del values[depth + 1:]
+
+        value = values[depth]
+        for step in steps[depth:]:
+            if value is MISSING:
+                break
+            value = get_steps(value, (step,))
+            resolved_steps.append(step)
+            values.append(value)
+        return value
+
+    def get(self, access):
+        """
+        :return: the value of ``access`` or ``MISSING`` if some attribute, key
+                 or index is missing
+        :raise ModelAccessorError: for any other error
+        """
+        accessor = self._accessor
+        path = access if isinstance(access, AccessPath) else None
+        if path is None:
+            if isinstance(access, FieldAccessor) or compile_path(access).wildcard:
+                return accessor.lookup(access)
+            path = compile_path(access)
+        elif path.wildcard:
+            return accessor.lookup(access)
+        try:
+            # Only the containers are reused, the item itself is always read
+            # again: a previous write may have changed it
+            parent = self._resolve(path.parent_steps)
+        except exc.ModelAccessorError:
+            del self._steps[:]
+            del self._values[1:]
+            raise
+        return parent if parent is MISSING else get_steps(parent, (path.last_step,))
+
+    def set(self, access, value):
+        """
+        :raise ModelAccessorError: if ``access`` can't be set
+        """
+        accessor = self._accessor
+        path = access if isinstance(access, AccessPath) else None
+        if path is None and not isinstance(access, FieldAccessor):
+            path = compile_path(access)
+        if path is None or path.wildcard:
+            accessor[access] = value
+            return
+        parent_steps = path.parent_steps
+        try:
+            root_obj = self._resolve(parent_steps)
+            if root_obj is MISSING:
+                raise AttributeError(path.access)
+            attr, index = path.last_step
+            set_step(root_obj, attr, value, index)
+        except Exception:
+            del self._steps[:]
+            del self._values[1:]
+            accessor[access] = value  # raise the proper ModelAccessorError
@@ -16,5 +16,6 @@ setup(
     author='Francisco Ramirez de Anton',
     long_description=read('README.md'),
     description='Gestor de conexiones entre estructuras de datos',
-    packages=find_packages(exclude=['tests', 'tests.*'])
+    packages=find_packages(exclude=['tests', 'tests.*', 'benchmarks', 'benchmarks.*']),
+    extras_require={'numpy': ['numpy']}
 )
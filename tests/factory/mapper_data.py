@@ -1,5 +1,6 @@
 from modelmapper.accessors import FieldAccessor
-from modelmapper.declarations import Field, Mapper, UniformMapper
+from modelmapper.declarations import Field, Mapper, UniformMapper, ListMapper
+from tests.factory.destination_data import A
 
 
 class ComplexAccessor(FieldAccessor):
@@ -35,6 +36,14 @@ def get_d_mapper():
     }
 
 
+def get_list_mapper():
+    return {
+        'a_link': Field('a', 'val_a'),
+        'aa_link': Field('aa', 'val_aa'),
+        'aaa_link': Field('aaa', 'val_aaa'),
+    }
+
+
 def get_model_mapper():
     return {
         'd_link': UniformMapper('d', 'val_d', get_d_mapper()),
@@ -42,4 +51,5 @@ def get_model_mapper():
         'ddd_link': Field('ddd.a', 'val_ddd.val_a'),
         'dddd_link': Field('dddd', 'val_dddd'),
         'complex_link': Field('complex', ComplexAccessor('val_complex')),
+        'list_link': ListMapper('d_list', 'val_list', get_list_mapper(), destination_factory=A),
     }
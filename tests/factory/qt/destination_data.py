@@ -1,15 +1,182 @@
 
+class Signal(object):
+
+    def __init__(self, sender):
+        self._sender = sender
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def disconnect(self, slot):
+        self._slots.remove(slot)
+
+    def emit(self, *args):
+        if self._sender.signalsBlocked():
+            return
+        for slot in self._slots:
+            slot(*args)
+
+
 class QLineEdit(object):
 
     def __init__(self):
         self._text = None
+        self._signals_blocked = False
+        self.textChanged = Signal(self)
+        self.textEdited = Signal(self)
+
+    def blockSignals(self, blocked):
+        previous, self._signals_blocked = self._signals_blocked, blocked
+        return previous
+
+    def signalsBlocked(self):
+        return self._signals_blocked
 
     def setText(self, value):
         self._text = value
+        self.textChanged.emit(value)
+
+    def text(self):
+        return self._text
+
+
+class QStandardItem(object):
+
+    def __init__(self, text):
+        self._text = text
+        self._check_state = 0
+        self.check_state_writes = 0
 
     def text(self):
         return self._text
 
+    def checkState(self):
+        return self._check_state
+
+    def setCheckState(self, state):
+        self._check_state = state
+        self.check_state_writes += 1
+
+
+class QStandardItemModel(object):
+
+    def __init__(self, texts):
+        self._items = [QStandardItem(text) for text in texts]
+
+    def rowCount(self):
+        return len(self._items)
+
+    def item(self, row, column=0):
+        return self._items[row]
+
+
+class CheckableComboBox(object):
+
+    def __init__(self, texts):
+        self._model = QStandardItemModel(texts)
+        self.updates_enabled = True
+        self.updates = 0
+
+    def model(self):
+        return self._model
+
+    def modelColumn(self):
+        return 0
+
+    def setUpdatesEnabled(self, enabled):
+        self.updates_enabled = enabled
+
+    def update(self):
+        self.updates += 1
+
+    def checkedItems(self):
+        return [(row, item) for row, item in enumerate(self._model._items) if item.checkState() == 2]
+
+
+class MemoryListModel(object):
+
+    def __init__(self, source=None):
+        self._source = list(source or [])
+        self.modelReset = Signal(self)
+        self.rowsInserted = Signal(self)
+        self.rowsRemoved = Signal(self)
+        self.dataChanged = Signal(self)
+        self.operations = []
+        self.get_objects_calls = 0
+
+    def signalsBlocked(self):
+        return False
+
+    def get_objects(self):
+        self.get_objects_calls += 1
+        return list(enumerate(self._source))
+
+    def set_source(self, source):
+        self._source = list(source or [])
+        self.operations.append(('set_source',))
+        self.modelReset.emit()
+
+    def insert_object(self, row, obj):
+        self._source.insert(row, obj)
+        self.operations.append(('insert', row))
+        self.rowsInserted.emit(None, row, row)
+
+    def remove_object(self, row):
+        del self._source[row]
+        self.operations.append(('remove', row))
+        self.rowsRemoved.emit(None, row, row)
+
+    def set_object(self, row, obj):
+        self._source[row] = obj
+        self.operations.append(('set', row))
+        self.dataChanged.emit(row, row)
+
+
+class QListView(object):
+
+    def __init__(self, model):
+        self._model = model
+
+    def model(self):
+        return self._model
+
+
+class QMetaProperty(object):
+
+    def __init__(self, name):
+        self._name = name
+
+    def read(self, widget):
+        return getattr(widget, self._name)
+
+    def write(self, widget, value):
+        setattr(widget, self._name, value)
+        return True
+
+
+class QMetaObject(object):
+
+    def __init__(self, user_property):
+        self._user_property = user_property
+        self.user_property_calls = 0
+
+    def userProperty(self):
+        self.user_property_calls += 1
+        return self._user_property
+
+
+class QWidget(object):
+    """Widget with a "value" user property"""
+
+    meta_object = QMetaObject(QMetaProperty('value'))
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def metaObject(self):
+        return self.meta_object
+
 
 class UI(object):
 
@@ -10,6 +10,10 @@ class String(QLineEditAccessor):
     def set_value(self, value):
         self.widget.setText(str(value))
 
+    @property
+    def value_changed(self):
+        return self.widget.textChanged
+
 
 class Integer(QLineEditAccessor):
 
@@ -19,6 +23,10 @@ class Integer(QLineEditAccessor):
     def set_value(self, value):
         self.widget.setText(int(value))
 
+    @property
+    def value_changed(self):
+        return self.widget.textChanged
+
 
 def get_child_x_mapper(x):
     return {
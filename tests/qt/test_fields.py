@@ -0,0 +1,167 @@
+import copy
+import unittest
+from datetime import datetime
+
+from nose_parameterized import parameterized
+
+from modelmapper import compat
+from modelmapper.accessors import ModelAccessor
+from modelmapper.qt.fields import CheckBoxList, LineDate, MemoryListAccessor, QWidgetAccessor, date_parser
+
+from tests.factory.qt.destination_data import (CheckableComboBox, MemoryListModel, QLineEdit, QListView,
+                                               QMetaObject, QMetaProperty, QWidget)
+
+
+class Widget(QWidget):
+    meta_object = QMetaObject(QMetaProperty('value'))
+
+
+class TestQWidgetAccessor(unittest.TestCase):
+
+    def setUp(self):
+        self.ui = {'name': Widget('fake name'), 'surname': Widget('fake surname')}
+        self.parent_accessor = ModelAccessor(self.ui)
+        self.accessor = QWidgetAccessor('name', parent_accessor=self.parent_accessor)
+
+    def test_get_and_set_value(self):
+        self.assertEqual('fake name', self.accessor.get_value())
+        self.accessor.set_value('new name')
+        self.assertEqual('new name', self.ui['name'].value)
+
+    def test_user_property_is_cached_by_widget_class(self):
+        other_accessor = QWidgetAccessor('surname', parent_accessor=self.parent_accessor)
+        for _ in range(3):
+            self.accessor.set_value(self.accessor.get_value())
+            other_accessor.get_value()
+        self.assertEqual(1, Widget.meta_object.user_property_calls)
+
+    def test_widget_is_cached_until_the_model_is_rebound(self):
+        widget = self.accessor.widget
+        self.ui['name'] = Widget()
+        self.assertIs(widget, self.accessor.widget)
+
+        self.accessor.clear_widget_cache()
+        self.assertIs(self.ui['name'], self.accessor.widget)
+
+        other_ui = {'name': Widget('other name')}
+        self.parent_accessor._model = other_ui
+        self.assertEqual('other name', self.accessor.get_value())
+
+    def test_copies_resolve_their_own_widget(self):
+        self.accessor.get_value()
+        copied = copy.copy(self.accessor)
+        copied.parent_accessor = ModelAccessor({'name': Widget('copied name')})
+        self.assertEqual('copied name', copied.get_value())
+        self.assertEqual('fake name', self.accessor.get_value())
+
+
+class TestCheckBoxList(unittest.TestCase):
+
+    def setUp(self):
+        self.widget = CheckableComboBox(['a', 'b', 'c', 'd'])
+        self.accessor = CheckBoxList('options', parent_accessor=ModelAccessor({'options': self.widget}))
+
+    def _writes(self):
+        return [self.widget.model().item(row).check_state_writes for row in range(4)]
+
+    def test_set_value(self):
+        self.accessor.set_value(['b', 'd', 'z'])
+        self.assertEqual(['b', 'd'], self.accessor.get_value())
+        self.assertTrue(self.widget.updates_enabled)
+        self.assertEqual(1, self.widget.updates)
+
+    def test_set_value_only_touches_changed_items(self):
+        self.accessor.set_value(['a', 'b'])
+        self.accessor.set_value(['b', 'c'])
+        self.assertEqual(['b', 'c'], self.accessor.get_value())
+        self.assertEqual([2, 1, 1, 0], self._writes())
+
+    def test_set_empty_value(self):
+        self.accessor.set_value(['a'])
+        self.accessor.set_value(None)
+        self.assertEqual([], self.accessor.get_value())
+
+
+class TestMemoryListAccessor(unittest.TestCase):
+
+    def setUp(self):
+        self.model = MemoryListModel(['a', 'b', 'c', 'd'])
+        self.accessor = MemoryListAccessor('rows', parent_accessor=ModelAccessor({'rows': QListView(self.model)}),
+                                           diff_rows=True)
+
+    @parameterized.expand([
+        (['a', 'b', 'c', 'd'], []),
+        (['a', 'x', 'c', 'd'], [('set', 1)]),
+        (['a', 'b', 'x', 'c', 'd'], [('insert', 2)]),
+        (['a', 'c', 'd'], [('remove', 1)]),
+        (['a', 'd'], [('remove', 2), ('remove', 1)]),
+        (['x', 'y'], [('set', 0), ('set', 1), ('remove', 3), ('remove', 2)]),
+        (['a', 'b', 'c', 'd', 'e', 'f'], [('insert', 4), ('insert', 5)]),
+        ([], [('remove', 3), ('remove', 2), ('remove', 1), ('remove', 0)]),
+    ])
+    def test_set_value_applies_the_differences(self, value, operations):
+        self.accessor.set_value(value)
+        self.assertEqual(operations, self.model.operations)
+        self.assertEqual(value, [obj for _, obj in self.model.get_objects()])
+        self.assertEqual(value, self.accessor.get_value())
+
+    def test_set_value_without_diff_mode(self):
+        self.accessor.info['diff_rows'] = False
+        self.accessor.set_value(['a', 'x'])
+        self.assertEqual([('set_source',)], self.model.operations)
+        self.assertEqual(['a', 'x'], self.accessor.get_value())
+
+    def test_get_value_is_cached_until_the_model_changes(self):
+        value = self.accessor.get_value()
+        value.append('z')
+        self.assertEqual(['a', 'b', 'c', 'd'], self.accessor.get_value())
+        self.assertEqual(1, self.model.get_objects_calls)
+
+        self.model.set_object(0, 'x')
+        self.assertEqual(['x', 'b', 'c', 'd'], self.accessor.get_value())
+        self.assertEqual(2, self.model.get_objects_calls)
+
+        self.accessor.set_value(['x', 'y'])
+        self.assertEqual(['x', 'y'], self.accessor.get_value())
+        self.assertEqual(3, self.model.get_objects_calls)
+
+    def test_set_value_reads_the_rows_of_the_model_again(self):
+        self.accessor.get_value()
+        self.model.set_source = lambda source: MemoryListModel.set_source(self.model, sorted(source))
+        self.accessor.info['diff_rows'] = False
+        self.accessor.set_value(['y', 'x'])
+        self.assertEqual(['x', 'y'], self.accessor.get_value())
+
+    def test_previous_model_is_disconnected(self):
+        self.accessor.get_value()
+        other_model = MemoryListModel(['x'])
+        self.accessor.widget._model = other_model
+        self.assertEqual(['x'], self.accessor.get_value())
+        self.assertEqual([], self.model.dataChanged._slots)
+        self.assertEqual(1, len(other_model.dataChanged._slots))
+
+
+class TestLineDate(unittest.TestCase):
+
+    def setUp(self):
+        self.widget = QLineEdit()
+        self.accessor = LineDate('date', parent_accessor=ModelAccessor({'date': self.widget}))
+
+    def test_set_value(self):
+        self.accessor.set_value('2018-05-02T10:30:00')
+        self.assertEqual(compat.unicode(datetime(2018, 5, 2, 10, 30)), self.widget.text())
+
+    def test_get_value(self):
+        self.widget.setText('02-05-2018')
+        self.assertEqual(datetime(2018, 5, 2), self.accessor.get_value())
+        self.widget.setText('dd-mm-aaaa')
+        self.assertIsNone(self.accessor.get_value())
+
+    def test_dates_are_parsed_once(self):
+        parser = date_parser('%d-%m-%Y')
+        parser.clear()
+        for text in ('02-05-2018', '03-05-2018') * 3:
+            self.widget.setText(text)
+            self.accessor.get_value()
+        self.assertEqual(2, parser.misses)
+        self.assertEqual(4, parser.hits)
@@ -1,3 +1,5 @@
+from modelmapper import pubsub
+
 from tests.factory.qt.mapper import QtModelMapperFactoryTest
 
 
@@ -11,3 +13,54 @@ class TestCompleteModelMapper(QtModelMapperFactoryTest):
         self.update_destination_values()
         self._model_mapper.destination_to_origin()
         self.assert_all()
+
+
+class Subscriber(object):
+
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, topic, data):
+        self.events.append(topic)
+
+
+class TestBulkApply(QtModelMapperFactoryTest):
+
+    def setUp(self, *args, **kwargs):
+        super(TestBulkApply, self).setUp(*args, **kwargs)
+        self.subscriber = Subscriber()
+        pubsub.subscribe(self.subscriber.on_event, 'widget_value_changed')
+        pubsub.subscribe(self.subscriber.on_event, 'record_loaded')
+        for accessor in self._model_mapper._destination_field_accessors():
+            accessor.connect_signals()
+
+    def tearDown(self):
+        pubsub.unsubscribe(self.subscriber.on_event, 'widget_value_changed')
+        pubsub.unsubscribe(self.subscriber.on_event, 'record_loaded')
+
+    def test_signals_without_bulk_apply(self):
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(['widget_value_changed'] * 3, self.subscriber.events)
+
+    def test_bulk_apply(self):
+        with self._model_mapper.bulk_apply():
+            self._model_mapper.origin_to_destination()
+        self.assert_all()
+        self.assertEqual(['record_loaded'], self.subscriber.events)
+        self.assertFalse(self._destination_model.nombre.signalsBlocked())
+
+    def test_nested_bulk_apply(self):
+        self._destination_model.nombre.blockSignals(True)
+        with self._model_mapper.bulk_apply():
+            with self._model_mapper.bulk_apply():
+                self._model_mapper.origin_to_destination()
+        self.assertEqual(['record_loaded'], self.subscriber.events)
+        self.assertTrue(self._destination_model.nombre.signalsBlocked())
+        self.assertFalse(self._destination_model.expediente.signalsBlocked())
+
+    def test_bulk_apply_error(self):
+        with self.assertRaises(ValueError):
+            with self._model_mapper.bulk_apply():
+                raise ValueError
+        self.assertEqual([], self.subscriber.events)
+        self.assertFalse(self._destination_model.nombre.signalsBlocked())
@@ -1,6 +1,50 @@
+import array
+import io
+import json
+import types
+import unittest
+
 from nose_parameterized import parameterized
 
+from modelmapper import exceptions
+from modelmapper.accessors import FieldAccessor, compile_path
+from modelmapper.core import ModelMapper
+from modelmapper.converters import Converter, ConverterPipeline
+from modelmapper.declarations import Field, Mapper
+from modelmapper.policies import WritePolicy
+from modelmapper.stats import MappingStats
+from tests.factory.destination_data import get_destination_model
 from tests.factory.mapper import ModelMapperFactoryTest
+from tests.factory.mapper_data import get_model_mapper
+from tests.factory.origin_data import get_origin_model
+
+
+class Model(object):
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+class LoggedAccessor(FieldAccessor):
+
+    def __init__(self, access, writes, **info):
+        super(LoggedAccessor, self).__init__(access, **info)
+        self.writes = writes
+
+    def get_value(self):
+        return None
+
+    def set_value(self, value):
+        self.writes.append(value)
+
+
+class FailingAccessor(LoggedAccessor):
+
+    def __init__(self, access, **info):
+        super(FailingAccessor, self).__init__(access, [], **info)
+
+    def set_value(self, value):
+        raise ValueError(value)
 
 
 class TestCompleteModelMapper(ModelMapperFactoryTest):
@@ -9,6 +53,23 @@ class TestCompleteModelMapper(ModelMapperFactoryTest):
         self._model_mapper.origin_to_destination()
         self.assert_all()
 
+    def test_fields_are_read_after_the_previous_writes(self):
+        class LinkedAccessor(LoggedAccessor):
+            """Destination whose writes change the origin, like linked widgets"""
+
+            def set_value(self, value):
+                super(LinkedAccessor, self).set_value(value)
+                origin['a'] = value + 1
+
+        origin, writes = {'a': 1}, []
+        model_mapper = ModelMapper(origin, {}, {'x_link': Field('a', LinkedAccessor('x', writes)),
+                                                'y_link': Field('a', LinkedAccessor('y', writes))})
+        model_mapper.prepare_mapper()
+        if self._model_mapper.compiled:
+            model_mapper.compile()
+        model_mapper.origin_to_destination()
+        self.assertEqual([1, 2], writes)
+
     def test_origin_loads_data_from_destination(self):
         self.update_destination_values()
         self._model_mapper.destination_to_origin()
@@ -40,6 +101,42 @@ class TestCompleteModelMapper(ModelMapperFactoryTest):
     def test_to_dict_only_origin_data(self):
         self.assertEqual(self.get_dict_data(only_origin=True), self._model_mapper.to_dict(only_origin=True))
 
+    def test_to_dict_only_origin_does_not_rebind_children(self):
+        d_link = self._model_mapper['d_link']
+        d_link.index = 1
+        ccc_origin_model = d_link['ccc_link'].origin_model
+
+        self.assertEqual(self.get_dict_data(only_origin=True), self._model_mapper.to_dict(only_origin=True))
+        self.assertEqual(1, d_link.index)
+        self.assertIs(self.origin_model['d'][1], d_link.origin_model)
+        self.assertIs(ccc_origin_model, d_link['ccc_link'].origin_model)
+
+    @parameterized.expand([
+        ("origin and destination", False, False),
+        ("only origin", True, False),
+        ("only destination", False, True),
+    ])
+    def test_dump_json(self, _, only_origin, only_destination):
+        self.update_destination_values()
+        fp = io.StringIO()
+        self._model_mapper.dump_json(fp, only_origin=only_origin, only_destination=only_destination)
+        expected_data = json.loads(json.dumps(self.get_dict_data(only_origin=only_origin,
+                                                                 only_destination=only_destination)))
+        self.assertEqual(expected_data, json.loads(fp.getvalue()))
+
+    def test_iter_items(self):
+        items = self._model_mapper.iter_items(only_origin=True)
+        self.assertIsInstance(items, types.GeneratorType)
+        items = dict(items)
+        self.assertEqual(1, items[('dddd_link',)])
+        self.assertEqual(4, items[('d_link', 1, 'c_1_link', 'b_link')])
+        self.assertEqual('fake aaa 2', items[('list_link', 1, 'aaa_link')])
+
+    def test_iter_items_of_empty_lists(self):
+        del self.origin_model['d'][:]
+        items = dict(self._model_mapper.iter_items())
+        self.assertEqual([], items[('d_link', 0)])
+
     def test_to_dict_only_destination_data(self):
         self.update_destination_values()
         self.assertEqual(self.get_dict_data(only_destination=True), self._model_mapper.to_dict(only_destination=True))
@@ -62,6 +159,63 @@ class TestCompleteModelMapper(ModelMapperFactoryTest):
         expected_values = [(link_name, self._model_mapper[link_name])]
         self.assertEqual(expected_values, filtered_values)
 
+    @parameterized.expand([
+        ("FieldAccessor", 'val_complex', 'complex_link'),
+        ("AccessPath", compile_path('val_dddd'), 'dddd_link'),
+    ])
+    def test_filter_destination_access_by_other_types(self, _, access, link_name):
+        filtered_values = list(self._model_mapper.filter_destination_access(access))
+        self.assertEqual([(link_name, self._model_mapper[link_name])], filtered_values)
+
+    def test_filter_access_after_setting_a_field(self):
+        self._model_mapper['dddd_link'] = Field('dddd', 'val_ddd.val_aa')
+        self.assertEqual([], list(self._model_mapper.filter_destination_access('val_dddd')))
+        self.assertEqual([('dddd_link', self._model_mapper['dddd_link'])],
+                         list(self._model_mapper.filter_destination_access('val_ddd.val_aa')))
+
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(self.origin_model['dddd'], self.destination_model.val_ddd.val_aa)
+
+    @parameterized.expand([
+        ("root field", 'dddd', ['dddd_link']),
+        ("child", 'd', ['d_link']),
+        ("field of uniform list child", 'd.cc', ['d_link', 'cc_link']),
+        ("field of uniform list child with index", 'd[1].cc', ['d_link', 'cc_link']),
+        ("field of nested children", 'd[0].ccc[1].a', ['d_link', 'ccc_link', 'a_link']),
+        ("field of child with index", 'd.c[1].b', ['d_link', 'c_1_link', 'b_link']),
+    ])
+    def test_find_origin_access(self, _, access, link_names):
+        self._assert_found(self._model_mapper.find_origin_access(access), link_names)
+
+    @parameterized.expand([
+        ("field of nested children", 'val_d.val_ccc.val_a', ['d_link', 'ccc_link', 'a_link']),
+        ("FieldAccessor", 'val_complex', ['complex_link']),
+    ])
+    def test_find_destination_access(self, _, access, link_names):
+        self._assert_found(self._model_mapper.find_destination_access(access), link_names)
+
+    def _assert_found(self, found, link_names):
+        owner, field_name, declaration = found
+        expected_owner = self._model_mapper
+        for link_name in link_names[:-1]:
+            expected_owner = expected_owner[link_name]
+        self.assertIs(expected_owner, owner)
+        self.assertEqual(link_names[-1], field_name)
+        self.assertIs(owner[field_name], declaration)
+
+    @parameterized.expand([
+        ("unknown field", 'd.unknown'),
+        ("too long access", 'dddd.a'),
+    ])
+    def test_find_unknown_access(self, _, access):
+        self.assertIsNone(self._model_mapper.find_origin_access(access))
+
+    def test_find_access_in_child_with_empty_access(self):
+        self._model_mapper['same_link'] = Mapper('', 'val_ddd', {'b_link': Field('dd.c', 'val_b')})
+        self._assert_found(self._model_mapper.find_origin_access('dd.c'), ['same_link', 'b_link'])
+        self._assert_found(self._model_mapper.find_destination_access('val_ddd.val_b'), ['same_link', 'b_link'])
+        self._assert_found(self._model_mapper.find_origin_access('d.c[1].b'), ['d_link', 'c_1_link', 'b_link'])
+
     def test_destination_to_origin_by_field_name_in_simple_field(self):
         self.destination_model.val_dddd = 360
         self._model_mapper.destination_to_origin(field_name='dddd_link')
@@ -79,8 +233,495 @@ class TestCompleteModelMapper(ModelMapperFactoryTest):
         self.assertEqual("New test val_d.val_c[0].val_a", self.origin_model['d'][0]['c'][0]['a'])
         self.assertEqual(2, self.origin_model['d'][0]['c'][1]['b'])
 
+    def test_missing_items_are_skipped(self):
+        del self.origin_model['dddd']
+        del self.origin_model['ddd']['a']
+        self._model_mapper.origin_to_destination()
+        self.assertIsNone(self.destination_model.val_dddd)
+        self.assertIsNone(self.destination_model.val_ddd.val_a)
+        self.assertEqual(self.origin_model['dd']['b'], self.destination_model.val_dd.val_b)
+
     def test_origin_to_destination_by_field_name_in_model_mapper(self):
         self._model_mapper.origin_to_destination(field_name='d_link.c_0_link')
         # Check the change only was successful in first case, second case has the original value
         self.assertEqual(1, self.destination_model.val_d.val_c[0].val_a)
         self.assertIs(None, self.destination_model.val_d.val_c[1].val_b)
+
+
+class TestUniformListCursor(ModelMapperFactoryTest):
+
+    def setUp(self, *args, **kwargs):
+        mapper = get_model_mapper()
+        mapper['d_link'].info['row_cache_size'] = 4
+        super(TestUniformListCursor, self).setUp(mapper=mapper)
+        self.d_link = self._model_mapper['d_link']
+
+    def test_index_reuses_the_accessors(self):
+        accessor = self.d_link['ccc_link'].origin_accessor
+        self.d_link.index = 1
+        self.assertIs(accessor, self.d_link['ccc_link'].origin_accessor)
+        self.assertIs(self.origin_model['d'][1]['ccc'][0], accessor.model)
+
+    def test_visited_rows_are_cached(self):
+        for index in (1, 0, 1):
+            self.d_link.index = index
+        self.assertEqual(1, self.d_link._row_cache.hits)
+        self._assert_parent_uniform_list_model_values(d_link_index=1)
+        self._assert_child_uniform_list_model_values(d_link_index=1)
+        self.assertIs(self.origin_model['d'][1]['ccc'], self.d_link['ccc_link'].orig_data)
+
+    def test_cached_rows_follow_the_nested_indexes(self):
+        self.d_link.index = 1
+        self.d_link.index = 0
+        self.d_link['ccc_link'].index = 1
+        self.d_link.index = 1
+        self.assertIs(self.origin_model['d'][1]['ccc'][1], self.d_link['ccc_link'].origin_model)
+        self.assertEqual(4, self.destination_model.val_d.val_ccc.val_a)
+
+    def test_row_cache_is_cleared_when_data_changes(self):
+        self.d_link.index = 1
+        self.d_link.index = 0
+        self.d_link.delete_data(1)
+        self.d_link.insert_data({'c': [{'a': 5}, {'b': 6}], 'cc': 'fake 3', 'ccc': [{'a': 5}]}, index=1)
+        self.d_link.index = 1
+        self.assertEqual(0, self.d_link._row_cache.hits)
+        self.assertEqual('fake 3', self.destination_model.val_d.val_cc)
+
+    def test_wrong_index_keeps_the_current_row(self):
+        with self.assertRaises(exceptions.ModelMapperIndexError):
+            self.d_link.index = 5
+        self.assertEqual(0, self.d_link.index)
+        self.assertIs(self.origin_model['d'][0], self.d_link.origin_model)
+
+
+class TestListModelMapper(ModelMapperFactoryTest):
+
+    def setUp(self, *args, **kwargs):
+        super(TestListModelMapper, self).setUp(*args, **kwargs)
+        self.list_link = self._model_mapper['list_link']
+
+    def test_destination_list_shrinks(self):
+        self.update_destination_values()
+        self._model_mapper.origin_to_destination()
+        self._assert_list_model_values()
+
+    def test_destination_list_grows_with_the_factory(self):
+        self.origin_model['d_list'].extend({'a': i, 'aa': [], 'aaa': str(i)} for i in range(3, 6))
+        self.list_link.origin_to_destination()
+        self._assert_list_model_values()
+
+    def test_origin_list_grows_with_dicts(self):
+        self.update_destination_values()
+        self._model_mapper.destination_to_origin()
+        self.assertEqual([{'a': 4, 'aa': [], 'aaa': "1"}, {'a': 5, 'aa': [1], 'aaa': "2"}],
+                         self.origin_model['d_list'][:2])
+        self._assert_list_model_values()
+
+    def test_list_grows_without_factory_raises_model_mapper_error(self):
+        self.list_link.info['destination_factory'] = None
+        self.list_link.mapper = self.list_link.mapper  # rebuild the plan
+        with self.assertRaises(exceptions.ModelMapperError):
+            self.list_link.origin_to_destination()
+
+    def test_origin_to_destination_by_field_name(self):
+        self.list_link.origin_to_destination('aaa_link')
+        self.assertEqual(['fake aaa 1', 'fake aaa 2'], [item.val_aaa for item in self.destination_model.val_list])
+        self.assertEqual([None, None], [item.val_a for item in self.destination_model.val_list])
+
+    def test_changed_item_is_synced(self):
+        self._model_mapper.sync_changed()
+        self.origin_model['d_list'][1]['aaa'] = 'changed'
+        stats = self._model_mapper.sync_changed()
+        self.assertEqual(3, stats.synced)
+        self.assertEqual('changed', self.destination_model.val_list[1].val_aaa)
+
+    def test_items_changed_in_place_are_synced(self):
+        self.list_link.sync_changed()
+        self.origin_model['d_list'][0]['aa'].append(9)
+        stats = self.list_link.sync_changed()
+        self.assertEqual((3, 3), (stats.synced, stats.skipped))
+        self.assertEqual(self.origin_model['d_list'][0]['aa'], self.destination_model.val_list[0].val_aa)
+
+    def test_only_changed_items_are_synced(self):
+        self._model_mapper.sync_changed()
+        self.destination_model.val_list[0].val_aaa = 'not changed'
+        self.origin_model['d_list'][1]['aaa'] = 'changed'
+        self._model_mapper.sync_changed()
+        self.assertEqual('not changed', self.destination_model.val_list[0].val_aaa)
+        self.assertEqual('changed', self.destination_model.val_list[1].val_aaa)
+
+    def test_missing_list_raises_model_mapper_error(self):
+        del self.origin_model['d_list']
+        with self.assertRaises(exceptions.ModelMapperError):
+            ModelMapper(self.origin_model, self.destination_model, get_model_mapper()).prepare_mapper()
+
+    def test_origin_exporter_raises_on_missing_values(self):
+        del self.origin_model['d_list'][1]['aaa']
+        with self.assertRaises(exceptions.ModelAccessorKeyError):
+            self.list_link._origin_exporter()(self.origin_model['d_list'])
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestUniformListColumns(ModelMapperFactoryTest):
+
+    expected_columns = {
+        'c_0_link.a_link': [1, 3],
+        'c_1_link.b_link': [2, 4],
+        'cc_link': ['fake 1', 'fake 2'],
+        'ccc_link': [[{'a_link': 1}, {'a_link': 2}], [{'a_link': 3}, {'a_link': 4}]],
+    }
+
+    def test_list_columns(self):
+        self.assertEqual(self.expected_columns, self._model_mapper['d_link'].to_columns())
+
+    def test_array_columns(self):
+        columns = self._model_mapper['d_link'].to_columns(kind='array', typecodes={'c_0_link.a_link': 'l'})
+        self.assertEqual(array.array('l', [1, 3]), columns['c_0_link.a_link'])
+        self.assertEqual(['fake 1', 'fake 2'], columns['cc_link'])
+
+    def test_unknown_kind_raises_model_mapper_error(self):
+        with self.assertRaises(exceptions.ModelMapperError):
+            self._model_mapper['d_link'].to_columns(kind='csv')
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_columns(self):
+        columns = self._model_mapper['d_link'].to_columns(kind='numpy')
+        self.assertEqual(numpy.dtype('i8'), columns.dtype['c_1_link.b_link'])
+        self.assertEqual([2, 4], columns['c_1_link.b_link'].tolist())
+        self.assertEqual(self.expected_columns['ccc_link'], columns['ccc_link'].tolist())
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_dtypes_are_inferred_from_every_row(self):
+        self.origin_model['d'][0]['c'][0]['a'] = None
+        self.origin_model['d'][1]['c'][1]['b'] = 4.5
+        columns = self._model_mapper['d_link'].to_columns(kind='numpy')
+        self.assertEqual(numpy.dtype('O'), columns.dtype['c_0_link.a_link'])
+        self.assertEqual([None, 3], columns['c_0_link.a_link'].tolist())
+        self.assertEqual(numpy.dtype('f8'), columns.dtype['c_1_link.b_link'])
+        self.assertEqual([2.0, 4.5], columns['c_1_link.b_link'].tolist())
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_dtypes_of_some_columns(self):
+        columns = self._model_mapper['d_link'].to_columns(kind='numpy', dtype={'c_1_link.b_link': 'f4'})
+        self.assertEqual(numpy.dtype('f4'), columns.dtype['c_1_link.b_link'])
+        self.assertEqual(numpy.dtype('i8'), columns.dtype['c_0_link.a_link'])
+
+
+class TestCompiledModelMapper(TestCompleteModelMapper):
+
+    def setUp(self, *args, **kwargs):
+        super(TestCompiledModelMapper, self).setUp(*args, **kwargs)
+        self._model_mapper.compile()
+
+    def test_mapper_tree_is_compiled(self):
+        self.assertTrue(self._model_mapper.compiled)
+        self.assertTrue(self._model_mapper['d_link'].compiled)
+
+    def test_missing_origin_attribute_is_skipped(self):
+        del self.destination_model.val_dddd
+        self.destination_model.val_dd.val_b = "New test val_dd.val_b"
+        self._model_mapper.destination_to_origin()
+        self.assertEqual(1, self.origin_model['dddd'])
+        self.assertEqual("New test val_dd.val_b", self.origin_model['dd']['b'])
+
+    def test_missing_origin_key_is_skipped(self):
+        del self.origin_model['dddd']
+        self.destination_model.val_dddd = "Not changed"
+        self._model_mapper.origin_to_destination()
+        self.assertEqual("Not changed", self.destination_model.val_dddd)
+        self.assertEqual(self.origin_model['ddd']['a'], self.destination_model.val_ddd.val_a)
+
+    def test_wrong_origin_access_raises_model_accessor_error(self):
+        self.origin_model['dd'] = [1, 2]
+        with self.assertRaises(exceptions.ModelAccessorError):
+            self._model_mapper.origin_to_destination()
+
+    def test_origin_rebound_with_other_shape(self):
+        model_mapper = ModelMapper(Model(a=1), {}, {'a_link': Field('a', 'val_a')})
+        model_mapper.prepare_mapper()
+        model_mapper.compile()
+        model_mapper.origin_model = {'a': 2}
+        model_mapper.origin_to_destination()
+        self.assertEqual(2, model_mapper.destination_model['val_a'])
+        model_mapper.destination_model = Model(val_a=3)
+        model_mapper.destination_to_origin()
+        self.assertEqual(3, model_mapper.origin_model['a'])
+
+    def test_fields_are_not_written_again_after_an_error(self):
+        writes = []
+        mapper = dict(('{}_link'.format(i), Field(str(i), LoggedAccessor('val', writes))) for i in range(5))
+        mapper['failing_link'] = Field('0', FailingAccessor('val'))
+        model_mapper = ModelMapper(dict((str(i), i) for i in range(5)), {}, mapper)
+        model_mapper.prepare_mapper()
+        model_mapper.compile()
+        with self.assertRaises(ValueError):
+            model_mapper.origin_to_destination()
+        self.assertEqual(sorted(set(writes)), sorted(writes))
+
+    def test_child_changes_are_compiled_in_the_parent(self):
+        self._model_mapper['d_link']['cc_link'] = Field('c[0].a', 'val_cc')
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(1, self.destination_model.val_d.val_cc)
+
+
+class TestMapMany(ModelMapperFactoryTest):
+
+    def test_map_many_yields_populated_destinations(self):
+        origins = [get_origin_model() for _ in range(3)]
+        for i, origin in enumerate(origins):
+            origin['dddd'] = i
+
+        destinations = self._model_mapper.map_many(origins, get_destination_model)
+        self.assertIsInstance(destinations, types.GeneratorType)
+        for i, destination in enumerate(destinations):
+            self.assertEqual(i, destination.val_dddd)
+            self.assertEqual('fake 1', destination.val_d.val_cc)
+            self.assertEqual('fake1', destination.val_complex.get_val())
+
+    def test_map_many_does_not_change_bound_models(self):
+        list(self._model_mapper.map_many([get_origin_model()], get_destination_model))
+        self.assertIsNone(self.destination_model.val_dddd)
+
+    def test_map_many_stats(self):
+        stats = MappingStats()
+        list(self._model_mapper.map_many((get_origin_model() for _ in range(10)), get_destination_model,
+                                         stats=stats))
+        self.assertEqual(10, stats.records)
+        self.assertGreater(stats.records_per_second, 0)
+
+    def test_map_many_in_worker_processes(self):
+        origins = [get_origin_model() for _ in range(7)]
+        for i, origin in enumerate(origins):
+            origin['dddd'] = i
+
+        stats = MappingStats()
+        destinations = list(self._model_mapper.map_many(origins, get_destination_model, stats=stats,
+                                                        workers=2, chunk_size=2))
+        self.assertEqual(list(range(7)), [destination.val_dddd for destination in destinations])
+        self.assertEqual('fake1', destinations[-1].val_complex.get_val())
+        self.assertEqual(7, stats.records)
+
+
+class TestIncrementalModelMapper(ModelMapperFactoryTest):
+
+    def setUp(self, *args, **kwargs):
+        super(TestIncrementalModelMapper, self).setUp(*args, **kwargs)
+        self._fields_count = self._model_mapper.sync_changed().synced
+
+    def test_first_sync_copies_everything(self):
+        # 8 fields and the 3 fields of the 2 items of the list
+        self.assertEqual(14, self._fields_count)
+        self.assert_all()
+
+    def test_unchanged_fields_are_skipped(self):
+        self.destination_model.val_ddd.val_a = "Not changed"
+        self.origin_model['dddd'] = 360
+        self.origin_model['d'][0]['ccc'][0]['a'] = 720
+
+        stats = self._model_mapper.sync_changed()
+        self.assertEqual(2, stats.synced)
+        self.assertEqual(self._fields_count - 2, stats.skipped)
+        self.assertEqual(360, self.destination_model.val_dddd)
+        self.assertEqual(720, self.destination_model.val_d.val_ccc.val_a)
+        self.assertEqual("Not changed", self.destination_model.val_ddd.val_a)
+
+    def test_changes_inside_mutable_values_are_detected(self):
+        self.origin_model['dd']['b']['new_val_1'] = 'changed'
+        stats = self._model_mapper.sync_changed()
+        self.assertEqual(1, stats.synced)
+
+    @parameterized.expand([
+        ("field", 'dddd', 1),
+        ("parent of fields", 'ddd', 1),
+        ("uniform list", 'd', 4),
+        ("current item of a uniform list", 'd[0].c', 2),
+        ("not current item of a uniform list", 'd[1].c', 0),
+        ("item of a list", 'd_list[1].a', 3),
+        ("any item of a uniform list", 'd[*].c', 2),
+        ("wildcard is not a field name", 'dd.*', 0),
+    ])
+    def test_mark_dirty(self, _, access, synced):
+        self.destination_model.val_ddd.val_a = "Changed"
+        self._model_mapper.mark_dirty(access)
+        self.assertEqual(synced, self._model_mapper.sync_changed().synced)
+
+    def test_full_sync_forgets_fingerprints(self):
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(self._fields_count, self._model_mapper.sync_changed().synced)
+
+    def test_reverse_sync_forgets_fingerprints(self):
+        self.destination_model.val_dddd = 360
+        self._model_mapper.destination_to_origin()
+        self.origin_model['dddd'] = 1
+        self._model_mapper.sync_changed()
+        self.assertEqual(1, self.destination_model.val_dddd)
+
+
+class TestWritePolicy(ModelMapperFactoryTest):
+
+    def setUp(self, *args, **kwargs):
+        super(TestWritePolicy, self).setUp(*args, **kwargs)
+        self._model_mapper.origin_to_destination()
+        self.policy = WritePolicy()
+        self._model_mapper.write_policy = self.policy
+
+    def test_policy_is_inherited_by_children(self):
+        self.assertIs(self.policy, self._model_mapper['d_link'].write_policy)
+        self.assertIs(self.policy, self._model_mapper['d_link']['ccc_link'].write_policy)
+
+    def test_unchanged_values_are_not_written(self):
+        self.origin_model['dddd'] = 360
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(1, self.policy.stats.performed)
+        # 7 fields and the 3 fields of the 2 items of the list
+        self.assertEqual(13, self.policy.stats.skipped)
+        self.assertEqual(360, self.destination_model.val_dddd)
+
+    def test_list_items_follow_the_policy(self):
+        self.origin_model['d_list'][1]['aaa'] = 'changed'
+        self._model_mapper['list_link'].origin_to_destination()
+        self.assertEqual(1, self.policy.stats.performed)
+        self.assertEqual(5, self.policy.stats.skipped)
+        self.assertEqual('changed', self.destination_model.val_list[1].val_aaa)
+
+    def test_equal_values_are_not_written(self):
+        self.origin_model['dd']['b'] = dict(self.origin_model['dd']['b'])
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(0, self.policy.stats.performed)
+        self.assertIsNot(self.origin_model['dd']['b'], self.destination_model.val_dd.val_b)
+
+    def test_field_name_sync_follows_the_policy(self):
+        self._model_mapper.origin_to_destination('dddd_link')
+        self.assertEqual(1, self.policy.stats.skipped)
+
+    def test_compiled_sync_follows_the_policy(self):
+        self._model_mapper.compile()
+        self.origin_model['ddd']['a'] = 360
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(1, self.policy.stats.performed)
+        self.assertEqual(360, self.destination_model.val_ddd.val_a)
+
+    def test_compiled_sync_shares_the_destination_resolver(self):
+        self._model_mapper.compile()
+        resolvers = []
+        write_destination = ModelMapper._write_destination
+
+        def spy(model_mapper, field, value, setter=None, skip_unchanged=None):
+            resolvers.append((model_mapper, setter))
+            return write_destination(model_mapper, field, value, setter, skip_unchanged)
+
+        ModelMapper._write_destination = spy
+        self.addCleanup(setattr, ModelMapper, '_write_destination', write_destination)
+        self._model_mapper.origin_to_destination()
+        root_resolvers = [setter for model_mapper, setter in resolvers if model_mapper is self._model_mapper]
+        self.assertGreater(len(root_resolvers), 1)
+        self.assertIsNotNone(root_resolvers[0])
+        self.assertTrue(all(setter is root_resolvers[0] for setter in root_resolvers))
+
+    def test_destination_to_origin_is_not_affected(self):
+        self._model_mapper.destination_to_origin()
+        self.assertEqual(0, self.policy.stats.performed + self.policy.stats.skipped)
+
+    @parameterized.expand([
+        ("policy disabled, field enabled", False, True, 1),
+        ("policy enabled, field disabled", True, False, 0),
+    ])
+    def test_field_override(self, _, policy_skip, field_skip, skipped):
+        self._model_mapper['dddd_link'] = Field('dddd', 'val_dddd', skip_unchanged=field_skip)
+        self._model_mapper.write_policy = WritePolicy(skip_unchanged=policy_skip)
+        self._model_mapper.origin_to_destination('dddd_link')
+        self.assertEqual(skipped, self._model_mapper.write_policy.stats.skipped)
+
+
+class TestConverters(ModelMapperFactoryTest):
+
+    def setUp(self, *args, **kwargs):
+        super(TestConverters, self).setUp(*args, **kwargs)
+        self.to_text = Converter(lambda value: 'value {}'.format(value))
+        self.converters = ConverterPipeline(to_destination=[self.to_text, str.upper],
+                                            to_origin=lambda value: value.lower())
+        self._model_mapper['dddd_link'] = Field('dddd', 'val_dddd', converters=self.converters)
+
+    def test_origin_to_destination(self):
+        self._model_mapper.origin_to_destination()
+        self._model_mapper.origin_to_destination()
+        self.assertEqual('VALUE 1', self.destination_model.val_dddd)
+        self.assertEqual((1, 1), (self.to_text.misses, self.to_text.hits))
+        self.assertEqual({self.to_text: 0.5}, self.converters.hit_rates)
+
+    def test_destination_to_origin(self):
+        self.destination_model.val_dddd = 'NEW VALUE'
+        self._model_mapper.destination_to_origin()
+        self.assertEqual('new value', self.origin_model['dddd'])
+
+    def test_field_name_sync(self):
+        self._model_mapper.origin_to_destination('dddd_link')
+        self.assertEqual('VALUE 1', self.destination_model.val_dddd)
+        self._model_mapper.destination_to_origin('dddd_link')
+        self.assertEqual('value 1', self.origin_model['dddd'])
+
+    def test_compiled_sync(self):
+        self._model_mapper.compile()
+        self._model_mapper.origin_to_destination()
+        self.assertEqual('VALUE 1', self.destination_model.val_dddd)
+        self._model_mapper.destination_to_origin()
+        self.assertEqual('value 1', self.origin_model['dddd'])
+
+    def test_incremental_sync(self):
+        self._model_mapper.sync_changed()
+        self.origin_model['dddd'] = 2
+        self._model_mapper.sync_changed()
+        self.assertEqual('VALUE 2', self.destination_model.val_dddd)
+
+    def test_plan(self):
+        destination = self._model_mapper.plan.apply(get_origin_model(), get_destination_model())
+        self.assertEqual('VALUE 1', destination.val_dddd)
+
+    @parameterized.expand([
+        ("interpreted", False),
+        ("compiled", True),
+    ])
+    def test_converter_errors_are_not_missing_items(self, _, compiled):
+        self._model_mapper['dddd_link'] = Field('dddd', 'val_dddd',
+                                                converters=ConverterPipeline(to_destination={}.__getitem__))
+        if compiled:
+            self._model_mapper.compile()
+        with self.assertRaises(exceptions.ConverterError) as context:
+            self._model_mapper.origin_to_destination()
+        self.assertIsInstance(context.exception.__cause__, KeyError)
+
+    @parameterized.expand([
+        ("interpreted", False),
+        ("compiled", True),
+    ])
+    def test_bare_callables_convert_to_destination(self, _, compiled):
+        to_text = Converter(lambda value: 'value {}'.format(value))
+        self._model_mapper['dddd_link'] = Field('dddd', 'val_dddd', converters=to_text)
+        if compiled:
+            self._model_mapper.compile()
+        self._model_mapper.origin_to_destination()
+        self.assertEqual('value 1', self.destination_model.val_dddd)
+        self._model_mapper.destination_to_origin()
+        self.assertEqual('value 1', self.origin_model['dddd'])
+        self.assertEqual('value 1', self._model_mapper.plan.apply(get_origin_model(), get_destination_model()).val_dddd)
+
+    def test_wrong_converters_raise_when_declared(self):
+        with self.assertRaises(exceptions.ConverterError):
+            self._model_mapper['dddd_link'] = Field('dddd', 'val_dddd', converters='upper')
+
+    def test_pipeline_accepts_any_iterable_of_callables(self):
+        converters = ConverterPipeline(to_destination=(function for function in (str, str.upper)))
+        self.assertEqual('ABC', converters.to_destination('abc'))
+
+    @parameterized.expand([
+        ("not callable", ['upper']),
+        ("not iterable", 1),
+    ])
+    def test_pipeline_rejects_not_callables(self, _, functions):
+        with self.assertRaises(TypeError):
+            ConverterPipeline(to_destination=functions)
@@ -0,0 +1,71 @@
+import unittest
+
+from modelmapper.plan import MappingPlan
+from tests.factory.destination_data import get_destination_model
+from tests.factory.mapper import ModelMapperFactoryTest
+from tests.factory.mapper_data import get_model_mapper
+from tests.factory.origin_data import get_origin_model
+
+
+class TestMappingPlan(unittest.TestCase):
+
+    def setUp(self):
+        self._plan = MappingPlan(get_model_mapper())
+
+    def assert_mapped(self, origin, destination):
+        self.assertEqual(origin['dd']['b'], destination.val_dd.val_b)
+        self.assertEqual(origin['ddd']['a'], destination.val_ddd.val_a)
+        self.assertEqual(origin['dddd'], destination.val_dddd)
+        self.assertEqual(origin['complex'], destination.val_complex.get_val())
+        # Uniform lists are mapped through their first item
+        self.assertEqual(origin['d'][0]['c'][0]['a'], destination.val_d.val_c[0].val_a)
+        self.assertEqual(origin['d'][0]['c'][1]['b'], destination.val_d.val_c[1].val_b)
+        self.assertEqual(origin['d'][0]['cc'], destination.val_d.val_cc)
+        self.assertEqual(origin['d'][0]['ccc'][0]['a'], destination.val_d.val_ccc.val_a)
+
+    def test_apply_maps_origin_to_destination(self):
+        origin, destination = get_origin_model(), get_destination_model()
+        self.assertIs(destination, self._plan.apply(origin, destination))
+        self.assert_mapped(origin, destination)
+
+    def test_one_plan_maps_many_records(self):
+        for i in range(5):
+            origin, destination = get_origin_model(), get_destination_model()
+            origin['dddd'] = i
+            origin['d'][0]['cc'] = 'fake {}'.format(i)
+            self._plan.apply(origin, destination)
+            self.assert_mapped(origin, destination)
+
+    def test_destination_to_origin(self):
+        origin, destination = get_origin_model(), get_destination_model()
+        destination.val_dddd = 360
+        destination.val_d.val_cc = "New cc"
+        destination.val_complex.set_val("New complex")
+        self._plan.destination_to_origin(origin, destination)
+        self.assertEqual(360, origin['dddd'])
+        self.assertEqual("New cc", origin['d'][0]['cc'])
+        self.assertEqual("New complex", origin['complex'])
+
+    def test_missing_attributes_are_skipped(self):
+        origin, destination = get_origin_model(), get_destination_model()
+        del destination.val_dddd
+        self._plan.destination_to_origin(origin, destination)
+        self.assertEqual(1, origin['dddd'])
+
+    def test_empty_uniform_list_is_skipped(self):
+        origin, destination = get_origin_model(), get_destination_model()
+        origin['d'] = []
+        self._plan.apply(origin, destination)
+        self.assertIsNone(destination.val_d.val_cc)
+        self.assertEqual(origin['dddd'], destination.val_dddd)
+
+
+class TestMappingPlanFromPreparedMapper(ModelMapperFactoryTest):
+
+    def test_plan_from_prepared_mapper(self):
+        plan = MappingPlan(self.mapper)
+        destination = get_destination_model()
+        plan.apply(self.origin_model, destination)
+        self._model_mapper.origin_to_destination()
+        self.assertEqual(self.destination_model.val_d.val_ccc.val_a, destination.val_d.val_ccc.val_a)
+        self.assertEqual(self.destination_model.val_dd.val_b, destination.val_dd.val_b)
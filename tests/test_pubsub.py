@@ -0,0 +1,398 @@
+import threading
+import unittest
+
+from modelmapper.dispatch import AsyncioDispatcher, ThreadDispatcher
+from modelmapper import pubsub
+from modelmapper.pubsub import PubSub, timer_scheduler
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+class Subscriber(object):
+
+    def __init__(self):
+        self.events = []
+
+    def on_event(self, topic, data):
+        self.events.append((topic, data))
+
+
+class ManualScheduler(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, delay, function):
+        self.calls.append((delay, function))
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for _, function in calls:
+            function()
+
+
+class TestPubSub(unittest.TestCase):
+
+    def setUp(self):
+        self.pubsub = PubSub()
+        self.subscriber = Subscriber()
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed')
+
+    def test_publish_delivers_inline(self):
+        self.pubsub.publish('changed', 1)
+        self.pubsub.publish('other', 2)
+        self.assertEqual([('changed', 1)], self.subscriber.events)
+
+    def test_unsubscribe(self):
+        self.pubsub.unsubscribe(self.subscriber.on_event, 'changed')
+        self.pubsub.publish('changed', 1)
+        self.assertEqual([], self.subscriber.events)
+
+    def test_dead_subscribers_are_unsubscribed(self):
+        subscriber = Subscriber()
+        self.pubsub.subscribe(subscriber.on_event, 'changed')
+        self.assertEqual(2, len(self.pubsub._snapshots['changed'][0]))
+        del subscriber
+        self.assertEqual(1, len(self.pubsub._snapshots['changed'][0]))
+
+    def test_subscribe_while_receiving_a_message(self):
+        new_subscriber = Subscriber()
+
+        class Subscribing(object):
+
+            def on_event(this, topic, data):
+                self.pubsub.subscribe(new_subscriber.on_event, topic)
+                self.pubsub.unsubscribe(this.on_event, topic)
+
+        subscribing = Subscribing()
+        self.pubsub.subscribe(subscribing.on_event, 'changed')
+        self.pubsub.publish('changed', 1)
+        self.pubsub.publish('changed', 2)
+        self.assertEqual([('changed', 2)], new_subscriber.events)
+        self.assertEqual([('changed', 1), ('changed', 2)], self.subscriber.events)
+
+
+class Sender(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class TestSenderSubscriptions(unittest.TestCase):
+
+    def setUp(self):
+        self.pubsub = PubSub()
+        self.sender, self.other_sender = Sender('name'), Sender('surname')
+        self.subscriber = Subscriber()
+
+    def test_subscribe_by_sender(self):
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=self.sender)
+        self.pubsub.publish('changed', self.other_sender)
+        self.pubsub.publish('changed', self.sender)
+        self.pubsub.publish('changed', 1, sender=self.sender)
+        self.assertEqual([('changed', self.sender), ('changed', 1)], self.subscriber.events)
+
+    def test_subscribe_by_key(self):
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender='name', key=lambda sender: sender.name)
+        self.pubsub.publish('changed', self.other_sender)
+        self.pubsub.publish('changed', self.sender)
+        self.assertEqual([('changed', self.sender)], self.subscriber.events)
+
+    def test_filtered_and_unfiltered_subscribers(self):
+        everything = Subscriber()
+        self.pubsub.subscribe(everything.on_event, 'changed')
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=self.sender)
+        self.pubsub.publish('changed', self.sender)
+        self.pubsub.publish('changed', self.other_sender)
+        self.assertEqual([('changed', self.sender)], self.subscriber.events)
+        self.assertEqual(2, len(everything.events))
+
+    def test_unsubscribe_by_sender(self):
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=self.sender)
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=self.other_sender)
+        self.pubsub.unsubscribe(self.subscriber.on_event, 'changed', sender=self.sender)
+        self.pubsub.publish('changed', self.sender)
+        self.pubsub.publish('changed', self.other_sender)
+        self.assertEqual([('changed', self.other_sender)], self.subscriber.events)
+
+    def test_dead_senders_are_unsubscribed(self):
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=self.sender)
+        self.sender = None
+        self.assertNotIn('changed', self.pubsub._snapshots)
+
+    def test_dead_subscribers_are_unsubscribed(self):
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=self.sender)
+        self.subscriber = None
+        self.assertNotIn('changed', self.pubsub._subscribers)
+
+    def test_senders_without_weak_references(self):
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender='name')
+        self.pubsub.publish('changed', 'name')
+        self.pubsub.publish('changed', 'surname')
+        self.assertEqual([('changed', 'name')], self.subscriber.events)
+
+    def test_senders_without_weak_references_are_compared_by_value(self):
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=''.join(['na', 'me']))
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender=(1, 2))
+        self.pubsub.publish('changed', ''.join(['na', 'me']))
+        self.pubsub.publish('changed', tuple([1, 2]))
+        self.pubsub.publish('changed', {'name': 1})
+        self.assertEqual([('changed', 'name'), ('changed', (1, 2))], self.subscriber.events)
+
+    def test_failing_keys_do_not_stop_other_subscribers(self):
+        other_subscriber = Subscriber()
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed', sender='name', key=lambda sender: sender.name)
+        self.pubsub.subscribe(other_subscriber.on_event, 'changed', sender=self.sender)
+        self.pubsub.publish('changed', 1, sender=self.sender)
+        self.pubsub.publish('changed', 2, sender=object())
+        self.assertEqual([('changed', 1)], self.subscriber.events)
+        self.assertEqual([('changed', 1)], other_subscriber.events)
+
+
+class TestCoalescingPubSub(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = ManualScheduler()
+        self.pubsub = PubSub(coalesce_window=0.05, scheduler=self.scheduler)
+        self.subscriber = Subscriber()
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed')
+        self.sender, self.other_sender = object(), object()
+
+    def test_events_of_the_same_sender_are_coalesced(self):
+        for _ in range(3):
+            self.pubsub.publish('changed', self.sender)
+        self.pubsub.publish('changed', self.other_sender)
+        self.assertEqual([], self.subscriber.events)
+        self.assertEqual([0.05, 0.05], [delay for delay, _ in self.scheduler.calls])
+
+        self.scheduler.run()
+        self.assertEqual([('changed', self.sender), ('changed', self.other_sender)], self.subscriber.events)
+        self.assertEqual(4, self.pubsub.stats.published)
+        self.assertEqual(2, self.pubsub.stats.coalesced)
+        self.assertEqual(2, self.pubsub.stats.delivered)
+
+    def test_events_after_the_window_are_delivered_again(self):
+        self.pubsub.publish('changed', self.sender)
+        self.scheduler.run()
+        self.pubsub.publish('changed', self.sender)
+        self.scheduler.run()
+        self.assertEqual(2, len(self.subscriber.events))
+
+    def test_flush(self):
+        self.pubsub.publish('changed', self.sender)
+        self.pubsub.flush()
+        self.assertEqual([('changed', self.sender)], self.subscriber.events)
+        self.scheduler.run()
+        self.assertEqual(1, len(self.subscriber.events))
+
+    def test_batch(self):
+        self.pubsub.coalesce_window = None
+        with self.pubsub.batch():
+            with self.pubsub.batch():
+                self.pubsub.publish('changed', self.sender)
+            self.pubsub.publish('changed', self.sender)
+            self.assertEqual([], self.subscriber.events)
+        self.assertEqual([('changed', self.sender)], self.subscriber.events)
+        self.assertEqual([], self.scheduler.calls)
+        self.assertEqual(1, self.pubsub.stats.coalesced)
+
+    def test_window_does_not_deliver_inside_a_batch(self):
+        self.pubsub.publish('changed', self.sender)
+        with self.pubsub.batch():
+            self.scheduler.run()
+            self.assertEqual([], self.subscriber.events)
+        self.assertEqual([('changed', self.sender)], self.subscriber.events)
+
+
+class TestCoalescingPubSubWithTimer(unittest.TestCase):
+
+    def test_trailing_event_is_delivered_after_the_window(self):
+        delivered = threading.Event()
+
+        class Receiver(Subscriber):
+
+            def on_event(self, topic, data):
+                super(Receiver, self).on_event(topic, data)
+                delivered.set()
+
+        pubsub = PubSub(coalesce_window=0.01, scheduler=timer_scheduler)
+        subscriber = Receiver()
+        pubsub.subscribe(subscriber.on_event, 'changed')
+        pubsub.publish('changed', 'keystroke')
+        self.assertTrue(delivered.wait(5))
+        self.assertEqual([('changed', 'keystroke')], subscriber.events)
+
+    def test_window_without_scheduler_raises_value_error(self):
+        self.assertRaises(ValueError, PubSub, coalesce_window=0.01)
+        with self.assertRaises(ValueError):
+            PubSub().coalesce_window = 0.01
+
+
+class TestDefaultManager(unittest.TestCase):
+
+    def setUp(self):
+        self.subscriber = Subscriber()
+        pubsub.subscribe(self.subscriber.on_event, 'changed')
+        self.addCleanup(pubsub.unsubscribe, self.subscriber.on_event, 'changed')
+        self.addCleanup(pubsub.configure, coalesce_window=None, scheduler=None, dispatcher=None)
+
+    def test_configure_coalescing(self):
+        scheduler = ManualScheduler()
+        pubsub.configure(coalesce_window=0.05, scheduler=scheduler)
+        pubsub.publish('changed', 1, sender=self)
+        pubsub.publish('changed', 2, sender=self)
+        self.assertEqual([], self.subscriber.events)
+        scheduler.run()
+        self.assertEqual([('changed', 2)], self.subscriber.events)
+
+    def test_configure_dispatcher(self):
+        with ThreadDispatcher() as dispatcher:
+            pubsub.configure(dispatcher=dispatcher)
+            pubsub.publish('changed', 1)
+            self.assertTrue(dispatcher.join(5))
+        self.assertEqual([('changed', 1)], self.subscriber.events)
+        self.assertEqual(1, dispatcher.stats.delivered)
+
+    def test_configure_window_without_scheduler_raises_value_error(self):
+        self.assertRaises(ValueError, pubsub.configure, coalesce_window=0.05)
+
+
+class GatedSubscriber(Subscriber):
+    """Suscriptor que no termina de recibir el primer evento hasta abrir "gate"."""
+
+    def __init__(self):
+        super(GatedSubscriber, self).__init__()
+        self.receiving = threading.Event()
+        self.gate = threading.Event()
+
+    def on_event(self, topic, data):
+        self.receiving.set()
+        self.gate.wait(5)
+        super(GatedSubscriber, self).on_event(topic, data)
+
+
+class TestThreadDispatcher(unittest.TestCase):
+
+    def _create_pubsub(self, subscriber, **kwargs):
+        self.dispatcher = ThreadDispatcher(**kwargs)
+        self.addCleanup(self.dispatcher.close)
+        self.pubsub = PubSub(dispatcher=self.dispatcher)
+        self.pubsub.subscribe(subscriber.on_event, 'changed')
+
+    def _block_worker(self, subscriber):
+        self.pubsub.publish('changed', 0)
+        self.assertTrue(subscriber.receiving.wait(5))
+
+    def test_delivers_in_order(self):
+        subscriber = Subscriber()
+        self._create_pubsub(subscriber, workers=2)
+        for i in range(100):
+            self.pubsub.publish('changed', i)
+        self.assertTrue(self.dispatcher.join(5))
+        self.assertEqual([('changed', i) for i in range(100)], subscriber.events)
+        self.assertEqual(100, self.dispatcher.stats.delivered)
+        self.assertEqual(0, self.dispatcher.stats.depth)
+        self.assertGreaterEqual(self.dispatcher.stats.max_latency, self.dispatcher.stats.mean_latency)
+
+    def test_drop_oldest(self):
+        subscriber = GatedSubscriber()
+        self._create_pubsub(subscriber, maxsize=2, overflow='drop_oldest')
+        self._block_worker(subscriber)
+        for i in range(1, 5):
+            self.pubsub.publish('changed', i)
+        self.assertEqual(2, self.dispatcher.stats.depth)
+        subscriber.gate.set()
+        self.assertTrue(self.dispatcher.join(5))
+        self.assertEqual([0, 3, 4], [data for _, data in subscriber.events])
+        self.assertEqual(2, self.dispatcher.stats.dropped)
+        self.assertEqual(2, self.dispatcher.stats.max_depth)
+
+    def test_coalesce(self):
+        subscriber = GatedSubscriber()
+        self._create_pubsub(subscriber, maxsize=2, overflow='coalesce')
+        sender, other_sender = object(), object()
+        self._block_worker(subscriber)
+        for data in (sender, other_sender, sender, other_sender, sender):
+            self.pubsub.publish('changed', data)
+        subscriber.gate.set()
+        self.assertTrue(self.dispatcher.join(5))
+        self.assertEqual([0, sender, other_sender], [data for _, data in subscriber.events])
+        self.assertEqual(3, self.dispatcher.stats.coalesced)
+        self.assertEqual(0, self.dispatcher.stats.dropped)
+
+    def test_block(self):
+        subscriber = GatedSubscriber()
+        self._create_pubsub(subscriber, maxsize=1)
+        self._block_worker(subscriber)
+        self.pubsub.publish('changed', 1)
+        publisher = threading.Thread(target=self.pubsub.publish, args=('changed', 2))
+        publisher.start()
+        publisher.join(0.05)
+        self.assertTrue(publisher.is_alive())
+        subscriber.gate.set()
+        publisher.join(5)
+        self.assertTrue(self.dispatcher.join(5))
+        self.assertEqual([0, 1, 2], [data for _, data in subscriber.events])
+
+    def test_subscriber_errors_are_counted(self):
+        class Failing(object):
+
+            def on_event(self, topic, data):
+                raise ValueError(data)
+
+        subscriber = Failing()
+        self._create_pubsub(subscriber)
+        self.pubsub.publish('changed', 1)
+        self.assertTrue(self.dispatcher.join(5))
+        self.assertEqual(1, self.dispatcher.stats.errors)
+
+    def test_unknown_overflow_policy(self):
+        self.assertRaises(ValueError, ThreadDispatcher, overflow='spill')
+
+    def test_close_delivers_the_queued_events(self):
+        subscriber = GatedSubscriber()
+        self._create_pubsub(subscriber, workers=2)
+        self._block_worker(subscriber)
+        self.pubsub.publish('changed', 1)
+        subscriber.gate.set()
+        self.dispatcher.close()
+        self.assertEqual([0, 1], [data for _, data in subscriber.events])
+        self.assertFalse(any(thread.is_alive() for thread in self.dispatcher._threads))
+        self.assertRaises(RuntimeError, self.pubsub.publish, 'changed', 2)
+
+    def test_context_manager(self):
+        subscriber = Subscriber()
+        with ThreadDispatcher() as dispatcher:
+            pubsub = PubSub(dispatcher=dispatcher)
+            pubsub.subscribe(subscriber.on_event, 'changed')
+            pubsub.publish('changed', 1)
+        self.assertTrue(dispatcher.closed)
+        self.assertEqual([('changed', 1)], subscriber.events)
+
+
+@unittest.skipIf(asyncio is None, "asyncio is not available")
+class TestAsyncioDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.dispatcher = AsyncioDispatcher(self.loop)
+        self.pubsub = PubSub(dispatcher=self.dispatcher)
+        self.subscriber = Subscriber()
+        self.pubsub.subscribe(self.subscriber.on_event, 'changed')
+
+    def tearDown(self):
+        self.dispatcher.close(wait=False)
+        self.loop.close()
+
+    def test_delivers_in_the_loop(self):
+        publisher = threading.Thread(target=lambda: [self.pubsub.publish('changed', i) for i in range(3)])
+        publisher.start()
+        publisher.join(5)
+        self.assertEqual([], self.subscriber.events)
+
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual([('changed', 0), ('changed', 1), ('changed', 2)], self.subscriber.events)
+        self.assertTrue(self.dispatcher.join(0))
@@ -1,10 +1,16 @@
 import json
+import pickle
 import unittest
 
 from nose_parameterized import parameterized
 
-from modelmapper.accessors import ModelAccessor, FieldAccessor
+from modelmapper.accessors import (ModelAccessor, FieldAccessor, AccessPath, MISSING, compile_access, compile_path,
+                                   get_value)
+from modelmapper.converters import Converter, ConverterPipeline, get_converters
+from modelmapper.declarations import Field
 from modelmapper import exceptions
+from modelmapper.streaming import write_json
+from modelmapper.trie import AccessTrie, PrefixResolver
 
 
 class ChildA(object):
@@ -188,6 +194,279 @@ class TestModelDataAccessor(unittest.TestCase):
         for item in self._model_dict_data['c']:
             self.assertEqual(item['c1'], 1)
 
+    def test_special_character_list_in_scatter(self):
+        self._model_dict_data_accessor.scatter('c[*].c1', iter([1, 2, 3]))
+        self.assertEqual([1, 2], self._model_dict_data_accessor.gather('c[*].c1'))
+
+    def test_special_character_list_in_simple_scatter(self):
+        items = self._model_dict_data['c']
+        self._model_dict_data_accessor.scatter('c[*]', [1])
+        self.assertIs(items, self._model_dict_data['c'])
+        self.assertEqual([1, {'c1': 6, 'c2': 8}], items)
+
+    def test_nested_special_character_lists(self):
+        accessor = ModelAccessor({'o': [{'l': [{'q': 1}, {'q': 2}]}, {'l': [{'q': 3}]}]})
+        self.assertEqual([[1, 2], [3]], accessor['o[*].l[*].q'])
+
+        accessor['o[*].l[*].q'] = 0
+        self.assertEqual([[0, 0], [0]], accessor['o[*].l[*].q'])
+
+        accessor.scatter('o[*].l[*].q', [[4, 5], (6 for _ in range(1))])
+        self.assertEqual([[4, 5], [6]], accessor['o[*].l[*].q'])
+
+    @parameterized.expand([
+        ('get', lambda accessor: accessor['c[*].xx'], exceptions.ModelAccessorKeyError),
+        ('set', lambda accessor: accessor.__setitem__('c[*].c1.xx', 1), exceptions.ModelAccessorError),
+        ('scatter', lambda accessor: accessor.scatter('xx[*].c1', [1]), exceptions.ModelAccessorKeyError),
+    ])
+    def test_special_character_list_errors(self, _, operation, error):
+        with self.assertRaises(error):
+            operation(self._model_dict_data_accessor)
+
+    def test_special_character_list_errors_do_not_write_again(self):
+        writes = []
+
+        class Item(object):
+
+            def __setattr__(self, name, value):
+                writes.append(value)
+
+        accessor = ModelAccessor({'c': [Item(), {}, ()]})
+        with self.assertRaises(exceptions.ModelAccessorAttributeError):
+            accessor.scatter('c[*].c1', [1, 2, 3])
+        self.assertEqual([1], writes)
+        self.assertEqual({'c1': 2}, accessor['c[1]'])
+
+
+class TestAccessPath(unittest.TestCase):
+
+    def setUp(self):
+        self._model_dict_data = get_model_dict_data()
+        self._model_dict_data_accessor = ModelAccessor(self._model_dict_data)
+
+    @parameterized.expand([
+        ('a.xx',),
+        ('c[9]',),
+        ('c[0].xx',),
+        ('c[*].xx',),
+        ('a.aa.aaa.xx',),
+    ])
+    def test_lookup_missing_items(self, name):
+        self.assertIs(MISSING, self._model_dict_data_accessor.lookup(name))
+        self.assertEqual(-1, self._model_dict_data_accessor.lookup(name, missing=-1))
+
+    def test_lookup_existing_items(self):
+        self.assertEqual(7, self._model_dict_data_accessor.lookup('a.aa.aaa'))
+        self.assertEqual([5, 6], self._model_dict_data_accessor.lookup('c[*].c1'))
+
+    def test_lookup_wrong_access_raises_model_accessor_error(self):
+        with self.assertRaises(exceptions.ModelAccessorError):
+            self._model_dict_data_accessor.lookup('c.xx')
+
+    @parameterized.expand([
+        ('a.xx', exceptions.ModelAccessorKeyError),
+        ('c[9]', exceptions.ModelAccessorIndexError),
+        ('c[*].xx', exceptions.ModelAccessorKeyError),
+    ])
+    def test_get_value_strict_raises_missing_items(self, name, error):
+        self.assertIs(MISSING, get_value(self._model_dict_data, compile_path(name)))
+        with self.assertRaises(error):
+            get_value(self._model_dict_data, compile_path(name), strict=True)
+
+    def test_get_value_reads_a_field_accessor_once(self):
+        class Accessor(FieldAccessor):
+            reads = 0
+
+            def get_value(self):
+                Accessor.reads += 1
+                raise exceptions.ModelAccessorAttributeError(self.access)
+
+            def set_value(self, value):
+                pass
+
+        accessor = Accessor('a')
+        self.assertIs(MISSING, get_value(self._model_dict_data, accessor))
+        with self.assertRaises(exceptions.ModelAccessorAttributeError):
+            get_value(self._model_dict_data, compile_access(accessor), strict=True)
+        self.assertEqual(2, Accessor.reads)
+        self.assertIsNone(accessor.parent_accessor)
+
+    def test_compiled_path_steps(self):
+        path = AccessPath('c[1].c1')
+        self.assertEqual((('c', None), ('1', 1), ('c1', None)), path.steps)
+        self.assertFalse(path.wildcard)
+        self.assertTrue(AccessPath('c[*].c1').wildcard)
+        self.assertEqual(((('c', None),), (('c1', None),)), AccessPath('c[*].c1').segments)
+        self.assertEqual(((('c', None),), ()), AccessPath('c[*]').segments)
+
+    def test_compile_path_is_cached(self):
+        path = compile_path('a.aa.aaa')
+        self.assertIs(path, compile_path('a.aa.aaa'))
+        self.assertIs(path, compile_path(path))
+
+    def test_path_compares_as_its_access_string(self):
+        path = compile_path('a.aa.aaa')
+        self.assertEqual('a.aa.aaa', path)
+        self.assertEqual(path, 'a.aa.aaa')
+        self.assertEqual(hash('a.aa.aaa'), hash(path))
+
+    def test_get_and_set_value_with_compiled_path(self):
+        path = compile_path('c[1].c1')
+        self.assertEqual(6, self._model_dict_data_accessor[path])
+        self._model_dict_data_accessor[path] = 60
+        self.assertEqual(60, self._model_dict_data['c'][1]['c1'])
+
+    def test_get_value_with_compiled_special_list_path(self):
+        self.assertEqual([5, 6], self._model_dict_data_accessor[compile_path('c[*].c1')])
+
+    @parameterized.expand([
+        (exceptions.ModelAccessorKeyError, 'a.xx'),
+        (exceptions.ModelAccessorIndexError, 'c[9]'),
+    ])
+    def test_get_value_with_compiled_path_errors(self, e, name):
+        with self.assertRaises(e):
+            self._model_dict_data_accessor[compile_path(name)]
+
+
+class CountedChildren(object):
+
+    def __init__(self):
+        self.accesses = 0
+        self._child_b = ChildB()
+
+    @property
+    def child_b(self):
+        self.accesses += 1
+        return self._child_b
+
+
+class TestAccessTrie(unittest.TestCase):
+
+    def test_items_are_grouped_by_prefix(self):
+        trie = AccessTrie([('a.x', 1), ('b', 2), ('a.y.z', 3), ('b.w', 4), ('a.y', 5), ('c[*].d', 6)])
+        self.assertEqual([1, 5, 3, 2, 4, 6], list(trie))
+
+    def test_resolver_walks_shared_prefixes_once(self):
+        children = CountedChildren()
+        resolver = PrefixResolver(ModelAccessor(children))
+        self.assertEqual('Child B', resolver.get('child_b.text'))
+        self.assertIs(children._child_b.books, resolver.get('child_b.books'))
+        self.assertEqual(1, children.accesses)
+
+    def test_resolver_missing_key(self):
+        resolver = PrefixResolver(ModelAccessor(get_model_dict_data()))
+        self.assertIs(MISSING, resolver.get('a.xx'))
+        self.assertIs(MISSING, resolver.get('c[9].c1'))
+
+    def test_resolver_missing_attribute(self):
+        resolver = PrefixResolver(ModelAccessor(get_children_obj()))
+        self.assertIs(MISSING, resolver.get('child_b.fake.value'))
+        self.assertIs(MISSING, resolver.get('child_b.fake.other'))
+        self.assertEqual('Child B', resolver.get('child_b.text'))
+
+    def test_resolver_raises_model_accessor_errors(self):
+        resolver = PrefixResolver(ModelAccessor(get_model_dict_data()))
+        with self.assertRaises(exceptions.ModelAccessorError):
+            resolver.get('c.xx')
+        with self.assertRaises(exceptions.ModelAccessorIndexError):
+            resolver.set('c[9].c1', 1)
+
+    def test_resolver_set_after_replacing_a_container(self):
+        data = get_model_dict_data()
+        resolver = PrefixResolver(ModelAccessor(data))
+        resolver.set('a.aa', {})
+        resolver.set('a.aa.aaa', 10)
+        self.assertEqual({'aaa': 10}, data['a']['aa'])
+
+
+class TestWriteJson(unittest.TestCase):
+
+    class Writer(object):
+
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, chunk):
+            self.chunks.append(chunk)
+
+    @parameterized.expand([
+        ("nested containers", [(('a', 0, 'b'), 1), (('a', 0, 'c'), [1]), (('a', 1, 'b'), 2), (('d',), 'x')],
+         {'a': [{'b': 1, 'c': [1]}, {'b': 2}], 'd': 'x'}),
+        ("empty containers", [(('a',), []), (('b',), {})], {'a': [], 'b': {}}),
+        ("root list", [((0, 'a'), None), ((1, 0), 1)], [{'a': None}, [1]]),
+        ("root value", [((), {})], {}),
+        ("no items", [], {}),
+    ])
+    def test_write_json(self, _, items, expected_data):
+        fp = self.Writer()
+        write_json(iter(items), fp)
+        self.assertEqual(expected_data, json.loads(''.join(fp.chunks)))
+
+
+class CountedFunction(object):
+
+    def __init__(self, function):
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        return self.function(value)
+
+
+class TestConverter(unittest.TestCase):
+
+    def setUp(self):
+        self.function = CountedFunction(repr)
+        self.converter = Converter(self.function, maxsize=2)
+
+    def test_values_are_converted_once(self):
+        self.assertEqual(['1', '2', '1', '2'], [self.converter(value) for value in (1, 2, 1, 2)])
+        self.assertEqual(2, self.function.calls)
+        self.assertEqual(0.5, self.converter.hit_rate)
+
+    def test_equal_values_of_other_types_are_not_mixed(self):
+        self.assertEqual(['1', 'True', '1.0'], [self.converter(value) for value in (1, True, 1.0)])
+
+    def test_least_recently_used_values_are_discarded(self):
+        for value in (1, 2, 3, 1):
+            self.converter(value)
+        self.assertEqual(4, self.function.calls)
+
+    def test_unhashable_values_are_not_cached(self):
+        self.assertEqual('[1]', self.converter([1]))
+        self.assertEqual('[1]', self.converter([1]))
+        self.assertEqual(2, self.function.calls)
+
+    def test_pickle(self):
+        converter = pickle.loads(pickle.dumps(Converter(repr, maxsize=2)))
+        self.assertEqual('1', converter(1))
+        self.assertEqual(0, converter.hits)
+
+
+class TestConverterPipeline(unittest.TestCase):
+
+    def test_pipeline(self):
+        pipeline = ConverterPipeline(to_destination=[str, lambda value: value * 2], to_origin=int)
+        self.assertEqual('11', pipeline.to_destination(1))
+        self.assertEqual(11, pipeline.to_origin('11'))
+
+    def test_get_converters(self):
+        class Accessor(FieldAccessor):
+            CONVERTERS = ConverterPipeline()
+
+            def get_value(self):
+                pass
+
+            def set_value(self, value):
+                pass
+
+        field_converters, accessor_converters = ConverterPipeline(), ConverterPipeline()
+        self.assertIsNone(get_converters(Field('a', 'b')))
+        self.assertIs(Accessor.CONVERTERS, get_converters(Field('a', Accessor('b'))))
+        self.assertIs(accessor_converters, get_converters(Field('a', Accessor('b', converters=accessor_converters))))
+        self.assertIs(field_converters, get_converters(Field('a', Accessor('b'), converters=field_converters)))
+
 
 class TestPerformanceModelAccessor(unittest.TestCase):
 